@@ -1,6 +1,336 @@
-#include <iostream>
+#include "solver.hpp"
+#include <algorithm>
+#include <cmath>
+#include <limits>
+#include <set>
+
+namespace autokinetics {
+
+    namespace {
+        inline double clamped_power(double c, double order) {
+            double cc = c > 0.0 ? c : 0.0;
+            if (order == 1.0) return cc;
+            if (order == 2.0) return cc * cc;
+            if (order == 0.0) return 1.0;
+            return std::pow(cc, order);
+        }
+
+        // d(c^order)/dc mit derselben Behandlung von c <= 0 wie ODESolver._rate_derivatives
+        inline double clamped_power_derivative(double c, double order) {
+            if (order == 0.0 || c <= 0.0) return 0.0;
+            if (order == 1.0) return 1.0;
+            if (order == 2.0) return 2.0 * c;
+            return order * std::pow(c, order - 1.0);
+        }
+
+        double rms_norm(const std::vector<double>& v, const std::vector<double>& scale) {
+            double sum = 0.0;
+            for (size_t i = 0; i < v.size(); ++i) {
+                double x = v[i] / scale[i];
+                sum += x * x;
+            }
+            return v.empty() ? 0.0 : std::sqrt(sum / v.size());
+        }
+
+        // Ein Jacobi-Beitrag N_sj * dr_j/dc_i an Position target der LU-Werte
+        struct JacobianTerm {
+            int reaction, slot, target;
+            double coeff;
+        };
+    }
+
+    void Mechanism::rates(const double* c, double* r) const {
+        for (int j = 0; j < n_reactions(); ++j) {
+            double value = k[j];
+            for (int p = reactant_ptr[j]; p < reactant_ptr[j + 1]; ++p)
+                value *= clamped_power(c[reactant_species[p]], reactant_orders[p]);
+            r[j] = value;
+        }
+    }
+
+    void Mechanism::species_rates(const double* c, double* dcdt, std::vector<double>& r) const {
+        r.resize(n_reactions());
+        rates(c, r.data());
+        std::fill(dcdt, dcdt + n_species, 0.0);
+        for (int j = 0; j < n_reactions(); ++j)
+            for (int p = stoich_ptr[j]; p < stoich_ptr[j + 1]; ++p)
+                dcdt[stoich_species[p]] += stoich_coeffs[p] * r[j];
+    }
+
+    void SparseLU::analyze(int n, const std::vector<std::vector<int>>& pattern) {
+        n_ = n;
+        // Reihenfolge nach Markowitz: jeweils das Diagonalelement mit den
+        // wenigsten (Zeile-1)*(Spalte-1) aktiven Einträgen eliminieren.
+        std::vector<std::set<int>> rows(n), cols(n);
+        for (int i = 0; i < n; ++i) {
+            rows[i].insert(i); cols[i].insert(i);
+            for (int j : pattern[i]) { rows[i].insert(j); cols[j].insert(i); }
+        }
+        std::vector<bool> done(n, false);
+        perm_.clear();
+        for (int step = 0; step < n; ++step) {
+            int best = -1;
+            long best_cost = std::numeric_limits<long>::max();
+            for (int i = 0; i < n; ++i) {
+                if (done[i]) continue;
+                long cost = static_cast<long>(rows[i].size() - 1) * static_cast<long>(cols[i].size() - 1);
+                if (cost < best_cost) { best_cost = cost; best = i; }
+            }
+            for (int r : cols[best]) {
+                if (r == best) continue;
+                for (int c : rows[best]) {
+                    if (c == best) continue;
+                    rows[r].insert(c); cols[c].insert(r);
+                }
+            }
+            for (int c : rows[best]) if (c != best) cols[c].erase(best);
+            for (int r : cols[best]) if (r != best) rows[r].erase(best);
+            done[best] = true;
+            perm_.push_back(best);
+        }
+        perm_inv_.assign(n, 0);
+        for (int k = 0; k < n; ++k) perm_inv_[perm_[k]] = k;
+
+        // Symbolische Zerlegung im umsortierten System: Auffüllmuster von L und U
+        std::vector<std::set<int>> permuted(n);
+        for (int i = 0; i < n; ++i) {
+            permuted[perm_inv_[i]].insert(perm_inv_[i]);
+            for (int j : pattern[i]) permuted[perm_inv_[i]].insert(perm_inv_[j]);
+        }
+        for (int k = 0; k < n; ++k) {
+            for (int i = k + 1; i < n; ++i) {
+                if (!permuted[i].count(k)) continue;
+                for (auto it = permuted[k].upper_bound(k); it != permuted[k].end(); ++it) permuted[i].insert(*it);
+            }
+        }
+        row_ptr_.assign(1, 0);
+        cols_.clear(); diag_pos_.assign(n, 0);
+        for (int i = 0; i < n; ++i) {
+            for (int j : permuted[i]) {
+                if (j == i) diag_pos_[i] = static_cast<int>(cols_.size());
+                cols_.push_back(j);
+            }
+            row_ptr_.push_back(static_cast<int>(cols_.size()));
+        }
+        values_.assign(cols_.size(), 0.0);
+        work_.assign(n, 0.0);
+        marker_.assign(n, -1);
+    }
+
+    int SparseLU::position(int row, int col) const {
+        int i = perm_inv_[row], j = perm_inv_[col];
+        auto begin = cols_.begin() + row_ptr_[i], end = cols_.begin() + row_ptr_[i + 1];
+        auto it = std::lower_bound(begin, end, j);
+        return (it != end && *it == j) ? static_cast<int>(it - cols_.begin()) : -1;
+    }
+
+    bool SparseLU::factorize() {
+        for (int i = 0; i < n_; ++i) {
+            for (int p = row_ptr_[i]; p < row_ptr_[i + 1]; ++p) marker_[cols_[p]] = p;
+            for (int p = row_ptr_[i]; p < diag_pos_[i]; ++p) {
+                int k = cols_[p];
+                double l = values_[p] / values_[diag_pos_[k]];
+                values_[p] = l;
+                for (int q = diag_pos_[k] + 1; q < row_ptr_[k + 1]; ++q)
+                    values_[marker_[cols_[q]]] -= l * values_[q];
+            }
+            for (int p = row_ptr_[i]; p < row_ptr_[i + 1]; ++p) marker_[cols_[p]] = -1;
+            double pivot = values_[diag_pos_[i]];
+            if (pivot == 0.0 || !std::isfinite(pivot)) return false;
+        }
+        return true;
+    }
+
+    void SparseLU::solve(double* x) const {
+        for (int k = 0; k < n_; ++k) work_[k] = x[perm_[k]];
+        for (int i = 0; i < n_; ++i)
+            for (int p = row_ptr_[i]; p < diag_pos_[i]; ++p) work_[i] -= values_[p] * work_[cols_[p]];
+        for (int i = n_ - 1; i >= 0; --i) {
+            for (int p = diag_pos_[i] + 1; p < row_ptr_[i + 1]; ++p) work_[i] -= values_[p] * work_[cols_[p]];
+            work_[i] /= values_[diag_pos_[i]];
+        }
+        for (int k = 0; k < n_; ++k) x[perm_[k]] = work_[k];
+    }
+
+    IntegrationResult integrate_rodas3(const Mechanism& mechanism, const double* y0, double t0,
+                                       const double* t_eval, int n_eval, double t_end,
+                                       double rtol, const double* atol, double* y_out,
+                                       double h0, double h_max, long max_steps) {
+        // RODAS3 (Sandu et al. 1997), Koeffizienten in der Form von KPP
+        const int S = 4;
+        const double A[S][S] = {{0, 0, 0, 0}, {0, 0, 0, 0}, {2.0, 0, 0, 0}, {2.0, 0, 1.0, 0}};
+        const double C[S][S] = {{0, 0, 0, 0}, {4.0, 0, 0, 0}, {1.0, -1.0, 0, 0}, {1.0, -1.0, -8.0 / 3.0, 0}};
+        const bool new_f[S] = {true, false, true, true};
+        const double M[S] = {2.0, 0.0, 1.0, 1.0};
+        const double E[S] = {0.0, 0.0, 0.0, 1.0};
+        const double gamma = 0.5, order = 3.0;
+        const double fac_min = 0.2, fac_max = 6.0, fac_rej = 0.1, fac_safe = 0.9;
+
+        IntegrationResult result;
+        const int n = mechanism.n_species;
+        IntegratorStats& stats = result.stats;
+
+        // Besetzung der Jacobi-Matrix: J[s, i] != 0, wenn i Edukt und s beteiligt ist
+        std::vector<std::vector<int>> pattern(n);
+        for (int j = 0; j < mechanism.n_reactions(); ++j)
+            for (int p = mechanism.reactant_ptr[j]; p < mechanism.reactant_ptr[j + 1]; ++p)
+                for (int q = mechanism.stoich_ptr[j]; q < mechanism.stoich_ptr[j + 1]; ++q)
+                    pattern[mechanism.stoich_species[q]].push_back(mechanism.reactant_species[p]);
+        SparseLU lu;
+        lu.analyze(n, pattern);
+        result.lu_nonzeros = lu.nonzeros();
+        std::vector<JacobianTerm> terms;
+        for (int j = 0; j < mechanism.n_reactions(); ++j)
+            for (int p = mechanism.reactant_ptr[j]; p < mechanism.reactant_ptr[j + 1]; ++p)
+                for (int q = mechanism.stoich_ptr[j]; q < mechanism.stoich_ptr[j + 1]; ++q)
+                    terms.push_back({j, p, lu.position(mechanism.stoich_species[q], mechanism.reactant_species[p]),
+                                     mechanism.stoich_coeffs[q]});
+        std::vector<int> diagonal(n);
+        for (int i = 0; i < n; ++i) diagonal[i] = lu.diagonal(i);
+
+        std::vector<double> y(y0, y0 + n), y_new(n), y_stage(n), f0(n), f1(n), err(n), scale(n), rates;
+        std::vector<double> jac(lu.nonzeros()), drdc(mechanism.reactant_species.size());
+        std::vector<std::vector<double>> K(S, std::vector<double>(n));
+        auto fcn = [&](const std::vector<double>& c, std::vector<double>& out) {
+            mechanism.species_rates(c.data(), out.data(), rates);
+            ++stats.function_evaluations;
+        };
+        auto jacobian = [&](const std::vector<double>& c) {
+            for (int j = 0; j < mechanism.n_reactions(); ++j) {
+                for (int p = mechanism.reactant_ptr[j]; p < mechanism.reactant_ptr[j + 1]; ++p) {
+                    double others = mechanism.k[j];
+                    for (int q = mechanism.reactant_ptr[j]; q < mechanism.reactant_ptr[j + 1]; ++q)
+                        if (q != p) others *= clamped_power(c[mechanism.reactant_species[q]], mechanism.reactant_orders[q]);
+                    drdc[p] = others * clamped_power_derivative(c[mechanism.reactant_species[p]], mechanism.reactant_orders[p]);
+                }
+            }
+            std::fill(jac.begin(), jac.end(), 0.0);
+            for (const JacobianTerm& term : terms) jac[term.target] += term.coeff * drdc[term.slot];
+            ++stats.jacobian_evaluations;
+        };
+
+        double t = t0;
+        int out = 0;
+        while (out < n_eval && t_eval[out] <= t0) {
+            for (int i = 0; i < n; ++i) y_out[i * n_eval + out] = y[i];
+            ++out;
+        }
+        fcn(y, f0);
+        const double span = t_end - t0;
+        if (h_max <= 0.0) h_max = span;
+
+        // Startschrittweite wie in scipy.integrate (select_initial_step)
+        double h = h0;
+        if (h <= 0.0) {
+            for (int i = 0; i < n; ++i) scale[i] = atol[i] + rtol * std::fabs(y[i]);
+            double d0 = rms_norm(y, scale), d1 = rms_norm(f0, scale);
+            double h_guess = (d0 < 1e-5 || d1 < 1e-5) ? 1e-6 : 0.01 * d0 / d1;
+            h_guess = std::min(h_guess, span);
+            for (int i = 0; i < n; ++i) y_stage[i] = y[i] + h_guess * f0[i];
+            fcn(y_stage, f1);
+            for (int i = 0; i < n; ++i) err[i] = (f1[i] - f0[i]) / h_guess;
+            double d2 = rms_norm(err, scale);
+            double h_estimate = std::max(d1, d2) <= 1e-15 ? std::max(1e-6, h_guess * 1e-3)
+                                                          : std::pow(0.01 / std::max(d1, d2), 1.0 / (order + 1.0));
+            h = std::min(100.0 * h_guess, h_estimate);
+        }
+        h = std::min(h, h_max);
+
+        bool reject_last = false;
+        while (t_end - t > 4.0 * std::numeric_limits<double>::epsilon() * std::fabs(t_end)) {
+            if (stats.steps >= max_steps) {
+                result.status = -1;
+                result.message = "Maximale Anzahl Schritte erreicht.";
+                break;
+            }
+            double h_min = 16.0 * std::numeric_limits<double>::epsilon() * std::max(std::fabs(t), 1.0);
+            if (t + h > t_end || t_end - (t + h) < h_min) h = t_end - t;
+            jacobian(y);
+
+            bool accepted = false;
+            int singular = 0;
+            while (!accepted) {
+                ++stats.steps;
+                if (h < h_min) {
+                    result.status = -2;
+                    result.message = "Schrittweite zu klein.";
+                    break;
+                }
+                std::vector<double>& values = lu.values();
+                for (size_t p = 0; p < values.size(); ++p) values[p] = -jac[p];
+                for (int i = 0; i < n; ++i) values[diagonal[i]] += 1.0 / (h * gamma);
+                ++stats.decompositions;
+                if (!lu.factorize()) {
+                    if (++singular > 5) {
+                        result.status = -3;
+                        result.message = "Iterationsmatrix singulär.";
+                        break;
+                    }
+                    h *= 0.5;
+                    continue;
+                }
+
+                const std::vector<double>* f = &f0;  // ohne new_f gilt die rechte Seite der Vorstufe weiter
+                for (int s = 0; s < S; ++s) {
+                    if (s > 0 && new_f[s]) {
+                        y_stage = y;
+                        for (int j = 0; j < s; ++j)
+                            if (A[s][j] != 0.0)
+                                for (int i = 0; i < n; ++i) y_stage[i] += A[s][j] * K[j][i];
+                        fcn(y_stage, f1);
+                        f = &f1;
+                    }
+                    for (int i = 0; i < n; ++i) K[s][i] = (*f)[i];
+                    for (int j = 0; j < s; ++j)
+                        if (C[s][j] != 0.0)
+                            for (int i = 0; i < n; ++i) K[s][i] += (C[s][j] / h) * K[j][i];
+                    lu.solve(K[s].data());
+                }
+                for (int i = 0; i < n; ++i) {
+                    y_new[i] = y[i];
+                    err[i] = 0.0;
+                    for (int s = 0; s < S; ++s) {
+                        y_new[i] += M[s] * K[s][i];
+                        err[i] += E[s] * K[s][i];
+                    }
+                    scale[i] = atol[i] + rtol * std::max(std::fabs(y[i]), std::fabs(y_new[i]));
+                }
+                double error = std::max(rms_norm(err, scale), 1e-10);
+                if (!std::isfinite(error)) error = 1e10;
+                double h_new = h * std::min(fac_max, std::max(fac_min, fac_safe / std::pow(error, 1.0 / order)));
+
+                if (error <= 1.0) {
+                    ++stats.accepted;
+                    fcn(y_new, f1);
+                    double t_new = (h == t_end - t) ? t_end : t + h;
+                    // Dichte Ausgabe: kubische Hermite-Interpolation aus y, f an beiden Schrittenden
+                    while (out < n_eval && t_eval[out] <= t_new) {
+                        double theta = (t_eval[out] - t) / h;
+                        for (int i = 0; i < n; ++i) {
+                            double dy = y_new[i] - y[i];
+                            y_out[i * n_eval + out] = (1.0 - theta) * y[i] + theta * y_new[i]
+                                + theta * (theta - 1.0) * ((1.0 - 2.0 * theta) * dy + (theta - 1.0) * h * f0[i] + theta * h * f1[i]);
+                        }
+                        ++out;
+                    }
+                    t = t_new;
+                    y.swap(y_new);
+                    f0.swap(f1);
+                    h_new = std::min(h_new, h_max);
+                    if (reject_last) h_new = std::min(h_new, h);
+                    reject_last = false;
+                    h = h_new;
+                    accepted = true;
+                } else {
+                    ++stats.rejected;
+                    h = reject_last ? h * fac_rej : h_new;
+                    reject_last = true;
+                }
+            }
+            if (result.status != 0) break;
+        }
+        result.n_filled = out;
+        return result;
+    }
 
-int main() {
-    std::cout << "Hello, World!" << std::endl;
-    return 0;
 }
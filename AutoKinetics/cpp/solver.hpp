@@ -0,0 +1,68 @@
+#pragma once
+#include <string>
+#include <vector>
+
+namespace autokinetics {
+
+    // Mechanismus in kompakter Form (CSR je Reaktion):
+    //   Edukte von Reaktion j:     reactant_species/orders[reactant_ptr[j] .. reactant_ptr[j+1])
+    //   Stöchiometrie von j:       stoich_species/coeffs[stoich_ptr[j] .. stoich_ptr[j+1])
+    // r_j = k_j * prod(c_i^order), Konzentrationen <= 0 zählen als 0 (wie in simulator.py).
+    struct Mechanism {
+        int n_species = 0;
+        std::vector<int> reactant_ptr, reactant_species;
+        std::vector<double> reactant_orders;
+        std::vector<int> stoich_ptr, stoich_species;
+        std::vector<double> stoich_coeffs;
+        std::vector<double> k;
+
+        int n_reactions() const { return static_cast<int>(k.size()); }
+        void rates(const double* c, double* r) const;
+        void species_rates(const double* c, double* dcdt, std::vector<double>& r) const;
+    };
+
+    // Dünnbesetzte LU-Zerlegung ohne Pivotisierung (wie in KPP): Die Zeilen-
+    // und Spaltenreihenfolge wird einmal nach Markowitz/minimalem Grad gewählt,
+    // das Auffüllmuster symbolisch bestimmt; danach arbeiten Zerlegung und
+    // Lösen nur auf den Einträgen dieses Musters.
+    class SparseLU {
+    public:
+        void analyze(int n, const std::vector<std::vector<int>>& pattern);
+        int position(int row, int col) const;        // Index in values() im Originalindex, -1 wenn nicht besetzt
+        std::vector<double>& values() { return values_; }
+        int diagonal(int i) const { return diag_pos_[perm_inv_[i]]; }
+        bool factorize();                             // false bei Pivot 0
+        void solve(double* x) const;                  // überschreibt die rechte Seite mit der Lösung
+        int nonzeros() const { return static_cast<int>(values_.size()); }
+
+    private:
+        int n_ = 0;
+        std::vector<int> perm_, perm_inv_;            // perm_[neu] = alt
+        std::vector<int> row_ptr_, cols_, diag_pos_;  // im permutierten System
+        std::vector<double> values_;
+        mutable std::vector<double> work_;
+        std::vector<int> marker_;
+    };
+
+    struct IntegratorStats {
+        long steps = 0, accepted = 0, rejected = 0, function_evaluations = 0, jacobian_evaluations = 0, decompositions = 0;
+    };
+
+    struct IntegrationResult {
+        int status = 0;                               // 0 erfolgreich, < 0 Fehler
+        std::string message;
+        int n_filled = 0;                             // Anzahl berechneter Ausgabezeitpunkte
+        IntegratorStats stats;
+        int lu_nonzeros = 0;
+    };
+
+    // Rosenbrock-Verfahren RODAS3 (4 Stufen, Ordnung 3, eingebettet 2,
+    // L-stabil) mit Schrittweitensteuerung, dichter Ausgabe (kubische Hermite-
+    // Interpolation) und dünnbesetzter LU-Zerlegung von I/(h*gamma) - J.
+    // y_out hat das Format Spezies x Zeitpunkte (zeilenweise, n_species * n_eval).
+    IntegrationResult integrate_rodas3(const Mechanism& mechanism, const double* y0, double t0,
+                                       const double* t_eval, int n_eval, double t_end,
+                                       double rtol, const double* atol, double* y_out,
+                                       double h0 = 0.0, double h_max = 0.0, long max_steps = 1000000);
+
+}
@@ -1,6 +1,7 @@
 # python/analyzer.py
 import numpy as np
 from scipy import stats
+from trajectory_store import species_series
 
 def fit_reaction_order(time, concentration):
     """
@@ -27,13 +28,124 @@ def fit_reaction_order(time, concentration):
 
     return results
 
+# Linearisierungen der Ordnungen: (Name, Transformation, Vorzeichen von k, Einheit)
+ORDER_FORMS = (
+    ('zero_order', lambda c: c, -1.0, 'mol·L⁻¹·s⁻¹'),
+    ('first_order', np.log, -1.0, 's⁻¹'),
+    ('second_order', lambda c: 1 / c, 1.0, 'L·mol⁻¹·s⁻¹'),
+)
+
+class PrefixRegression:
+    """
+    Lineare Regression y ~ t über beliebige Indexbereiche [a, b) in O(1) pro
+    Bereich: Präfixsummen von t, t², y, y² und t·y werden einmal gebildet.
+    t wird vorher zentriert, um Auslöschung bei großen Zeiten zu verringern.
+    """
+    def __init__(self, t, y):
+        t = np.asarray(t, dtype=float)
+        t = t - t.mean()
+        y = np.asarray(y, dtype=float)
+        def prefix(x):
+            return np.concatenate(([0.0], np.cumsum(x)))
+        self.s_t, self.s_tt, self.s_y = prefix(t), prefix(t * t), prefix(y)
+        self.s_yy, self.s_ty = prefix(y * y), prefix(t * y)
+
+    def fit(self, a, b):
+        """Steigungen und Bestimmtheitsmaße für die Bereiche [a, b) (Arrays)."""
+        n = (b - a).astype(float)
+        st, sy = self.s_t[b] - self.s_t[a], self.s_y[b] - self.s_y[a]
+        var_t = n * (self.s_tt[b] - self.s_tt[a]) - st * st
+        var_y = n * (self.s_yy[b] - self.s_yy[a]) - sy * sy
+        cov = n * (self.s_ty[b] - self.s_ty[a]) - st * sy
+        # Streuung, die in der Auslöschung der Präfixsummen untergeht (z. B. Spuren nach großen Werten), gilt als nicht anpassbar.
+        resolvable = var_y > 1e4 * np.finfo(float).eps * n * self.s_yy[b]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = np.where(var_t > 0, cov / var_t, 0.0)
+            r_squared = np.where((var_t > 0) & resolvable, cov * cov / (var_t * var_y), 0.0)
+        return slope, np.clip(r_squared, 0.0, 1.0)
+
+def segment_regimes(time, concentration, window=None, min_windows=None, k_tolerance=1.0):
+    """
+    Zerlegt einen Konzentrationsverlauf in Abschnitte mit gleicher
+    scheinbarer Ordnung und ähnlichem k. Für jedes gleitende Fenster
+    (window Punkte, Standard 5 % der Punkte) werden alle drei
+    Linearisierungen über Präfixsummen in O(n) angepasst; die Ordnung mit
+    dem größten R² bestimmt das Fenster. Ein neuer Abschnitt beginnt, wenn
+    sich die Ordnung oder das Vorzeichen von k ändert oder k um mehr als
+    den Faktor 1 + k_tolerance vom mittleren k des laufenden Abschnitts
+    abweicht; Läufe kürzer als min_windows Fenster werden dem vorigen
+    Abschnitt zugeschlagen, gleichartige Nachbarn zusammengefasst. Jeder
+    Abschnitt wird abschließend als Ganzes angepasst.
+    """
+    time, concentration = np.asarray(time, dtype=float), np.asarray(concentration, dtype=float)
+    valid = concentration > 1e-9
+    t, c = time[valid], concentration[valid]
+    n = len(t)
+    if n < 4:
+        return []
+    window = min(max(int(window or n // 20), 3), n)
+    min_windows = max(int(min_windows or window // 2), 1)
+
+    regressions = [PrefixRegression(t, form(c)) for _, form, _, _ in ORDER_FORMS]
+    starts = np.arange(n - window + 1)
+    fits = [regression.fit(starts, starts + window) for regression in regressions]
+    r_squared = np.array([r2 for _, r2 in fits])
+    best = np.argmax(r_squared, axis=0)
+    signs = np.array([sign for _, _, sign, _ in ORDER_FORMS])
+    k = (signs[:, None] * np.array([slope for slope, _ in fits]))[best, starts]
+
+    # Läufe gleicher Ordnung und gleichen Vorzeichens, solange k innerhalb des Faktors
+    # (1 + k_tolerance) um das mittlere k des laufenden Abschnitts bleibt.
+    factor = 1.0 + k_tolerance
+    def same_regime(order_a, k_a, order_b, k_b):
+        if order_a != order_b or np.sign(k_a) != np.sign(k_b):
+            return False
+        if k_a == 0 or k_b == 0:
+            return k_a == k_b
+        return max(k_a / k_b, k_b / k_a) <= factor
+
+    runs = []  # [erstes Fenster, Ordnung, Summe k, Anzahl Fenster]
+    for w in starts:
+        if runs and same_regime(runs[-1][1], runs[-1][2] / runs[-1][3], best[w], k[w]):
+            runs[-1][2] += k[w]; runs[-1][3] += 1
+        else:
+            runs.append([w, best[w], k[w], 1])
+    # Kurze Läufe dem vorigen Abschnitt zuschlagen (ohne dessen k zu verändern),
+    # danach Nachbarn mit gleicher Ordnung und k innerhalb der Toleranz zusammenfassen.
+    merged = []
+    for run in runs:
+        if merged and run[3] < min_windows:
+            continue
+        if merged and same_regime(merged[-1][1], merged[-1][2] / merged[-1][3], run[1], run[2] / run[3]):
+            merged[-1][2] += run[2]; merged[-1][3] += run[3]
+        else:
+            merged.append(run)
+    kept = np.array([run[0] for run in merged], dtype=int)
+
+    # Abschnittsgrenzen in Punkten: Mitte des ersten Fensters eines Laufs.
+    bounds = np.concatenate(([0], kept[1:] + window // 2, [n]))
+    orders = best[kept]
+    segments = []
+    for (a, b), order in zip(zip(bounds[:-1], bounds[1:]), orders):
+        name, _, sign, unit = ORDER_FORMS[order]
+        slope, r2 = regressions[order].fit(np.array([a]), np.array([b]))
+        segments.append({'t_start': float(t[a]), 't_end': float(t[b - 1]), 'order': name, 'k': float(sign * slope[0]),
+                         'unit': unit, 'r_squared': float(r2[0]), 'n_points': int(b - a)})
+    return segments
+
+def analyze_regimes(sim_results, window=None):
+    """Abschnittsweise Analyse (segment_regimes) für alle Spezies: {Name: [Abschnitte]}."""
+    return {name: segment_regimes(*species_series(sim_results, idx), window=window)
+            for idx, name in enumerate(sim_results['species_names'])}
+
 def analyze_kinetics(sim_results, reaction_system):
     """
     Analysiert die Simulation und strukturiert die Ergebnisse pro Reaktionspfeil.
+    Verweisen die Ergebnisse auf eine Trajektoriendatei, werden nur die
+    benötigten Spezies daraus gelesen.
     """
     analysis = {}
-    time = np.array(sim_results['time_points'])
-    
+
     for reaction in reaction_system.reactions:
         if not reaction.reactants: continue
         
@@ -43,7 +155,7 @@ def analyze_kinetics(sim_results, reaction_system):
         # KORREKTUR: Wähle den Reaktanten mit der größten *relativen* Abnahme.
         # Das identifiziert den Hauptreaktanten und ignoriert Katalysatoren.
         for reactant_idx, _ in reaction.reactants:
-            concentration = np.array(sim_results['concentrations'][reactant_idx])
+            _, concentration = species_series(sim_results, reactant_idx)
             start_conc = concentration[0]
             end_conc = concentration[-1]
 
@@ -58,7 +170,7 @@ def analyze_kinetics(sim_results, reaction_system):
             # Wähle den Reaktanten, der die größte Konzentrationsänderung insgesamt aufweist
             max_change = -1
             for reactant_idx, _ in reaction.reactants:
-                concentration = np.array(sim_results['concentrations'][reactant_idx])
+                _, concentration = species_series(sim_results, reactant_idx)
                 change = np.max(concentration) - np.min(concentration)
                 if change > max_change:
                     max_change = change
@@ -68,7 +180,7 @@ def analyze_kinetics(sim_results, reaction_system):
 
         reactant_idx = best_reactant_for_analysis
         reactant_name = reaction_system.species[reactant_idx].name
-        concentration = np.array(sim_results['concentrations'][reactant_idx])
+        time, concentration = species_series(sim_results, reactant_idx)
         fit_results = fit_reaction_order(time, concentration)
         
         if fit_results:
@@ -80,6 +192,7 @@ def analyze_kinetics(sim_results, reaction_system):
                 'calculated_k': fit_results[best_order]['k'],
                 'k_unit': fit_results[best_order]['unit'],
                 'r_squared': fit_results[best_order]['r_squared'],
-                'all_fits': fit_results
+                'all_fits': fit_results,
+                'regimes': segment_regimes(time, concentration)
             }
     return analysis
\ No newline at end of file
@@ -1,14 +1,67 @@
 # -*- coding: utf-8 -*-
 # distutils: language = c++
 
-from libcpp.string import string
+import numpy as np
+from libcpp.string cimport string
+from libcpp.vector cimport vector
 
 cdef extern from "core.hpp" namespace "autokinetics":
     string get_hello_message()
 
+cdef extern from "solver.hpp" namespace "autokinetics":
+    cdef cppclass Mechanism:
+        int n_species
+        vector[int] reactant_ptr, reactant_species, stoich_ptr, stoich_species
+        vector[double] reactant_orders, stoich_coeffs, k
+
+    cdef cppclass IntegratorStats:
+        long steps, accepted, rejected, function_evaluations, jacobian_evaluations, decompositions
+
+    cdef cppclass IntegrationResult:
+        int status
+        string message
+        int n_filled
+        IntegratorStats stats
+        int lu_nonzeros
+
+    IntegrationResult integrate_rodas3(const Mechanism& mechanism, const double* y0, double t0,
+                                       const double* t_eval, int n_eval, double t_end,
+                                       double rtol, const double* atol, double* y_out,
+                                       double h0, double h_max, long max_steps) except + nogil
+
 def hello():
     """
     Ruft die C++-Funktion auf und gibt den String zurück.
     """
     cdef string cpp_message = get_hello_message()
     return cpp_message.decode('utf-8')
+
+def integrate(mechanism, k, y0, double t0, t_eval, double t_end, double rtol, atol, double h0=0.0, double h_max=0.0, long max_steps=1000000):
+    """
+    Integriert dc/dt = N @ r(c) von t0 bis t_end vollständig in C++
+    (RODAS3, solver.cpp) und gibt die Lösung an den Zeitpunkten t_eval aus.
+    mechanism = (reactant_ptr, reactant_species, reactant_orders,
+    stoich_ptr, stoich_species, stoich_coeffs) in CSR-Form je Reaktion.
+    Rückgabe: (Konzentrationen Spezies x berechnete Zeitpunkte, Status,
+    Meldung, Statistik).
+    """
+    cdef Mechanism m
+    cdef const double[::1] y0_view = np.ascontiguousarray(y0, dtype=np.float64)
+    cdef const double[::1] t_view = np.ascontiguousarray(t_eval, dtype=np.float64)
+    cdef const double[::1] atol_view = np.ascontiguousarray(np.broadcast_to(atol, (len(y0_view),)), dtype=np.float64)
+    m.n_species = len(y0_view)
+    m.reactant_ptr, m.reactant_species, m.reactant_orders = [int(v) for v in mechanism[0]], [int(v) for v in mechanism[1]], [float(v) for v in mechanism[2]]
+    m.stoich_ptr, m.stoich_species, m.stoich_coeffs = [int(v) for v in mechanism[3]], [int(v) for v in mechanism[4]], [float(v) for v in mechanism[5]]
+    m.k = [float(v) for v in k]
+
+    y_out = np.zeros((m.n_species, len(t_view)))
+    cdef double[:, ::1] y_view = y_out
+    cdef int n_eval = len(t_view)
+    cdef IntegrationResult result
+    with nogil:
+        result = integrate_rodas3(m, &y0_view[0], t0, &t_view[0], n_eval, t_end, rtol, &atol_view[0],
+                                  &y_view[0, 0], h0, h_max, max_steps)
+    stats = {"steps": result.stats.steps, "accepted": result.stats.accepted, "rejected": result.stats.rejected,
+             "nfev": result.stats.function_evaluations, "njev": result.stats.jacobian_evaluations,
+             "nlu": result.stats.decompositions, "lu_nonzeros": result.lu_nonzeros}
+    return y_out[:, :result.n_filled], result.status, result.message.decode('utf-8'), stats
@@ -1,64 +1,439 @@
 import sys
 import json
+import time
+import signal
 import numpy as np
 import argparse
 from pathlib import Path
 from parser import parse_kin_file
 from simulator import ODESolver
-from analyzer import analyze_kinetics
+from thermal import TemperatureProgram, EnergyBalance
+from events import SpeciesThreshold, TargetConversion, RateNormThreshold
+from stochastic import run_ensemble
+from analyzer import analyze_kinetics, analyze_regimes
 from plotter import generate_plots
+from fluxes import analyze_fluxes
+from report import write_report
+from uncertainty import propagate_uncertainty
+from tolerances import calibrate_tolerances, solver_settings, save_solver_settings
+from model_sync import KineticModel
+from trajectory_store import TrajectoryWriter, open_trajectory
+from checkpoint import Checkpoint
 
-def run_simulation_and_analysis(kin_filepath, sim_time_s, temp_K, plot_dir):
+def simulate(reaction_system, sim_time_s, temp_K, temperature_program=None, energy_balance=None, stop_conditions=None, num_points=200, progress_callback=None, chunk_callback=None, codegen="python", trajectory_file=None, strides=None, log_space=False, integrator="scipy", rtol=None, atol=None, workers=None, checkpoint=None):
     """
-    Führt die gesamte Kette aus: Parsen, Simulieren, Analysieren, Plotten.
+    Simuliert ein bereits geparstes ReactionSystem und gibt die Ergebnisse als
+    JSON-fähiges Dictionary zurück (ohne Analyse und Plots). Mit
+    chunk_callback werden Teilergebnisse schon während der Integration geliefert.
+    Mit trajectory_file wird die Trajektorie blockweise in eine
+    speicherabgebildete Datei geschrieben (strides: {Spezies: n} speichert nur
+    jeden n-ten Punkt) und nicht im Speicher gehalten; die Ergebnisse
+    verweisen dann nur auf die Datei. log_space integriert in ln c (streng
+    positive Konzentrationen, relative Fehlerkontrolle bis zu Spuren).
+    integrator="native" integriert vollständig im C++-Kern, soweit möglich,
+    "blocks" entkoppelte Teilnetze einzeln (parallel mit workers Prozessen),
+    "multirate" schnelle und langsame Spezies mit getrennten Schrittweiten.
+    rtol/atol überschreiben die (kalibrierten) Toleranzen aus der .kin-Datei.
+    checkpoint = {"file", "interval", "resume"} sichert den Integrationszustand
+    alle interval Sekunden; mit resume wird an der Sicherung fortgesetzt bzw.
+    ein beendeter Lauf bis sim_time_s verlängert (schrittweise mit SciPy-Radau).
     """
-    reaction_system = parse_kin_file(kin_filepath)
-    
     # NEU: Generiere das Zeitgesetz
     rate_law_equations = reaction_system.get_rate_law_equations()
 
-    solver = ODESolver(reaction_system, temperature=temp_K)
+    solver = ODESolver(reaction_system, temperature=temp_K,
+                       temperature_program=temperature_program, energy_balance=energy_balance, codegen=codegen, log_space=log_space, integrator=integrator,
+                       rtol=rtol, atol=atol, workers=workers)
     t_span = (0, sim_time_s)
-    t_eval = np.linspace(*t_span, num=200)
-    solution = solver.solve(t_span, t_eval)
+    t_eval = np.linspace(*t_span, num=num_points)
+    species_names = [s.name for s in reaction_system.species]
+    writer, state = None, None
+    if checkpoint is not None:
+        state = Checkpoint(checkpoint["file"], checkpoint.get("interval", 60.0), checkpoint.get("resume", False))
+    if trajectory_file is not None:
+        writer = TrajectoryWriter(trajectory_file, species_names, num_points, strides, with_temperature=solver.is_nonisothermal,
+                                  resume_at=state.saved_points() if state is not None else None)
+        if state is not None:
+            state.on_save = writer.flush
+        forward = chunk_callback
+        def chunk_callback(t, y, temperature):
+            writer.append(t, y, temperature)
+            if forward is not None:
+                forward(t, y, temperature)
+    if chunk_callback is None and state is None:
+        solution = solver.solve(t_span, t_eval, stop_conditions=stop_conditions, progress_callback=progress_callback)
+    else:
+        solution = solver.solve_stream(t_span, t_eval, chunk_callback or (lambda t, y, temperature: None), progress_callback=progress_callback,
+                                       stop_conditions=stop_conditions, keep=writer is None, checkpoint=state)
     
     sim_results = {
         "time_points": solution.t.tolist(),
-        "species_names": [s.name for s in reaction_system.species],
+        "species_names": species_names,
         "concentrations": solution.y.tolist(),
-        "simulation_parameters": {"duration_s": sim_time_s, "temperature_K": temp_K},
-        "rate_law_equations": rate_law_equations  # NEU HINZUGEFÜGT
+        "simulation_parameters": {"duration_s": sim_time_s, "temperature_K": temp_K, "rtol": solver.rtol,
+                                  "atol": solver.atol if np.ndim(solver.atol) == 0 else solver.atol.tolist()},
+        "rate_law_equations": rate_law_equations,  # NEU HINZUGEFÜGT
+        "stop_condition": solution.stop_condition
     }
+    if writer is not None:
+        writer.close(solution.stop_condition)
+        trajectory = open_trajectory(trajectory_file)
+        sim_results["trajectory_file"] = str(trajectory_file)
+        sim_results["simulation_parameters"]["num_points"] = trajectory.filled
+        sim_results["simulation_parameters"]["strides"] = dict(zip(species_names, trajectory.meta["strides"]))
+        solution.temperature = trajectory.temperature
+    if log_space:
+        sim_results["simulation_parameters"]["log_space"] = True
+    if getattr(solution, 'stats', None) is not None:
+        sim_results["simulation_parameters"]["integrator"] = {"name": solver.integrator, **solution.stats}
+    if solver.reduction is not None:
+        # Über Erhaltungsgrößen bestimmte statt integrierte Spezies
+        sim_results["simulation_parameters"]["eliminated_species"] = [reaction_system.species[i].name for i in solver.reduction.dependent]
+    if solver.is_nonisothermal:
+        if writer is None:
+            sim_results["temperature_profile"] = solution.temperature.tolist()
+        sim_results["temperature_range_warnings"] = solver.range_warnings(solution.temperature)
+        sim_results["simulation_parameters"]["mode"] = "temperature_program" if temperature_program else "energy_balance"
+    return sim_results
+
+def run_simulation_and_analysis(kin_filepath, sim_time_s, temp_K, plot_dir, temperature_program=None, energy_balance=None, stop_conditions=None, emit=None, codegen="python", num_points=200, trajectory_file=None, strides=None, regimes=False, fluxes=False, output="png", uncertainty=None, log_space=False, integrator="scipy", rtol=None, atol=None, workers=None, checkpoint=None):
+    """
+    Führt die gesamte Kette aus: Parsen, Simulieren, Analysieren, Plotten.
+    Mit temperature_program oder energy_balance wird nicht-isotherm simuliert,
+    stop_conditions beenden die Integration vorzeitig. Ist emit gesetzt,
+    werden Fortschritt und Teiltrajektorien als Nachrichten gestreamt. Mit
+    trajectory_file landet die Trajektorie in einer speicherabgebildeten
+    Datei, aus der Analyse und Plots lesen. regimes ergänzt die
+    abschnittsweise Analyse aller Spezies, fluxes die Flussanalyse.
+    output wählt PNG-Dateien ("png"), einen einzelnen HTML-Bericht
+    ("report") oder beides ("both"). uncertainty = {"spec", "samples",
+    "workers", "seed"} ergänzt Konfidenzbänder aus einer Monte-Carlo-
+    Fortpflanzung der Arrhenius-Unsicherheiten. log_space integriert in
+    ln c statt c, integrator="native" im C++-Kern, "blocks" je
+    entkoppeltem Teilnetz (mit workers Prozessen), "multirate" getrennt
+    nach Zeitskalen, rtol/atol überschreiben
+    die Toleranzen aus der .kin-Datei, checkpoint sichert den Zustand
+    für eine Fortsetzung (siehe simulate).
+    """
+    reaction_system = parse_kin_file(kin_filepath)
+    return run_system_analysis(reaction_system, sim_time_s, temp_K, plot_dir, temperature_program, energy_balance, stop_conditions, emit, codegen,
+                               num_points, trajectory_file, strides, regimes, fluxes, output, uncertainty, log_space, integrator, rtol, atol, workers, checkpoint)
+
+def run_system_analysis(reaction_system, sim_time_s, temp_K, plot_dir, temperature_program=None, energy_balance=None, stop_conditions=None, emit=None, codegen="python",
+                        num_points=200, trajectory_file=None, strides=None, regimes=False, fluxes=False, output="png", uncertainty=None, log_space=False, integrator="scipy", rtol=None, atol=None, workers=None, checkpoint=None):
+    """Simulieren, Analysieren und Plotten für ein bereits erstelltes ReactionSystem."""
+    progress_callback, chunk_callback = None, None
+    if emit is not None:
+        last_report = [0.0]
+        def progress_callback(t):
+            now = time.monotonic()
+            if now - last_report[0] > 0.1:
+                last_report[0] = now
+                emit({"type": "progress", "phase": "simulation", "t": t, "t_end": sim_time_s})
+        def chunk_callback(t, y, temperature):
+            emit({"type": "chunk", "time_points": t.tolist(), "concentrations": y.tolist(),
+                  "temperature_profile": None if temperature is None else np.asarray(temperature).tolist()})
+        emit({"type": "start", "species_names": [s.name for s in reaction_system.species], "t_end": sim_time_s})
+
+    sim_results = simulate(reaction_system, sim_time_s, temp_K, temperature_program, energy_balance, stop_conditions, num_points,
+                           progress_callback=progress_callback, chunk_callback=chunk_callback, codegen=codegen,
+                           trajectory_file=trajectory_file, strides=strides, log_space=log_space, integrator=integrator, rtol=rtol, atol=atol, workers=workers, checkpoint=checkpoint)
     
+    if emit is not None: emit({"type": "progress", "phase": "analysis", "t": sim_time_s, "t_end": sim_time_s})
     analysis_results = analyze_kinetics(sim_results, reaction_system)
     
+    uncertainty_results = None
+    if uncertainty is not None:
+        def sample_progress(done, total):
+            if emit is not None: emit({"type": "progress", "phase": "uncertainty", "t": done, "t_end": total})
+        uncertainty_results = propagate_uncertainty(reaction_system, uncertainty["spec"], temp_K, sim_time_s,
+                                                     n_samples=int(uncertainty.get("samples", 200)), num_points=num_points,
+                                                     temperature_program=temperature_program, energy_balance=energy_balance,
+                                                     n_workers=uncertainty.get("workers"), seed=uncertainty.get("seed"),
+                                                     codegen=codegen, integrator=integrator, progress_callback=sample_progress)
+
     # generate_plots gibt jetzt ein Dictionary mit allen Dateipfaden zurück
-    plot_files = generate_plots(sim_results, analysis_results, plot_dir)
+    if emit is not None: emit({"type": "progress", "phase": "plotting", "t": sim_time_s, "t_end": sim_time_s})
+    plot_files = generate_plots(sim_results, analysis_results, plot_dir, uncertainty_results) if output in ("png", "both") else {}
+    if output in ("report", "both"):
+        plot_files["report"] = write_report(sim_results, analysis_results, Path(plot_dir) / "report.html")
     
-    return {
+    results = {
         "simulation": sim_results,
         "analysis": analysis_results,
         "plot_files": plot_files
     }
+    if regimes:
+        results["regimes"] = analyze_regimes(sim_results)
+    if fluxes:
+        results["fluxes"] = analyze_fluxes(sim_results, reaction_system, temperature_program, energy_balance)
+    if uncertainty_results is not None:
+        results["uncertainty"] = uncertainty_results
+    return results
+
+def run_steady_state(kin_filepath, temp_K):
+    """
+    Bestimmt den stationären Zustand direkt (Newton / pseudo-transiente
+    Kontinuation) statt einer langen Integration.
+    """
+    reaction_system = parse_kin_file(kin_filepath)
+    solver = ODESolver(reaction_system, temperature=temp_K)
+    result = solver.solve_steady_state()
+    return {
+        "steady_state": {
+            "species_names": [s.name for s in reaction_system.species],
+            "concentrations": result.y.tolist(),
+            "converged": result.converged,
+            "method": result.method,
+            "iterations": result.iterations,
+            "residual_norm": result.residual_norm,
+            "temperature_K": temp_K
+        }
+    }
+
+def run_calibration(kin_filepath, sim_time_s, temp_K, temperature_program=None, energy_balance=None, target_error=1e-3,
+                    integrator="scipy", codegen="python", save=True, log_space=False):
+    """
+    Kalibriert rtol/atol für die .kin-Datei (siehe tolerances.py) und
+    speichert die Empfehlung als solver_settings in der Datei. Kalibriert
+    wird mit derselben Integrationsart (integrator, log_space), mit der
+    später simuliert wird.
+    """
+    reaction_system = parse_kin_file(kin_filepath)
+    calibration = calibrate_tolerances(reaction_system, temp_K, sim_time_s, temperature_program=temperature_program,
+                                       energy_balance=energy_balance, target_error=target_error,
+                                       integrator=integrator, codegen=codegen, log_space=log_space)
+    calibration["saved"] = False
+    if save and calibration["recommended"] is not None:
+        save_solver_settings(kin_filepath, solver_settings(calibration, temp_K, sim_time_s))
+        calibration["saved"] = True
+    return {"calibration": calibration}
+
+def run_stochastic(kin_filepath, sim_time_s, temp_K, n_trajectories, volume_L, method, n_workers=None, seed=None):
+    """
+    Stochastische Simulation (SSA / tau-leaping) vieler Trajektorien; liefert
+    nur Momente und Quantile, nicht die einzelnen Trajektorien.
+    """
+    reaction_system = parse_kin_file(kin_filepath)
+    summary = run_ensemble(reaction_system, temp_K, sim_time_s, n_trajectories, volume=volume_L,
+                           n_workers=n_workers, seed=seed, method=method)
+    summary["temperature_K"] = temp_K
+    return {"stochastic": summary}
+
+class Cancelled(Exception):
+    pass
+
+# Während des Modellabgleichs wird ein Abbruch nur vorgemerkt (siehe _update_model).
+_cancel_state = {"shielded": False, "pending": False}
+
+def _raise_cancelled(signum, frame):
+    if _cancel_state["shielded"]:
+        _cancel_state["pending"] = True
+        return
+    raise Cancelled()
+
+def emit_message(message):
+    """Schreibt eine Nachricht des Streaming-Protokolls als eine JSON-Zeile."""
+    print(json.dumps(message), flush=True)
+
+def _update_model(model, request):
+    """
+    Übernimmt reset/delta eines Auftrags. Ein SIGTERM in dieser Zeit wird
+    erst danach als Cancelled ausgelöst, damit ein Abbruch das Modell nicht
+    halb geändert zurücklässt.
+    """
+    _cancel_state["shielded"] = True
+    try:
+        if request.get("reset"):
+            model = KineticModel()
+        rebuild = model.apply_delta(request.get("delta", {}))
+        system = model.get_system()
+    finally:
+        _cancel_state["shielded"] = False
+    if _cancel_state["pending"]:
+        _cancel_state["pending"] = False
+        raise Cancelled()
+    return model, rebuild, system
+
+def serve_worker():
+    """
+    Langlebiger Worker für die GUI: liest Aufträge als JSON-Zeilen von stdin
+    {"type": "run", "reset", "delta", "time", "temp", "plot_dir", "output",
+    "uncertainty", "solver_settings"}, hält das
+    Modell zwischen den Läufen im Speicher (model_sync.KineticModel) und
+    beantwortet jeden Auftrag mit dem Streaming-Protokoll von --stream.
+    SIGTERM bricht nur den laufenden Auftrag ab, nicht den Worker; nach
+    einem Abbruch oder Fehler schickt die GUI wieder das ganze Modell.
+    """
+    model = KineticModel()
+    signal.signal(signal.SIGTERM, _raise_cancelled)
+    while True:
+        try:
+            line = sys.stdin.readline()
+        except Cancelled:
+            continue  # Abbruch kam erst nach dem Ende des Auftrags an
+        if not line:
+            break
+        try:
+            request = json.loads(line)
+            model, rebuild, reaction_system = _update_model(model, request)
+            reaction_system.solver_settings = request.get("solver_settings")
+            results = run_system_analysis(reaction_system, float(request["time"]), float(request["temp"]),
+                                          request["plot_dir"], emit=emit_message, output=request.get("output", "png"),
+                                          uncertainty=request.get("uncertainty"))
+            results["model"] = {"rebuilt": rebuild, **model.stats}
+            emit_message({"type": "result", **results})
+        except Cancelled:
+            emit_message({"type": "cancelled"})
+        except Exception as e:
+            emit_message({"type": "error", "error": str(e)})
 
 def main():
     parser = argparse.ArgumentParser(description="Run a chemical kinetics simulation.")
-    parser.add_argument("kin_file", help="Path to the .kin input file.")
+    parser.add_argument("kin_file", nargs="?", help="Path to the .kin input file.")
     parser.add_argument("-t", "--time", type=float, default=10.0, help="Simulation time in seconds.")
     parser.add_argument("-T", "--temp", type=float, default=298.15, help="Temperature in Kelvin.")
-    parser.add_argument("--plot_dir", required=True, help="Directory to save output plots.")
+    parser.add_argument("--plot_dir", help="Directory to save output plots (required unless --steady_state, --stochastic or --calibrate).")
+    parser.add_argument("--steady_state", action="store_true", help="Solve dc/dt = 0 directly instead of integrating over time.")
+    parser.add_argument("--temp_ramp", type=float, help="Linear temperature ramp in K/s, starting at --temp.")
+    parser.add_argument("--temp_end", type=float, help="Final temperature at which the ramp is held (K).")
+    parser.add_argument("--adiabatic", action="store_true", help="Couple an adiabatic energy balance.")
+    parser.add_argument("--heat_transfer", type=float, help="Heat-transfer coefficient UA/V in W/(L·K); couples an energy balance.")
+    parser.add_argument("--heat_capacity", type=float, default=4184.0, help="Volumetric heat capacity in J/(L·K).")
+    parser.add_argument("--ambient_temp", type=float, help="Coolant temperature in Kelvin (default: --temp).")
+    parser.add_argument("--stop_below", action="append", default=[], metavar="SPECIES:VALUE", help="Stop when a species falls to VALUE.")
+    parser.add_argument("--stop_above", action="append", default=[], metavar="SPECIES:VALUE", help="Stop when a species rises to VALUE.")
+    parser.add_argument("--stop_conversion", action="append", default=[], metavar="SPECIES:X", help="Stop at conversion X (0..1) of a species.")
+    parser.add_argument("--stop_steady", type=float, metavar="REL", help="Stop when max|dc/dt| drops below REL times its initial value.")
+    parser.add_argument("--stochastic", type=int, metavar="N", help="Run N stochastic trajectories instead of the ODE solver.")
+    parser.add_argument("--volume", type=float, default=1e-21, help="Reaction volume in liters for --stochastic.")
+    parser.add_argument("--tau_leap", action="store_true", help="Use tau-leaping instead of the exact SSA.")
+    parser.add_argument("--workers", type=int, help="Number of worker processes for --stochastic, --uncertainty and --integrator blocks.")
+    parser.add_argument("--seed", type=int, help="Random seed for --stochastic and --uncertainty.")
+    parser.add_argument("--stream", action="store_true", help="Emit progress, partial trajectories and the result as JSON lines.")
+    parser.add_argument("--codegen", choices=["python", "cython", "off"], default="python",
+                        help="Use mechanism-specialized rate/Jacobian code (cached on disk by mechanism hash).")
+    parser.add_argument("--num_points", type=int, default=200, help="Number of output time points.")
+    parser.add_argument("--trajectory_file", help="Write the trajectory chunk by chunk to this memory-mapped file instead of the JSON output.")
+    parser.add_argument("--stride", action="append", default=[], metavar="SPECIES:N",
+                        help="With --trajectory_file, store only every N-th point of a species.")
+    parser.add_argument("--regimes", action="store_true", help="Add a segmented (windowed) order analysis for every species.")
+    parser.add_argument("--fluxes", action="store_true", help="Add reaction fluxes, rate-of-production contributions and dominant pathways.")
+    parser.add_argument("--output", choices=["png", "report", "both"], default="png",
+                        help="Write one PNG per plot, a single self-contained HTML report, or both into --plot_dir.")
+    parser.add_argument("--uncertainty", metavar="SPEC.json",
+                        help='Propagate Arrhenius uncertainties, e.g. {"k1": {"A": {"dist": "lognormal", "sigma": 0.3}}, "*": {"Ea": {"dist": "normal", "std": 2000}}}.')
+    parser.add_argument("--samples", type=int, default=200, help="Number of Monte Carlo samples for --uncertainty.")
+    parser.add_argument("--log_space", action="store_true",
+                        help="Integrate log-concentrations: strictly positive results and relative accuracy down to trace radicals.")
+    parser.add_argument("--integrator", choices=["scipy", "native", "blocks", "multirate"], default="scipy",
+                        help="Integrate with SciPy's Radau, natively in the C++ core (RODAS3, sparse LU; isothermal runs without QSSA or stop conditions), "
+                             "block by block over the decoupled subnetworks (strongly connected components in topological order) "
+                             "or multirate: fast species (is_intermediate or from the Jacobian spectrum) sub-stepped implicitly, slow ones with large steps "
+                             "(only pays off with about 1000 or more slow species; smaller systems use SciPy).")
+    parser.add_argument("--rtol", type=float, help="Relative tolerance (overrides calibrated solver_settings in the .kin file).")
+    parser.add_argument("--atol", type=float, help="Absolute tolerance in mol/L (overrides calibrated solver_settings).")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="Search rtol/atol for the best wall time at --target_error, report the Pareto front and store the result in the .kin file.")
+    parser.add_argument("--target_error", type=float, default=1e-3,
+                        help="Accepted error for --calibrate, relative to each species' maximum concentration.")
+    parser.add_argument("--no_save", action="store_true", help="With --calibrate, only report; do not modify the .kin file.")
+    parser.add_argument("--checkpoint", metavar="FILE",
+                        help="Periodically save the integrator state to FILE (.npz); integrates step by step with SciPy's Radau.")
+    parser.add_argument("--checkpoint_interval", type=float, default=60.0, help="Seconds of wall time between checkpoints.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue from the --checkpoint file; with a larger --time a finished run is extended from its final state.")
+    parser.add_argument("--worker", action="store_true", help="Serve simulation requests with model deltas from stdin (used by the GUI).")
     args = parser.parse_args()
+    if args.worker:
+        serve_worker()
+        return
+    if not args.kin_file:
+        parser.error("kin_file is required unless --worker is given.")
+    if not (args.steady_state or args.stochastic or args.calibrate) and not args.plot_dir:
+        parser.error("--plot_dir is required unless --steady_state, --stochastic or --calibrate is given.")
+    if args.resume and not args.checkpoint:
+        parser.error("--resume requires --checkpoint.")
+
+    temperature_program, energy_balance = None, None
+    if args.temp_ramp is not None:
+        temperature_program = TemperatureProgram.linear_ramp(args.temp, args.temp_ramp, args.time, args.temp_end)
+    if args.adiabatic or args.heat_transfer is not None:
+        energy_balance = EnergyBalance(args.heat_capacity, 0.0 if args.adiabatic else args.heat_transfer, args.ambient_temp)
+
+    def split_spec(spec):
+        name, _, value = spec.rpartition(":")
+        if not name:
+            parser.error(f"Invalid specification '{spec}', expected SPECIES:VALUE.")
+        return name, float(value)
+
+    stop_conditions = [SpeciesThreshold(*split_spec(s), below=True) for s in args.stop_below]
+    stop_conditions += [SpeciesThreshold(*split_spec(s), below=False) for s in args.stop_above]
+    stop_conditions += [TargetConversion(*split_spec(s)) for s in args.stop_conversion]
+    if args.stop_steady is not None:
+        stop_conditions.append(RateNormThreshold(args.stop_steady))
+    strides = {name: int(value) for name, value in map(split_spec, args.stride)}
+    uncertainty = None
+    if args.uncertainty:
+        with open(args.uncertainty, 'r', encoding='utf-8') as f:
+            uncertainty = {"spec": json.load(f), "samples": args.samples, "workers": args.workers, "seed": args.seed}
+
+    checkpoint = None
+    if args.checkpoint:
+        checkpoint = {"file": args.checkpoint, "interval": args.checkpoint_interval, "resume": args.resume}
+
+    if args.stream:
+        # Abbruch aus der GUI (terminate) beendet die Integration geordnet.
+        signal.signal(signal.SIGTERM, _raise_cancelled)
 
     try:
+        if args.steady_state:
+            print(json.dumps(run_steady_state(args.kin_file, args.temp), indent=4))
+            return
+        if args.calibrate:
+            print(json.dumps(run_calibration(args.kin_file, args.time, args.temp, temperature_program, energy_balance,
+                                             args.target_error, args.integrator, None if args.codegen == "off" else args.codegen,
+                                             save=not args.no_save, log_space=args.log_space), indent=4))
+            return
+        if args.stochastic:
+            print(json.dumps(run_stochastic(args.kin_file, args.time, args.temp, args.stochastic, args.volume,
+                                            "tau_leap" if args.tau_leap else "ssa", args.workers, args.seed), indent=4))
+            return
         final_results = run_simulation_and_analysis(
             kin_filepath=args.kin_file, 
             sim_time_s=args.time, 
             temp_K=args.temp,
-            plot_dir=args.plot_dir
+            plot_dir=args.plot_dir,
+            temperature_program=temperature_program,
+            energy_balance=energy_balance,
+            stop_conditions=stop_conditions,
+            emit=emit_message if args.stream else None,
+            codegen=None if args.codegen == "off" else args.codegen,
+            num_points=args.num_points,
+            trajectory_file=args.trajectory_file,
+            strides=strides,
+            regimes=args.regimes,
+            fluxes=args.fluxes,
+            output=args.output,
+            uncertainty=uncertainty,
+            log_space=args.log_space,
+            integrator=args.integrator,
+            rtol=args.rtol,
+            atol=args.atol,
+            workers=args.workers,
+            checkpoint=checkpoint
         )
-        print(json.dumps(final_results, indent=4))
+        if args.stream:
+            emit_message({"type": "result", **final_results})
+        else:
+            print(json.dumps(final_results, indent=4))
+    except Cancelled:
+        emit_message({"type": "cancelled"})
     except Exception as e:
-        print(json.dumps({"error": str(e), "traceback": str(e.__traceback__)}))
+        if args.stream:
+            emit_message({"type": "error", "error": str(e)})
+        else:
+            print(json.dumps({"error": str(e), "traceback": str(e.__traceback__)}))
 
 if __name__ == '__main__':
     if len(sys.argv) > 1:
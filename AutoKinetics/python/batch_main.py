@@ -0,0 +1,303 @@
+import os
+import sys
+import json
+import time
+import signal
+import hashlib
+import argparse
+import itertools
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from parser import parse_kin_file
+from backend_main import simulate
+from analyzer import analyze_kinetics
+
+# Pro Worker-Prozess geparste Mechanismen: {Pfad: (mtime, ReactionSystem)}
+_MECHANISM_CACHE = {}
+
+class JobTimeout(Exception):
+    pass
+
+def _raise_timeout(signum, frame):
+    raise JobTimeout()
+
+def load_mechanism(kin_file):
+    """Parst eine .kin-Datei nur einmal pro Worker, solange sie sich nicht ändert."""
+    mtime = Path(kin_file).stat().st_mtime
+    cached = _MECHANISM_CACHE.get(kin_file)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, parse_kin_file(kin_file))
+        _MECHANISM_CACHE[kin_file] = cached
+    return cached[1]
+
+def job_id(kin_file, params):
+    key = json.dumps([str(kin_file), params], sort_keys=True)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+# Gitterparameter, die run_job auswertet; dazu c0:<Spezies> für Startkonzentrationen
+GRID_NAMES = ("temp", "time", "num_points")
+
+def check_grid(grid):
+    """Lehnt Gitterparameter ab, die run_job nicht kennt (sie würden stillschweigend ignoriert)."""
+    unknown = sorted(name for name in grid if name not in GRID_NAMES and not name.startswith("c0:"))
+    if unknown:
+        raise ValueError(f"Unbekannte Gitterparameter: {', '.join(unknown)} (erlaubt: {', '.join(GRID_NAMES)}, c0:<Spezies>)")
+
+def expand_grid(grid):
+    """Kartesisches Produkt eines Parametergitters {name: [werte]}."""
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+def collect_jobs(inputs, grid):
+    """
+    Erzeugt die Jobliste aus .kin-Dateien, Verzeichnissen (alle *.kin) und
+    JSON-Manifesten {"kin_files": [...], "grid": {...}}. Das Gitter der
+    Kommandozeile ergänzt bzw. überschreibt das des Manifests. Unbekannte
+    Gitterparameter ergeben einen ValueError.
+    """
+    check_grid(grid)
+    jobs = []
+    for entry in inputs:
+        path = Path(entry)
+        entry_grid = dict(grid)
+        if path.is_dir():
+            kin_files = sorted(path.glob("*.kin"))
+        elif path.suffix == ".json":
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            kin_files = [(path.parent / k).resolve() for k in manifest.get("kin_files", [])]
+            entry_grid = manifest.get("grid", {}) | grid
+            check_grid(entry_grid)
+        else:
+            kin_files = [path]
+        for kin_file in kin_files:
+            for params in expand_grid(entry_grid):
+                jobs.append({"job_id": job_id(kin_file, params), "kin_file": str(kin_file), "params": params, "attempts": 0})
+    return jobs
+
+def run_job(job, timeout_s):
+    """
+    Führt einen Job im Worker aus. Gitterparameter: temp, time, num_points
+    und c0:<Spezies> für Startkonzentrationen. Fehler und Zeitüberschreitungen
+    werden als Ergebniszeile zurückgegeben, nicht geworfen.
+    """
+    params = job["params"]
+    started = time.perf_counter()
+    row = {"job_id": job["job_id"], "kin_file": job["kin_file"], "params": params, "attempt": job["attempts"] + 1}
+    use_alarm = timeout_s and hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout_s)
+
+    system, overrides = None, {}
+    try:
+        system = load_mechanism(job["kin_file"])
+        for key, value in params.items():
+            if key.startswith("c0:"):
+                species = system.species[system.species_map[key[3:]]]
+                overrides[species] = species.start_concentration
+                species.start_concentration = float(value)
+        sim_results = simulate(system, float(params.get("time", 10.0)), float(params.get("temp", 298.15)),
+                               num_points=int(params.get("num_points", 200)))
+        analysis = analyze_kinetics(sim_results, system)
+        row.update({
+            "status": "ok",
+            "species_names": sim_results["species_names"],
+            "final_concentrations": [c[-1] for c in sim_results["concentrations"]],
+            "stop_condition": sim_results["stop_condition"],
+            "analysis": {label: {"best_fit_order": a["best_fit_order"], "k": a["calculated_k"], "r_squared": a["r_squared"]}
+                         for label, a in analysis.items()}
+        })
+    except JobTimeout:
+        row.update({"status": "timeout", "error": f"Zeitlimit von {timeout_s} s überschritten."})
+    except Exception as e:
+        row.update({"status": "error", "error": str(e)})
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        for species, value in overrides.items():
+            species.start_concentration = value
+    row["elapsed_s"] = time.perf_counter() - started
+    return row
+
+class JsonlWriter:
+    """Hängt jedes Ergebnis sofort als Zeile an; wird zum Fortsetzen wieder gelesen."""
+    def __init__(self, path):
+        self.path = Path(path)
+        self.file = open(self.path, 'a', encoding='utf-8')
+        if self.file.tell() > 0:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, 2)
+                if f.read(1) != b"\n":
+                    self.file.write("\n")  # abgeschnittene Zeile eines abgebrochenen Laufs abschließen
+
+    def empty(self):
+        return self.path.stat().st_size == 0
+
+    def completed_ids(self):
+        done = set()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["job_id"])
+                except (ValueError, KeyError):
+                    continue  # abgebrochene letzte Zeile eines unterbrochenen Laufs
+        return done
+
+    def write(self, row):
+        self.file.write(json.dumps(row) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class ParquetWriter:
+    """
+    Schreibt die Ergebnisse als Parquet-Dataset mit einer Datei
+    part-<job_id>.parquet pro Job, sobald der Job fertig ist. Jede Datei
+    wird über eine temporäre Datei atomar angelegt, ein Abbruch verliert
+    also keine fertigen Jobs und hinterlässt keine unlesbaren Teile.
+    Benötigt pyarrow.
+    """
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Für --format parquet wird pyarrow benötigt.")
+        self.pa, self.pq = pa, pq
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def empty(self):
+        return not any(self.path.glob("part-*.parquet"))
+
+    def completed_ids(self):
+        return {part.stem[len("part-"):] for part in self.path.glob("part-*.parquet")}
+
+    def write(self, row):
+        flat = {"job_id": row["job_id"], "kin_file": row["kin_file"], "params": json.dumps(row["params"]),
+                "status": row["status"], "error": row.get("error"), "attempt": row["attempt"], "elapsed_s": row["elapsed_s"],
+                "species_names": row.get("species_names"), "final_concentrations": row.get("final_concentrations"),
+                "analysis": json.dumps(row.get("analysis"))}
+        table = self.pa.Table.from_pylist([flat], schema=self._schema())
+        target = self.path / f"part-{row['job_id']}.parquet"
+        temporary = target.with_name(target.name + ".tmp")
+        self.pq.write_table(table, temporary)
+        os.replace(temporary, target)
+
+    def _schema(self):
+        pa = self.pa
+        return pa.schema([("job_id", pa.string()), ("kin_file", pa.string()), ("params", pa.string()),
+                          ("status", pa.string()), ("error", pa.string()), ("attempt", pa.int64()),
+                          ("elapsed_s", pa.float64()), ("species_names", pa.list_(pa.string())),
+                          ("final_concentrations", pa.list_(pa.float64())), ("analysis", pa.string())])
+
+    def close(self):
+        pass
+
+def run_batch(jobs, writer, workers=None, timeout_s=None, retries=1, progress=None):
+    """
+    Verteilt die Jobs auf einen Prozess-Pool (höchstens 2 * workers
+    gleichzeitig eingereiht) und schreibt jedes Ergebnis, sobald es vorliegt.
+    Fehlgeschlagene Jobs werden bis zu `retries` Mal erneut eingereiht.
+    Stirbt ein Worker, ist nicht erkennbar, welcher Job schuld war: Der Pool
+    wird neu aufgebaut und die betroffenen Jobs laufen einzeln (isolated)
+    ohne Fehlversuch erneut; erst ein Absturz allein zählt als Fehlversuch.
+    """
+    pending = deque(sorted(jobs, key=lambda j: j["kin_file"]))
+    isolated = deque()
+    running = {}
+    executor = ProcessPoolExecutor(max_workers=workers)
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+    counts = {"ok": 0, "error": 0, "timeout": 0}
+    try:
+        while pending or isolated or running:
+            if isolated:
+                if not running:
+                    job = isolated.popleft()
+                    running[executor.submit(run_job, job, timeout_s)] = job
+            else:
+                while pending and len(running) < max_in_flight:
+                    job = pending.popleft()
+                    running[executor.submit(run_job, job, timeout_s)] = job
+            alone = len(running) == 1
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                job = running.pop(future)
+                try:
+                    row = future.result()
+                except BrokenProcessPool:
+                    broken = True
+                    if not alone:
+                        isolated.append(job)
+                        continue
+                    row = {"job_id": job["job_id"], "kin_file": job["kin_file"], "params": job["params"],
+                           "attempt": job["attempts"] + 1, "status": "error", "error": "Worker-Prozess abgestürzt.", "elapsed_s": 0.0}
+
+                job["attempts"] += 1
+                if row["status"] != "ok" and job["attempts"] <= retries:
+                    (isolated if broken and alone else pending).append(job)
+                    continue
+                writer.write(row)
+                counts[row["status"]] += 1
+                if progress:
+                    progress(counts)
+            if broken:
+                # Einmal pro Runde: Pool neu aufbauen, noch laufende Jobs ohne Fehlversuch einzeln wiederholen.
+                isolated.extend(running.values())
+                running.clear()
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = ProcessPoolExecutor(max_workers=workers)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        writer.close()
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many .kin files and parameter grids as a batch.")
+    parser.add_argument("inputs", nargs="+", help=".kin files, directories containing .kin files, or JSON manifests.")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2,...",
+                        help="Parameter grid (temp, time, num_points, c0:<species>); may be given several times.")
+    parser.add_argument("-o", "--output", required=True, help="Output JSONL file or Parquet dataset directory.")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl", help="Output format.")
+    parser.add_argument("--workers", type=int, help="Number of worker processes.")
+    parser.add_argument("--timeout", type=float, help="Per-job timeout in seconds.")
+    parser.add_argument("--retries", type=int, default=1, help="Retries for failed or timed-out jobs.")
+    parser.add_argument("--resume", action="store_true", help="Skip jobs already present in the output.")
+    args = parser.parse_args()
+
+    grid = {}
+    for spec in args.grid:
+        name, _, values = spec.partition("=")
+        if not values:
+            parser.error(f"Invalid grid '{spec}', expected NAME=V1,V2,...")
+        grid[name] = [float(v) for v in values.split(",")]
+    if not grid:
+        grid = {"temp": [298.15]}
+
+    try:
+        jobs = collect_jobs(args.inputs, grid)
+    except ValueError as e:
+        parser.error(str(e))
+    writer = ParquetWriter(args.output) if args.format == "parquet" else JsonlWriter(args.output)
+    if args.resume:
+        done = writer.completed_ids()
+        jobs = [job for job in jobs if job["job_id"] not in done]
+    elif not writer.empty():
+        writer.close()
+        parser.error(f"{args.output} already contains results; use --resume to continue it.")
+
+    total = len(jobs)
+    def progress(counts):
+        finished = sum(counts.values())
+        print(f"[{finished}/{total}] ok={counts['ok']} error={counts['error']} timeout={counts['timeout']}", file=sys.stderr)
+
+    counts = run_batch(jobs, writer, workers=args.workers, timeout_s=args.timeout, retries=args.retries, progress=progress)
+    print(json.dumps({"jobs": total, **counts}))
+
+if __name__ == '__main__':
+    main()
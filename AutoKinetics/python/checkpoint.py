@@ -0,0 +1,94 @@
+# python/checkpoint.py
+import os
+import json
+import time
+import hashlib
+import numpy as np
+from pathlib import Path
+from scipy.integrate._ivp.radau import RadauDenseOutput
+
+# Zustand von scipy.integrate.Radau, der den nächsten Schritt bestimmt
+_RADAU_FIELDS = ("t", "t_old", "y", "y_old", "f", "h_abs", "h_abs_old", "error_norm_old",
+                 "J", "current_jac", "Z", "jac_factor", "nfev", "njev", "nlu")
+
+def signature(*parts):
+    """Kurzer Hash über die Problemdefinition, damit nur passende Sicherungen fortgesetzt werden."""
+    return hashlib.sha256(json.dumps(parts, default=float).encode('utf-8')).hexdigest()[:20]
+
+def radau_state(integrator):
+    """Integratorzustand (Zeit, Zustand, Schrittweite, Jacobi-Matrix, LU-Zerlegungen, Newton-Startwert) als Arrays."""
+    state = {}
+    for name in _RADAU_FIELDS:
+        value = getattr(integrator, name)
+        if value is not None:
+            state["radau_" + name] = np.asarray(value)
+    for name in ("LU_real", "LU_complex"):
+        value = getattr(integrator, name)
+        if value is not None:
+            state[f"radau_{name}_lu"], state[f"radau_{name}_piv"] = value
+    sol = integrator.sol
+    if sol is not None:
+        state.update(radau_sol_t_old=np.asarray(sol.t_old), radau_sol_t=np.asarray(sol.t),
+                     radau_sol_y_old=sol.y_old, radau_sol_Q=sol.Q)
+    return state
+
+def restore_radau(integrator, state, t_bound):
+    """Setzt einen neu angelegten Radau-Integrator auf den gesicherten Zustand; t_bound darf größer sein."""
+    for name in _RADAU_FIELDS:
+        key = "radau_" + name
+        value = state[key] if key in state else None
+        if value is not None and value.ndim == 0:
+            value = value.item()
+        setattr(integrator, name, value)
+    for name in ("LU_real", "LU_complex"):
+        key = f"radau_{name}_lu"
+        setattr(integrator, name, (state[key], state[f"radau_{name}_piv"]) if key in state else None)
+    integrator.sol = None
+    if "radau_sol_Q" in state:
+        integrator.sol = RadauDenseOutput(float(state["radau_sol_t_old"]), float(state["radau_sol_t"]),
+                                          state["radau_sol_y_old"], state["radau_sol_Q"])
+    integrator.t_bound = t_bound
+    integrator.status = 'running' if integrator.t < t_bound else 'finished'
+
+class Checkpoint:
+    """
+    Sichert den Zustand von ODESolver.solve_stream spätestens alle interval
+    Sekunden (Wanduhr) und am Ende der Integration in eine .npz-Datei:
+    Radau-Zustand samt Schrittweite und Verlauf, Schleifenzustand und die
+    bisherige Ausgabe (bei keep=False nur deren Länge, die Werte stehen dann
+    in der Trajektoriendatei). Geschrieben wird atomar über eine temporäre
+    Datei, ein Abbruch hinterlässt immer die letzte vollständige Sicherung.
+    on_save wird vor jedem Schreiben aufgerufen (z. B. Trajektoriendatei flushen).
+    """
+    def __init__(self, path, interval=60.0, resume=False, on_save=None):
+        self.path = Path(path)
+        self.interval = float(interval)
+        self.resume = resume
+        self.on_save = on_save
+        self._last_save = time.monotonic()
+
+    def due(self):
+        return time.monotonic() - self._last_save >= self.interval
+
+    def load(self):
+        """Gesicherter Zustand als Dictionary oder None, wenn (noch) keine Sicherung existiert."""
+        if not (self.resume and self.path.exists()):
+            return None
+        with np.load(self.path, allow_pickle=False) as data:
+            return {key: data[key] for key in data.files}
+
+    def saved_points(self):
+        """Anzahl der bis zur Sicherung ausgegebenen Punkte oder None ohne Sicherung."""
+        if not (self.resume and self.path.exists()):
+            return None
+        with np.load(self.path, allow_pickle=False) as data:
+            return int(data["next_idx"])
+
+    def save(self, state):
+        if self.on_save is not None:
+            self.on_save()
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        with open(temporary, 'wb') as f:
+            np.savez(f, **state)
+        os.replace(temporary, self.path)
+        self._last_save = time.monotonic()
@@ -0,0 +1,206 @@
+# python/codegen.py
+import os
+import sys
+import json
+import hashlib
+import tempfile
+import importlib.util
+from pathlib import Path
+
+CODEGEN_VERSION = 3
+# Pro Prozess bereits geladene Module: {Hash: Modul}
+_LOADED = {}
+
+def cache_dir():
+    """Verzeichnis für generierte Module (AUTOKINETICS_CACHE oder ~/.cache/autokinetics/codegen)."""
+    path = os.environ.get("AUTOKINETICS_CACHE") or Path.home() / ".cache" / "autokinetics" / "codegen"
+    return Path(path)
+
+def mechanism_hash(system):
+    """Hash über die Struktur des Mechanismus; Arrhenius-Parameter gehen nicht ein (k wird übergeben)."""
+    structure = [CODEGEN_VERSION, len(system.species), [
+        [sorted(r.reactants), sorted(r.products), sorted((int(i), float(o)) for i, o in r.reaction_order.items())]
+        for r in system.reactions]]
+    return hashlib.sha256(json.dumps(structure).encode('utf-8')).hexdigest()[:20]
+
+def _number(value):
+    value = float(value)
+    return repr(int(value)) + ".0" if value.is_integer() else repr(value)
+
+def _signed_sum(terms):
+    """[(Koeffizient, Ausdruck), ...] -> 'a - 2.0 * b + c' ohne Multiplikationen mit 1."""
+    parts = []
+    for coefficient, expr in terms:
+        magnitude = expr if abs(coefficient) == 1 else f"{_number(abs(coefficient))} * {expr}"
+        if not parts:
+            parts.append(magnitude if coefficient > 0 else f"-{magnitude}")
+        else:
+            parts.append(f"{'+' if coefficient > 0 else '-'} {magnitude}")
+    return " ".join(parts)
+
+class _Powers:
+    """Gemeinsame Teilausdrücke c_i^m: jede Potenz wird einmal und ganzzahlig als Produkt berechnet."""
+    def __init__(self, lines):
+        self.lines, self.known = lines, set()
+
+    def __call__(self, i, order):
+        if order == 0.0:
+            return "1.0"
+        if order == 1.0:
+            return f"c{i}"
+        if not float(order).is_integer() or order < 1:
+            name = f"c{i}_p{str(order).replace('.', '_').replace('-', 'm')}"
+            if name not in self.known:
+                self.lines.append(f"    {name} = c{i} ** {_number(order)} if c{i} > 0.0 else 0.0")
+                self.known.add(name)
+            return name
+        name = f"c{i}_{int(order)}"
+        if name not in self.known:
+            self.lines.append(f"    {name} = {self(i, order - 1)} * c{i}")
+            self.known.add(name)
+        return name
+
+def generate_source(system):
+    """
+    Erzeugt Python-Quelltext mit Funktionen, in denen Indizes und
+    Reaktionsordnungen fest eingesetzt sind:
+
+      rates(c, k)         Reaktionsgeschwindigkeiten r_j
+      species_rates(r)    dc/dt = N @ r, nur mit den Stöchiometrie-Einträgen ungleich 0
+      jacobian(c, k)      d(dc/dt)/dc
+
+    Konzentrationen <= 0 werden wie in ODESolver._calculate_rates als 0 behandelt.
+    """
+    n_species, n_reactions = len(system.species), len(system.reactions)
+    N = system.get_stoichiometry_matrix()
+    used = sorted({i for r in system.reactions for i, _ in r.reactants})
+    # Rechnen mit Python-Floats statt NumPy-Skalaren; das Indizieren von Arrays wäre der teuerste Teil.
+    clamp = ["    c = c.tolist()", "    k = k.tolist()"] + [f"    c{i} = c[{i}] if c[{i}] > 0.0 else 0.0" for i in used]
+
+    lines = ["# Automatisch erzeugt von codegen.py – nicht bearbeiten.", "import numpy as np", "",
+             "N_SPECIES = %d" % n_species, "N_REACTIONS = %d" % n_reactions, ""]
+
+    # --- rates
+    body = []
+    power = _Powers(body)
+    rate_terms = []
+    for j, reaction in enumerate(system.reactions):
+        factors = [power(i, reaction.reaction_order.get(i, 1.0)) for i, _ in reaction.reactants]
+        rate_terms.append(" * ".join([f"k[{j}]"] + factors))
+    lines += ["def rates(c, k):"] + clamp + body + ["    return np.array(["]
+    lines += [f"        {term}," for term in rate_terms] + ["    ])", ""]
+
+    # --- species_rates
+    lines += ["def species_rates(r):", "    r = r.tolist()", "    return np.array(["]
+    for i in range(n_species):
+        terms = [(N[i, j], f"r[{j}]") for j in range(n_reactions) if N[i, j] != 0]
+        lines.append(f"        {_signed_sum(terms) if terms else '0.0'},")
+    lines += ["    ])", ""]
+
+    # --- jacobian: erst dr_j/dc_i, dann J = N @ drdc nur über die Strukturbesetzung
+    body = []
+    power = _Powers(body)
+    derivatives = {}
+    for j, reaction in enumerate(system.reactions):
+        factors = [(i, reaction.reaction_order.get(i, 1.0)) for i, _ in reaction.reactants]
+        for m, (i, order) in enumerate(factors):
+            if order == 0.0:
+                continue
+            others = [f"k[{j}]"] + [power(i2, o2) for m2, (i2, o2) in enumerate(factors) if m2 != m]
+            if order == 1.0:
+                # c <= 0 zählt als 0 (konstant): Ableitung 0 wie in ODESolver._rate_derivatives
+                expr = f"({' * '.join(others)} if c{i} > 0.0 else 0.0)"
+            elif float(order).is_integer() and order > 1:
+                expr = " * ".join([_number(order), power(i, order - 1)] + others)
+            else:
+                expr = f"({_number(order)} * c{i} ** {_number(order - 1.0)} if c{i} > 0.0 else 0.0) * " + " * ".join(others)
+            name = f"d{j}_{i}"
+            body.append(f"    {name} = {expr}" if name not in derivatives else f"    {name} = {name} + {expr}")
+            derivatives.setdefault(name, (j, i))
+    lines += ["def jacobian(c, k):", "    J = np.zeros((%d, %d))" % (n_species, n_species)] + clamp + body
+    by_species = {}
+    for name, (j, i) in derivatives.items():
+        by_species.setdefault(i, []).append((j, name))
+    for s in range(n_species):
+        for i in sorted(by_species):
+            terms = [(N[s, j], name) for j, name in by_species[i] if N[s, j] != 0]
+            if terms:
+                lines.append(f"    J[{s}, {i}] = {_signed_sum(terms)}")
+    lines += ["    return J", ""]
+    return "\n".join(lines)
+
+def _write_atomic(path, text):
+    tmp = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+    tmp.write_text(text, encoding='utf-8')
+    os.replace(tmp, path)  # gleichzeitige Batch-Worker sehen nie eine halbe Datei
+
+def _import_file(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def _build_cython(source_path, name):
+    """
+    Übersetzt das generierte Modul mit der Cython-Toolchain aus setup.py; None, wenn das nicht möglich ist.
+    Gebaut wird in einem eigenen Verzeichnis, erst die fertige Erweiterung kommt per os.replace in den Cache.
+    """
+    try:
+        from Cython.Build import cythonize
+        from setuptools import Distribution, Extension
+        from setuptools.command.build_ext import build_ext
+    except ImportError:
+        return None
+    with tempfile.TemporaryDirectory(prefix=f".{name}.", dir=source_path.parent) as build_dir:
+        pyx_path = Path(build_dir) / (name + ".pyx")
+        pyx_path.write_text(source_path.read_text(encoding='utf-8'), encoding='utf-8')
+        distribution = Distribution({"ext_modules": cythonize([Extension(name, [str(pyx_path)])], quiet=True,
+                                                               compiler_directives={"language_level": 3})})
+        command = build_ext(distribution)
+        command.build_lib = command.build_temp = build_dir
+        command.inplace = False
+        command.ensure_finalized()
+        command.run()
+        built = Path(command.get_ext_fullpath(name))
+        target = source_path.parent / built.name
+        os.replace(built, target)
+    return target
+
+def load_compiled(system, backend="python"):
+    """
+    Liefert das spezialisierte Modul für system. Quelltext bzw. kompilierte
+    Erweiterung liegen unter cache_dir() und werden über den Mechanismus-Hash
+    wiederverwendet; ist das Verzeichnis nicht beschreibbar, wird nur im
+    Speicher übersetzt. backend='cython' fällt auf Python zurück, wenn Cython
+    oder ein C-Compiler fehlt.
+    """
+    digest = mechanism_hash(system)
+    key = (digest, backend)
+    if key in _LOADED:
+        return _LOADED[key]
+
+    name = f"ak_mech_{digest}"
+    directory = cache_dir()
+    source_path = directory / f"{name}.py"
+    module = None
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        if not source_path.exists():
+            _write_atomic(source_path, generate_source(system))
+        if backend == "cython":
+            extensions = sorted(directory.glob(f"{name}_cy.*.so")) + sorted(directory.glob(f"{name}_cy.*.pyd"))
+            try:
+                ext_path = extensions[0] if extensions else _build_cython(source_path, f"{name}_cy")
+            except Exception as e:
+                print(f"Cython-Übersetzung fehlgeschlagen, verwende Python: {e}", file=sys.stderr)
+                ext_path = None
+            if ext_path is not None:
+                module = _import_file(f"{name}_cy", ext_path)
+        if module is None:
+            module = _import_file(name, source_path)
+    except OSError:
+        module = type(sys)(name)
+        exec(compile(generate_source(system), f"<{name}>", "exec"), module.__dict__)
+
+    _LOADED[key] = module
+    return module
@@ -0,0 +1,248 @@
+# python/continuation.py
+import numpy as np
+from scipy.linalg import null_space
+from data_model import R, ReactionSystem
+from simulator import ODESolver
+
+class ContinuationParameter:
+    """
+    Parameter, entlang dessen stationäre Zustände verfolgt werden:
+    'temperature', 'start_concentration' (target = Spezies-Name) oder
+    'arrhenius_A' (target = rate_label der Reaktion).
+    """
+    KINDS = ('temperature', 'start_concentration', 'arrhenius_A')
+
+    def __init__(self, kind, target=None):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unbekannter Fortsetzungsparameter '{kind}'.")
+        if kind != 'temperature' and target is None:
+            raise ValueError(f"Parameter '{kind}' benötigt eine Spezies bzw. Reaktion als Ziel.")
+        self.kind, self.target = kind, target
+
+    def bind(self, system):
+        if self.kind == 'start_concentration':
+            self.index = system.species_map[self.target]
+        elif self.kind == 'arrhenius_A':
+            labels = [r.rate_label for r in system.reactions]
+            if self.target not in labels:
+                raise ValueError(f"Reaktion '{self.target}' existiert nicht.")
+            self.index = labels.index(self.target)
+        return self
+
+    def get(self, solver):
+        if self.kind == 'temperature':
+            return solver.temperature
+        if self.kind == 'start_concentration':
+            return solver.system.species[self.index].start_concentration
+        return solver.system.reactions[self.index].arrhenius_A
+
+    def set(self, solver, value):
+        if self.kind == 'temperature':
+            solver.temperature = value
+        elif self.kind == 'start_concentration':
+            solver.system.species[self.index].start_concentration = value
+        else:
+            solver.system.reactions[self.index].arrhenius_A = value
+        solver.reset_rate_constants()
+
+    def derivative(self, solver, concentrations, Q, L):
+        """Analytische Ableitung des erweiterten Residuums G nach dem Parameter."""
+        n_laws = L.shape[0]
+        if self.kind == 'start_concentration':
+            return np.concatenate([np.zeros(Q.shape[0]), -L[:, self.index]])
+
+        drdp = np.zeros(len(solver.system.reactions))
+        T = solver.temperature
+        for r_idx, reaction in enumerate(solver.system.reactions):
+            if self.kind == 'arrhenius_A' and r_idx != self.index:
+                continue
+            product = 1.0
+            for reactant_idx, _ in reaction.reactants:
+                conc = concentrations[reactant_idx] if concentrations[reactant_idx] > 0 else 0
+                product *= conc ** reaction.reaction_order.get(reactant_idx, 1.0)
+            if self.kind == 'arrhenius_A':
+                drdp[r_idx] = T ** reaction.temp_exponent_n * np.exp(-reaction.activation_energy_Ea / (R * T)) * product
+            else:
+                dlnk_dT = reaction.temp_exponent_n / T + reaction.activation_energy_Ea / (R * T ** 2)
+                drdp[r_idx] = reaction.calculate_k(T) * dlnk_dT * product
+        return np.concatenate([Q @ (solver.stoichiometry @ drdp), np.zeros(n_laws)])
+
+class ContinuationPoint:
+    def __init__(self, parameter, y, eigenvalues, tangent_p):
+        self.parameter, self.y, self.eigenvalues, self.tangent_p = parameter, y, eigenvalues, tangent_p
+
+    @property
+    def max_real_eigenvalue(self):
+        return float(np.max(self.eigenvalues.real)) if self.eigenvalues.size else -np.inf
+
+    @property
+    def is_stable(self):
+        return self.max_real_eigenvalue < 0
+
+    @property
+    def unstable_count(self):
+        return int(np.sum(self.eigenvalues.real > 0))
+
+    def to_dict(self):
+        leading = self.eigenvalues[np.argsort(-self.eigenvalues.real)[:2]]
+        return {
+            'parameter': float(self.parameter),
+            'concentrations': self.y.tolist(),
+            'stable': self.is_stable,
+            'leading_eigenvalues': [[float(ev.real), float(ev.imag)] for ev in leading]
+        }
+
+class ContinuationEngine:
+    """
+    Pseudo-Bogenlängen-Fortsetzung stationärer Zustände eines ReactionSystem.
+
+    Jeder Punkt wird aus dem vorherigen über die Tangente vorhergesagt und
+    mit Newton (analytische Jacobi-Matrix, Erhaltungsgrößen als
+    Nebenbedingungen) korrigiert. Folds werden am Vorzeichenwechsel der
+    Parameterkomponente der Tangente erkannt, Hopf-Punkte an einem komplexen
+    Eigenwertpaar, das die imaginäre Achse kreuzt.
+    """
+    def __init__(self, system: ReactionSystem, parameter, temperature=298.15):
+        self.system = system
+        self.solver = ODESolver(system, temperature=temperature)
+        self.parameter = parameter.bind(system)
+        self.L = system.get_conservation_laws()
+        self.Q = null_space(self.L).T if self.L.shape[0] else np.eye(len(system.species))
+
+    def _residual(self, y):
+        c0 = self.system.get_initial_concentrations()
+        f = self.solver.model_standard(0.0, y)
+        return np.concatenate([self.Q @ f, self.L @ (y - c0)])
+
+    def _jacobian_y(self, y):
+        return np.vstack([self.Q @ self.solver.jacobian(y), self.L])
+
+    def _eigenvalues(self, y):
+        """Eigenwerte der auf den stöchiometrischen Unterraum reduzierten Jacobi-Matrix."""
+        return np.linalg.eigvals(self.Q @ self.solver.jacobian(y) @ self.Q.T)
+
+    def _tangent(self, y, p_scale, previous):
+        J = np.hstack([self._jacobian_y(y), p_scale * self.parameter.derivative(self.solver, y, self.Q, self.L)[:, None]])
+        A = np.vstack([J, previous])
+        rhs = np.zeros(A.shape[0]); rhs[-1] = 1.0
+        tangent = np.linalg.solve(A, rhs)
+        return tangent / np.linalg.norm(tangent)
+
+    def _correct(self, z_pred, tangent, p_scale, max_iter, tol):
+        z = z_pred.copy()
+        for iteration in range(1, max_iter + 1):
+            y, p = z[:-1], z[-1] * p_scale
+            self.parameter.set(self.solver, p)
+            G = np.append(self._residual(y), tangent @ (z - z_pred))
+            J = np.vstack([
+                np.hstack([self._jacobian_y(y), p_scale * self.parameter.derivative(self.solver, y, self.Q, self.L)[:, None]]),
+                tangent
+            ])
+            try:
+                dz = np.linalg.solve(J, -G)
+            except np.linalg.LinAlgError:
+                return None, iteration
+            if not np.all(np.isfinite(dz)):
+                return None, iteration
+            z = z + dz
+            if np.linalg.norm(dz) <= tol * (1.0 + np.linalg.norm(z)):
+                return z, iteration
+        return None, max_iter
+
+    def _correct_at(self, y, p, max_iter, tol):
+        """Newton bei festem Parameter p; None, wenn es nicht konvergiert."""
+        self.parameter.set(self.solver, p)
+        for _ in range(max_iter):
+            try:
+                dy = np.linalg.solve(self._jacobian_y(y), -self._residual(y))
+            except np.linalg.LinAlgError:
+                return None
+            if not np.all(np.isfinite(dy)):
+                return None
+            y = y + dy
+            if np.linalg.norm(dy) <= tol * (1.0 + np.linalg.norm(y)):
+                return y
+        return None
+
+    def run(self, p_start, p_end, ds=0.01, ds_min=1e-6, ds_max=0.1, max_steps=1000, max_iter=10, tol=1e-10):
+        """
+        Verfolgt den Ast stationärer Zustände von p_start bis p_end.
+        Schrittweiten beziehen sich auf den mit |p_end - p_start| skalierten Parameter.
+        """
+        original_value = self.parameter.get(self.solver)
+        p_scale = abs(p_end - p_start) or 1.0
+        direction = 1.0 if p_end >= p_start else -1.0
+        try:
+            self.parameter.set(self.solver, p_start)
+            start = self.solver.solve_steady_state()
+            if not start.converged:
+                raise RuntimeError("Kein stationärer Startzustand gefunden.")
+
+            z = np.append(start.y, p_start / p_scale)
+            seed = np.zeros_like(z); seed[-1] = direction
+            try:
+                tangent = self._tangent(start.y, p_scale, seed)
+            except np.linalg.LinAlgError:
+                raise RuntimeError("Tangente im Startzustand nicht bestimmbar (singuläres System).") from None
+            points = [ContinuationPoint(p_start, start.y, self._eigenvalues(start.y), tangent[-1])]
+            bifurcations = []
+
+            for _ in range(max_steps):
+                z_new, iterations = self._correct(z + ds * tangent, tangent, p_scale, max_iter, tol)
+                tangent_new = None
+                if z_new is not None:
+                    self.parameter.set(self.solver, z_new[-1] * p_scale)
+                    try:
+                        tangent_new = self._tangent(z_new[:-1], p_scale, tangent)
+                    except np.linalg.LinAlgError:
+                        pass
+                if tangent_new is None:
+                    # Korrektor ohne Konvergenz oder singuläres erweitertes System: kleinerer Schritt
+                    ds *= 0.5
+                    if ds < ds_min:
+                        break
+                    continue
+
+                y_new, p_new = z_new[:-1], z_new[-1] * p_scale
+                if (p_new - p_end) * direction > 0:
+                    # Letzten Schritt auf p_end verkürzen; gelingt das nicht, endet der Ast beim vorigen Punkt.
+                    p_old = z[-1] * p_scale
+                    y_new = self._correct_at(z[:-1] + (p_end - p_old) / (p_new - p_old) * (y_new - z[:-1]), p_end, max_iter, tol)
+                    if y_new is None:
+                        break
+                    p_new, z_new = p_end, np.append(y_new, p_end / p_scale)
+                    self.parameter.set(self.solver, p_new)
+                    try:
+                        tangent_new = self._tangent(y_new, p_scale, tangent)
+                    except np.linalg.LinAlgError:
+                        break
+                point = ContinuationPoint(p_new, y_new, self._eigenvalues(y_new), tangent_new[-1])
+                bifurcations.extend(self._detect_bifurcations(points[-1], point, len(points)))
+                points.append(point)
+                z, tangent = z_new, tangent_new
+
+                if iterations <= 3:
+                    ds = min(ds * 1.5, ds_max)
+                if (p_new - p_end) * direction >= 0 or (p_new - p_start) * direction < 0:
+                    break
+            return {'points': [p.to_dict() for p in points], 'bifurcations': bifurcations}
+        finally:
+            self.parameter.set(self.solver, original_value)
+
+    @staticmethod
+    def _detect_bifurcations(previous, current, index):
+        found = []
+        if previous.tangent_p * current.tangent_p < 0:
+            w = previous.tangent_p / (previous.tangent_p - current.tangent_p)
+            found.append({'type': 'fold', 'index': index,
+                          'parameter': float(previous.parameter + w * (current.parameter - previous.parameter))})
+        if previous.unstable_count != current.unstable_count:
+            # Das Eigenwertpaar, das der imaginären Achse am nächsten liegt, entscheidet den Typ.
+            closest = current.eigenvalues[np.argmin(np.abs(current.eigenvalues.real))]
+            if abs(closest.imag) > 1e-8 * max(1.0, abs(closest.real)):
+                a, b = previous.max_real_eigenvalue, current.max_real_eigenvalue
+                w = a / (a - b) if a != b else 0.5
+                found.append({'type': 'hopf', 'index': index,
+                              'parameter': float(previous.parameter + w * (current.parameter - previous.parameter)),
+                              'frequency': float(abs(closest.imag))})
+        return found
@@ -2,6 +2,13 @@ import numpy as np
 
 R = 8.31446261815324  # Universal gas constant in J/(mol·K)
 
+def _to_float(value, default):
+    """Converts a (possibly empty) property value to float, falling back to default."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
 class Species:
     """Represents a single chemical species with its properties."""
     def __init__(self, name, **kwargs):
@@ -22,6 +29,9 @@ class Reaction:
         self.arrhenius_A = float(params.get('arrhenius_A', 1.0))
         self.activation_energy_Ea = float(params.get('activation_energy_Ea', 0.0))
         self.temp_exponent_n = float(params.get('temperature_exponent_n', 0.0))
+        # Validity range of the Arrhenius parameters; unbounded if not given.
+        self.temperature_min = _to_float(params.get('temperature_min'), 0.0)
+        self.temperature_max = _to_float(params.get('temperature_max'), np.inf)
         
         self.reaction_order = {}
         try:
@@ -46,16 +56,166 @@ class Reaction:
         k = self.arrhenius_A * (T ** self.temp_exponent_n) * np.exp(-Ea_J_mol / (R * T))
         return k
 
+class RateConstantTable:
+    """
+    Precomputed k(T) table for all reactions of a system.
+
+    ln k is stored on a uniform grid in 1/T, where it is (nearly) linear, so a
+    lookup is one linear interpolation and one vectorized exp for all reactions
+    instead of one Arrhenius evaluation per reaction. The table holds the
+    true Arrhenius k, the same as calculate_k in isothermal runs; leaving a
+    reaction's validity range is only reported (see out_of_range()), not
+    clamped. Temperatures outside [T_min, T_max] are not clipped to the
+    table edge; k is computed directly there (see covers()).
+    """
+    def __init__(self, reactions, T_min, T_max, num_points=512):
+        self.reactions = list(reactions)
+        self.T_min, self.T_max = float(T_min), float(T_max)
+        self.inv_T = np.linspace(1.0 / self.T_max, 1.0 / self.T_min, num_points)
+        self._step = self.inv_T[1] - self.inv_T[0]
+        self._t_lo = np.array([r.temperature_min for r in reactions])
+        self._t_hi = np.array([r.temperature_max for r in reactions])
+        self.labels = [r.rate_label for r in reactions]
+
+        T_grid = 1.0 / self.inv_T
+        self._ln_k = np.zeros((num_points, len(reactions)))
+        self._scale = np.zeros(len(reactions))
+        for j, reaction in enumerate(reactions):
+            if reaction.arrhenius_A > 0:
+                # ln k directly, so that k underflowing to 0 at low T does not drop the reaction
+                self._ln_k[:, j] = (np.log(reaction.arrhenius_A) + reaction.temp_exponent_n * np.log(T_grid)
+                                    - reaction.activation_energy_Ea / (R * T_grid))
+                self._scale[j] = 1.0
+
+    def covers(self, T):
+        """True if temperature T lies inside the tabulated range."""
+        return self.T_min <= T <= self.T_max
+
+    def _direct(self, T):
+        """Rate constants at T computed without the table."""
+        return np.array([r.calculate_k(T) for r in self.reactions], dtype=float)
+
+    def __call__(self, T):
+        """Returns the vector of rate constants at temperature T."""
+        if not self.covers(T):
+            return self._direct(T)
+        x = (1.0 / T - self.inv_T[0]) / self._step
+        x = min(max(x, 0.0), len(self.inv_T) - 1.0)
+        i = min(int(x), len(self.inv_T) - 2)
+        w = x - i
+        return np.exp((1.0 - w) * self._ln_k[i] + w * self._ln_k[i + 1]) * self._scale
+
+    def evaluate(self, temperatures):
+        """Vectorized lookup for an array of temperatures; returns (reactions x temperatures)."""
+        temperatures = np.asarray(temperatures, dtype=float)
+        x = (1.0 / temperatures - self.inv_T[0]) / self._step
+        x = np.clip(x, 0.0, len(self.inv_T) - 1.0)
+        i = np.minimum(x.astype(int), len(self.inv_T) - 2)
+        w = (x - i)[:, None]
+        k = (np.exp((1.0 - w) * self._ln_k[i] + w * self._ln_k[i + 1]) * self._scale).T
+        for column in np.flatnonzero((temperatures < self.T_min) | (temperatures > self.T_max)):
+            k[:, column] = self._direct(temperatures[column])
+        return k
+
+    def out_of_range(self, temperatures):
+        """Returns the rate labels of all reactions whose validity range is left by the given temperatures."""
+        T = np.asarray(temperatures, dtype=float)
+        if T.size == 0: return []
+        violated = (T.min() < self._t_lo) | (T.max() > self._t_hi)
+        return [label for label, v in zip(self.labels, violated) if v]
+
 class ReactionSystem:
     """Manages the entire system of species and reactions."""
-    def __init__(self, species_list, reaction_list):
+    def __init__(self, species_list, reaction_list, solver_settings=None):
         self.species = species_list
         self.reactions = reaction_list
+        # Calibrated integrator tolerances stored in the .kin file ({"rtol", "atol", "calibration"}), see tolerances.py
+        self.solver_settings = solver_settings
         self.species_map = {s.name: i for i, s in enumerate(species_list)}
 
     def get_initial_concentrations(self):
         return np.array([s.start_concentration for s in self.species])
 
+    def get_stoichiometry_matrix(self):
+        """Net stoichiometric matrix N (species x reactions), positive for products."""
+        N = np.zeros((len(self.species), len(self.reactions)))
+        for j, reaction in enumerate(self.reactions):
+            for reactant_idx, stoich in reaction.reactants:
+                N[reactant_idx, j] -= stoich
+            for product_idx, stoich in reaction.products:
+                N[product_idx, j] += stoich
+        return N
+
+    def get_reactant_order_matrix(self):
+        """Partial reaction orders (reactions x species) as used in the rate laws."""
+        orders = np.zeros((len(self.reactions), len(self.species)))
+        for j, reaction in enumerate(self.reactions):
+            for reactant_idx, _ in reaction.reactants:
+                orders[j, reactant_idx] = reaction.reaction_order.get(reactant_idx, 1.0)
+        return orders
+
+    def get_conservation_laws(self, tol=1e-10):
+        """
+        Basis of the left null space of N: the rows of L satisfy L @ N = 0, so
+        L @ c is conserved by every reaction (element balances, catalyst totals).
+        """
+        N = self.get_stoichiometry_matrix()
+        if N.shape[1] == 0:
+            return np.eye(len(self.species))
+        U, sv, _ = np.linalg.svd(N)
+        rank = int(np.sum(sv > tol * max(sv.max(), 1.0)))
+        return U[:, rank:].T
+
+    def get_species_blocks(self):
+        """
+        Strongly connected components of the species influence graph (i -> j
+        if a reaction whose rate depends on i changes j), in topological
+        order: each block depends only on itself and on earlier blocks.
+        Iterative Tarjan search; returns sorted lists of species indices.
+        """
+        N = self.get_stoichiometry_matrix()
+        successors = [set() for _ in self.species]
+        for j, reaction in enumerate(self.reactions):
+            changed = np.flatnonzero(N[:, j])
+            for reactant_idx, _ in reaction.reactants:
+                if reaction.reaction_order.get(reactant_idx, 1.0) != 0:
+                    successors[reactant_idx].update(int(i) for i in changed if i != reactant_idx)
+
+        index, lowlink, stack, on_stack, components = {}, {}, [], set(), []
+        def visit(node):
+            index[node] = lowlink[node] = len(index)
+            stack.append(node); on_stack.add(node)
+            return node, iter(sorted(successors[node]))
+        for root in range(len(self.species)):
+            if root in index:
+                continue
+            work = [visit(root)]
+            while work:
+                node, neighbours = work[-1]
+                for successor in neighbours:
+                    if successor not in index:
+                        work.append(visit(successor))
+                        break
+                    if successor in on_stack:
+                        lowlink[node] = min(lowlink[node], index[successor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while not component or component[-1] != node:
+                            component.append(stack.pop())
+                            on_stack.discard(component[-1])
+                        components.append(sorted(component))
+        return components[::-1]  # Tarjan emits sink components first
+
+    def get_reaction_enthalpies(self):
+        """Reaction enthalpies ΔH_r in J/mol, computed from the species' delta_hf (kJ/mol)."""
+        delta_hf = np.array([_to_float(getattr(s, 'delta_hf', 0.0), 0.0) for s in self.species])
+        return self.get_stoichiometry_matrix().T @ delta_hf * 1000.0
+
     def get_rate_law_equations(self):
         """Creates a correct textual representation of the differential rate law."""
         equations = []
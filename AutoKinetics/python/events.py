@@ -0,0 +1,79 @@
+# python/events.py
+import numpy as np
+from abc import ABC, abstractmethod
+
+class StopCondition(ABC):
+    """
+    Deklarative Abbruchbedingung für ODESolver.solve.
+
+    make_event liefert eine Ereignisfunktion g(t, y) für solve_ivp; die
+    Integration endet am ersten Nulldurchgang in Richtung `direction`.
+    """
+    direction = 0.0
+
+    def make_event(self, solver):
+        def event(t, y):
+            return self.value(solver, solver.full_concentrations(t, y), solver.state_temperature(t, y))
+        event.terminal = True
+        event.direction = self.direction
+        return event
+
+    @abstractmethod
+    def value(self, solver, concentrations, T):
+        """Ereignisfunktion; ihr Nulldurchgang beendet die Integration."""
+
+    @staticmethod
+    def _species_index(solver, species):
+        if species not in solver.system.species_map:
+            raise ValueError(f"Unbekannte Spezies in der Abbruchbedingung: {species}")
+        return solver.system.species_map[species]
+
+class SpeciesThreshold(StopCondition):
+    """Stoppt, sobald [species] den Schwellwert unter- (`below=True`) bzw. überschreitet."""
+    def __init__(self, species, threshold, below=True):
+        self.species, self.threshold, self.below = species, float(threshold), below
+        self.direction = -1.0 if below else 1.0
+        self.label = f"[{species}] {'<=' if below else '>='} {self.threshold:g}"
+
+    def make_event(self, solver):
+        self.index = self._species_index(solver, self.species)
+        return super().make_event(solver)
+
+    def value(self, solver, concentrations, T):
+        return concentrations[self.index] - self.threshold
+
+class TargetConversion(StopCondition):
+    """Stoppt bei Umsatz X = 1 - [A]/[A]0 >= conversion."""
+    direction = 1.0
+
+    def __init__(self, species, conversion):
+        self.species, self.conversion = species, float(conversion)
+        self.label = f"conversion({species}) >= {self.conversion:g}"
+
+    def make_event(self, solver):
+        self.index = self._species_index(solver, self.species)
+        return super().make_event(solver)
+
+    def value(self, solver, concentrations, T):
+        c0 = solver.system.species[self.index].start_concentration
+        if c0 <= 0:
+            return -1.0
+        return (1.0 - concentrations[self.index] / c0) - self.conversion
+
+class RateNormThreshold(StopCondition):
+    """Stoppt, wenn max|dc/dt| unter rel_tol * max|dc/dt(t0)| fällt (praktisch stationär)."""
+    direction = -1.0
+
+    def __init__(self, rel_tol):
+        self.rel_tol = float(rel_tol)
+        self.label = f"rate_norm <= {self.rel_tol:g} * initial"
+        self._reference = None
+
+    def make_event(self, solver):
+        c0 = solver.system.get_initial_concentrations()
+        self._reference = np.max(np.abs(solver.concentration_rates(c0, solver.state_temperature(0.0, None))), initial=0.0)
+        return super().make_event(solver)
+
+    def value(self, solver, concentrations, T):
+        rate_norm = np.max(np.abs(solver.concentration_rates(concentrations, T)), initial=0.0)
+        return rate_norm - self.rel_tol * self._reference
@@ -0,0 +1,147 @@
+# python/fluxes.py
+import heapq
+import numpy as np
+from simulator import ODESolver
+from trajectory_store import open_trajectory
+
+def trajectory_arrays(sim_results):
+    """
+    Zeitpunkte, Konzentrationen (Spezies x Zeitpunkte) und Temperaturen auf
+    einem gemeinsamen Zeitgitter. Bei einer Trajektoriendatei mit
+    unterschiedlichen Schrittweiten ist das das Gitter der gröbsten Spezies;
+    feiner gespeicherte Spezies werden darauf interpoliert.
+    """
+    if not sim_results.get("trajectory_file"):
+        temperature = sim_results.get("temperature_profile")
+        return (np.asarray(sim_results['time_points'], dtype=float), np.asarray(sim_results['concentrations'], dtype=float),
+                None if temperature is None else np.asarray(temperature, dtype=float))
+    trajectory = open_trajectory(sim_results["trajectory_file"])
+    stride = max(trajectory.meta["strides"], default=1)
+    t = np.asarray(trajectory.time_points[::stride])
+    concentrations = np.empty((len(trajectory.species_names), len(t)))
+    for i in range(len(trajectory.species_names)):
+        t_i, c_i = trajectory.species(i)
+        concentrations[i] = c_i if len(t_i) == len(t) else np.interp(t, t_i, c_i)
+    temperature = trajectory.temperature
+    return t, concentrations, None if temperature is None else np.asarray(temperature[::stride])
+
+def rate_of_production(stoichiometry, rates):
+    """Beiträge jeder Reaktion zu jeder Spezies: (Spezies x Reaktionen x Zeitpunkte) = N_ij * r_j(t)."""
+    return stoichiometry[:, :, None] * rates[None, :, :]
+
+def integrated_fluxes(solver, time, concentrations, temperatures=None, block_size=65536):
+    """
+    Integriert alle Reaktionsgeschwindigkeiten über die Trajektorie
+    (Trapezregel) und bestimmt ihre Maxima. Die Raten werden blockweise
+    mit ODESolver.reaction_rates ausgewertet, sodass auch sehr lange
+    Trajektorien nur O(block_size * Reaktionen) Speicher brauchen.
+    Rückgabe: (Integral, Maximum, Zeitpunkt des Maximums) je Reaktion.
+    """
+    n_reactions, n_points = len(solver.system.reactions), len(time)
+    total, peak, t_peak = np.zeros(n_reactions), np.full(n_reactions, -np.inf), np.zeros(n_reactions)
+    for start in range(0, max(n_points - 1, 1), block_size):
+        stop = min(start + block_size + 1, n_points)  # ein Punkt Überlappung für die Trapezregel
+        t = time[start:stop]
+        rates = solver.reaction_rates(concentrations[:, start:stop], None if temperatures is None else temperatures[start:stop])
+        if len(t) > 1:
+            total += np.sum(0.5 * (rates[:, 1:] + rates[:, :-1]) * np.diff(t), axis=1)
+        idx = np.argmax(rates, axis=1)
+        better = rates[np.arange(n_reactions), idx] > peak
+        peak[better], t_peak[better] = rates[better, idx[better]], t[idx[better]]
+    return total, np.maximum(peak, 0.0), t_peak
+
+def _widest_path(source, sink, graph):
+    """Pfad mit dem größten minimalen Kantenfluss (Engpass) von source nach sink; (Engpass, Kanten) oder None."""
+    best = {source: np.inf}
+    previous = {}
+    heap = [(-np.inf, source)]
+    while heap:
+        width, node = heapq.heappop(heap)
+        width = -width
+        if node == sink:
+            edges = []
+            while node != source:
+                node, edge = previous[node]
+                edges.append(edge)
+            return width, edges[::-1]
+        if width < best.get(node, 0.0):
+            continue
+        for target, flux, edge in graph.get(node, ()):
+            w = min(width, flux)
+            if w > best.get(target, 0.0):
+                best[target] = w
+                previous[target] = (node, edge)
+                heapq.heappush(heap, (-w, target))
+    return None
+
+def analyze_fluxes(sim_results, reaction_system, temperature_program=None, energy_balance=None, top=5, n_pathways=5):
+    """
+    Flussanalyse einer Simulation:
+
+      reactions  integrierter Fluss, Anteil am Gesamtfluss und Maximum je Reaktion
+      species    je Spezies die wichtigsten bildenden und verbrauchenden
+                 Reaktionen (Anteile an der integrierten Bildung/dem Verbrauch)
+      edges      Kanten Edukt -> Produkt je Reaktion mit integriertem Fluss und
+                 relativer Stärke (0..1), z. B. als Überlagerung der Zeichenfläche
+      pathways   stärkste Wege von verbrauchten zu gebildeten Spezies
+                 (Engpass-Fluss entlang der Kanten), absteigend sortiert
+
+    Die Raten kommen aus derselben Auswertung wie im Solver
+    (ODESolver.reaction_rates), inklusive Temperaturverlauf.
+    """
+    names = [s.name for s in reaction_system.species]
+    labels = [r.rate_label for r in reaction_system.reactions]
+    if not labels:
+        return {"reactions": [], "species": {}, "edges": [], "pathways": []}
+    temperature_K = sim_results["simulation_parameters"]["temperature_K"]
+    solver = ODESolver(reaction_system, temperature_K, temperature_program, energy_balance, codegen=None)
+    time, concentrations, temperatures = trajectory_arrays(sim_results)
+    total, peak, t_peak = integrated_fluxes(solver, time, concentrations, temperatures)
+
+    N = solver.stoichiometry
+    rop = N * total[None, :]  # integrierte Beiträge (Spezies x Reaktionen)
+    flux_sum = total.sum()
+    reactions = [{"reaction": label, "integrated_flux": float(f), "share": float(f / flux_sum) if flux_sum > 0 else 0.0,
+                  "peak_rate": float(p), "t_peak": float(tp)} for label, f, p, tp in zip(labels, total, peak, t_peak)]
+    reactions.sort(key=lambda r: r["integrated_flux"], reverse=True)
+
+    species = {}
+    for i, name in enumerate(names):
+        production, consumption = np.clip(rop[i], 0.0, None), np.clip(-rop[i], 0.0, None)
+        def ranked(values):
+            order = np.argsort(values)[::-1][:top]
+            return [{"reaction": labels[j], "amount": float(values[j]), "share": float(values[j] / values.sum())}
+                    for j in order if values[j] > 0]
+        species[name] = {"produced": float(production.sum()), "consumed": float(consumption.sum()),
+                         "production": ranked(production), "consumption": ranked(consumption)}
+
+    edges, graph = [], {}
+    max_flux = total.max()
+    for j, reaction in enumerate(reaction_system.reactions):
+        for reactant_idx, _ in reaction.reactants:
+            for product_idx, _ in reaction.products:
+                if reactant_idx == product_idx:
+                    continue
+                edge = {"source": names[reactant_idx], "target": names[product_idx], "reaction": labels[j],
+                        "flux": float(total[j]), "relative": float(total[j] / max_flux) if max_flux > 0 else 0.0}
+                edges.append(edge)
+                if total[j] > 0:
+                    graph.setdefault(reactant_idx, []).append((product_idx, total[j], len(edges) - 1))
+
+    # Quellen und Senken aus der Konzentrationsänderung: die Trapezsummen lassen bei vollständig
+    # abgebauten Zwischenprodukten einen Rest, der sie sonst als Senke erscheinen ließe.
+    net = concentrations[:, -1] - concentrations[:, 0] if len(time) else np.zeros(len(names))
+    scale = np.abs(net).max() if net.size else 0.0
+    sources = [i for i in range(len(names)) if net[i] < -1e-12 * scale]
+    sinks = [i for i in range(len(names)) if net[i] > 1e-12 * scale]
+    pathways = []
+    for source in sources:
+        for sink in sinks:
+            found = _widest_path(source, sink, graph)
+            if found is not None:
+                width, path = found
+                pathways.append({"species": [names[source]] + [edges[e]["target"] for e in path],
+                                 "reactions": [edges[e]["reaction"] for e in path], "flux": float(width)})
+    pathways.sort(key=lambda p: p["flux"], reverse=True)
+
+    return {"reactions": reactions, "species": species, "edges": edges, "pathways": pathways[:n_pathways]}
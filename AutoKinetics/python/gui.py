@@ -2,58 +2,360 @@ import sys
 import json
 import subprocess
 import tempfile
+import itertools
+import numpy as np
 from pathlib import Path
 from PyQt6 import sip 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QGraphicsView, QGraphicsScene, QGraphicsTextItem,
     QGraphicsPathItem, QToolBar, QDockWidget, QWidget, QVBoxLayout, QLabel,
     QLineEdit, QFormLayout, QGraphicsItem, QComboBox, QCheckBox, QFileDialog,
-    QInputDialog, QMessageBox, QDialog, QTextEdit, QTabWidget
+    QInputDialog, QMessageBox, QDialog, QTextEdit, QTabWidget, QProgressBar, QPushButton,
+    QHBoxLayout, QListWidget, QListWidgetItem
 )
 from PyQt6.QtGui import (
     QAction, QIcon, QPen, QBrush, QColor, QPainterPath, QFont, QPainter,
     QKeyEvent, QUndoStack, QUndoCommand, QKeySequence, QActionGroup, QTransform,
-    QImage, QPixmap
+    QImage, QPixmap, QDesktopServices
 )
-from PyQt6.QtCore import Qt, QPointF, QRectF, QLineF, pyqtSignal, QThread, QTimer
+from PyQt6.QtCore import Qt, QPointF, QRectF, QLineF, pyqtSignal, QThread, QTimer, QUrl
+from plotter import decimate_minmax, uncertainty_bands
+from model_sync import ModelTracker
+from layout import force_directed_layout
+
+# Detailstufen (Skalierung der Ansicht), unterhalb derer Text nicht mehr gezeichnet wird.
+LOD_TEXT = 0.4
+LOD_LABELS = 0.6
 
 # =============================================================================
 # 1. HINTERGRUND-THREADS UND DIALOGE
 # =============================================================================
 
+class BackendWorker:
+    """
+    Langlebiger Backend-Prozess (backend_main.py --worker). Er behält das
+    übersetzte Modell zwischen den Läufen, sodass die GUI pro Start nur die
+    Änderungen seit dem letzten Lauf schicken muss.
+    """
+    def __init__(self):
+        self.process = None
+        self.stderr_file = None
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def ensure_running(self):
+        """Startet den Prozess bei Bedarf; True, wenn er neu gestartet wurde (Modell leer)."""
+        if self.is_alive():
+            return False
+        backend_script_path = Path(__file__).resolve().parent / "backend_main.py"
+        self.stderr_file = tempfile.TemporaryFile(mode='w+', encoding='utf-8')
+        self.process = subprocess.Popen([sys.executable, str(backend_script_path), "--worker"], stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, stderr=self.stderr_file, text=True, encoding='utf-8')
+        return True
+
+    def send(self, message):
+        self.process.stdin.write(json.dumps(message) + "\n"); self.process.stdin.flush()
+
+    def read_message(self):
+        """Nächste JSON-Nachricht; None, wenn der Prozess beendet ist."""
+        for line in self.process.stdout:
+            try:
+                return json.loads(line)
+            except json.JSONDecodeError:
+                continue  # z. B. Warnungen von Bibliotheken auf stdout
+        return None
+
+    def interrupt(self):
+        if self.is_alive():
+            self.process.terminate()  # POSIX: SIGTERM bricht nur den laufenden Auftrag ab
+
+    def error_output(self):
+        if self.stderr_file is None:
+            return ""
+        self.stderr_file.seek(0)
+        return self.stderr_file.read()
+
+    def stop(self):
+        if self.is_alive():
+            self.process.stdin.close()
+            try:
+                self.process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
 class SimulationThread(QThread):
+    """
+    Schickt einen Auftrag an den BackendWorker und liest dessen
+    Streaming-Nachrichten: Fortschritt und Teiltrajektorien werden sofort
+    weitergereicht, cancel() bricht den laufenden Auftrag ab.
+    """
     finished = pyqtSignal(dict)
     error = pyqtSignal(str)
+    started_stream = pyqtSignal(dict)
+    progress = pyqtSignal(str, float, float)
+    chunk = pyqtSignal(dict)
+    cancelled = pyqtSignal()
 
-    def __init__(self, kin_file_path, sim_time, temp_k, plot_dir):
+    def __init__(self, worker, request):
         super().__init__()
-        self.kin_file = str(kin_file_path)
-        self.sim_time = sim_time
-        self.temp_k = temp_k
-        self.plot_dir = plot_dir
-        self.python_executable = sys.executable
+        self.worker = worker
+        self.request = request
+        self._cancel_requested = False
+
+    def cancel(self):
+        self._cancel_requested = True
+        self.worker.interrupt()
 
     def run(self):
         try:
-            backend_script_path = Path(__file__).resolve().parent / "backend_main.py"
-            command = [
-                self.python_executable, str(backend_script_path), self.kin_file,
-                "-t", str(self.sim_time), "-T", str(self.temp_k),
-                "--plot_dir", self.plot_dir,
-            ]
-            result = subprocess.run(command, capture_output=True, text=True, check=True, encoding='utf-8')
-            output_data = json.loads(result.stdout)
-            if "error" in output_data:
-                self.error.emit(output_data["error"])
-            else:
-                self.finished.emit(output_data)
-        except subprocess.CalledProcessError as e:
-            self.error.emit(f"Backend-Fehler:\n{e.stderr}")
-        except json.JSONDecodeError:
-            self.error.emit(f"Fehler beim Parsen der Backend-Ausgabe:\n{result.stdout}")
+            self.worker.send(self.request)
+            while True:
+                message = self.worker.read_message()
+                if message is None:
+                    if self._cancel_requested:
+                        self.cancelled.emit()
+                    else:
+                        self.error.emit(f"Backend-Fehler:\n{self.worker.error_output()}")
+                    return
+                kind = message.get("type")
+                if kind == "start":
+                    self.started_stream.emit(message)
+                elif kind == "progress":
+                    self.progress.emit(message["phase"], message["t"], message["t_end"])
+                elif kind == "chunk":
+                    self.chunk.emit(message)
+                elif kind == "cancelled":
+                    self.cancelled.emit(); return
+                elif kind == "error":
+                    self.error.emit(message["error"]); return
+                elif kind == "result":
+                    message.pop("type")
+                    self.finished.emit(message); return
         except Exception as e:
             self.error.emit(f"Ein unerwarteter Fehler ist aufgetreten: {e}")
 
+class LayoutThread(QThread):
+    """Berechnet das automatische Layout (layout.force_directed_layout) außerhalb des UI-Threads."""
+    finished = pyqtSignal(object)
+    progress = pyqtSignal(int)
+
+    def __init__(self, n_nodes, edges, positions, iterations=300):
+        super().__init__()
+        self.n_nodes, self.edges, self.positions, self.iterations = n_nodes, edges, positions, iterations
+        self._cancel_requested = False
+
+    def cancel(self): self._cancel_requested = True
+
+    def run(self):
+        def report(iteration):
+            if iteration % 10 == 0: self.progress.emit(int(100 * iteration / self.iterations))
+            return not self._cancel_requested
+        positions = force_directed_layout(self.n_nodes, self.edges, self.positions, iterations=self.iterations, progress_callback=report)
+        if not self._cancel_requested: self.finished.emit(positions)
+
+class LivePlotDialog(QDialog):
+    """Zeigt den Konzentrationsverlauf, während die Simulation noch läuft."""
+    cancel_requested = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+        self.setWindowTitle("Simulation läuft")
+        self.setMinimumSize(700, 500)
+        self.time_points, self.concentrations, self.lines = [], None, []
+
+        layout = QVBoxLayout(self)
+        self.figure = Figure(figsize=(7, 4.5), tight_layout=True)
+        self.axes = self.figure.add_subplot(111)
+        self.axes.set_xlabel("Zeit (s)"); self.axes.set_ylabel("Konzentration (mol/L)"); self.axes.grid(True, alpha=0.3)
+        self.canvas = FigureCanvasQTAgg(self.figure)
+        layout.addWidget(self.canvas)
+        self.status_label = QLabel("Starte Backend...")
+        layout.addWidget(self.status_label)
+        self.progress_bar = QProgressBar(); self.progress_bar.setRange(0, 1000)
+        layout.addWidget(self.progress_bar)
+        self.cancel_button = QPushButton("Abbrechen")
+        self.cancel_button.clicked.connect(self._on_cancel)
+        layout.addWidget(self.cancel_button)
+
+        # Neu zeichnen höchstens alle 200 ms, egal wie schnell Teilergebnisse eintreffen.
+        self._dirty = False
+        self.redraw_timer = QTimer(self); self.redraw_timer.timeout.connect(self._redraw); self.redraw_timer.start(200)
+
+    def start(self, message):
+        self.species_names = message["species_names"]
+        self.t_end = message["t_end"]
+        self.concentrations = [[] for _ in self.species_names]
+        self.lines = [self.axes.plot([], [], label=name)[0] for name in self.species_names]
+        self.axes.set_xlim(0, self.t_end or 1.0)
+        self.axes.legend(loc="upper right")
+
+    def add_chunk(self, message):
+        if self.concentrations is None:
+            return
+        self.time_points.extend(message["time_points"])
+        for series, values in zip(self.concentrations, message["concentrations"]):
+            series.extend(values)
+        self._dirty = True
+
+    def set_progress(self, phase, t, t_end):
+        if phase == "simulation":
+            fraction = min(t / t_end, 1.0) if t_end > 0 else 1.0
+            self.progress_bar.setValue(int(1000 * fraction))
+            self.status_label.setText(f"Integration: t = {t:.4g} s von {t_end:g} s")
+        else:
+            self.progress_bar.setValue(1000)
+            self.status_label.setText({"analysis": "Analyse läuft...", "plotting": "Plots werden erstellt..."}.get(phase, phase))
+        if phase == "uncertainty":
+            self.progress_bar.setValue(int(1000 * t / t_end) if t_end > 0 else 1000)
+            self.status_label.setText(f"Unsicherheitsanalyse: {int(t)} von {int(t_end)} Stichproben")
+
+    def _redraw(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        for line, series in zip(self.lines, self.concentrations):
+            line.set_data(self.time_points, series)
+        self.axes.relim(); self.axes.autoscale_view(scalex=False)
+        self.canvas.draw_idle()
+
+    def _on_cancel(self):
+        self.cancel_button.setEnabled(False)
+        self.status_label.setText("Wird abgebrochen...")
+        self.cancel_requested.emit()
+
+    def finish(self, text):
+        self.redraw_timer.stop()
+        self._dirty = True; self._redraw()
+        self.cancel_button.setEnabled(False)
+        self.status_label.setText(text)
+
+class TrajectoryPlotWidget(QWidget):
+    """
+    Interaktiver Konzentrationsplot direkt aus den Trajektorien. Bei jedem
+    Zoom/Pan wird nur der sichtbare Bereich auf die Pixelbreite dezimiert
+    (Min/Max pro Pixelspalte, plotter.decimate_minmax); Spezies lassen sich
+    einzeln ein- und ausblenden, beide Achsen logarithmisch skalieren.
+    bands = (Zeitpunkte, untere, obere Grenze) zeichnet Konfidenzbänder.
+    """
+    MAX_INITIAL_SPECIES = 20
+
+    def __init__(self, time_points, concentrations, species_names, bands=None, parent=None):
+        super().__init__(parent)
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg, NavigationToolbar2QT
+        self.time = np.asarray(time_points, dtype=float)
+        self.values = np.asarray(concentrations, dtype=float)
+        self.species_names = list(species_names)
+        self.bands = bands
+        self.lines, self.band_patches = {}, {}
+        self._full_view_cache = None
+        self._updating = False
+
+        layout = QHBoxLayout(self)
+        side = QVBoxLayout()
+        self.filter_edit = QLineEdit(); self.filter_edit.setPlaceholderText("Spezies filtern...")
+        self.filter_edit.textChanged.connect(self._apply_filter)
+        side.addWidget(self.filter_edit)
+        self.species_list = QListWidget()
+        for idx, name in enumerate(self.species_names):
+            item = QListWidgetItem(name)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked if idx < self.MAX_INITIAL_SPECIES else Qt.CheckState.Unchecked)
+            self.species_list.addItem(item)
+        self.species_list.itemChanged.connect(lambda item: self.refresh(rescale=True))
+        side.addWidget(self.species_list)
+        self.log_x_check = QCheckBox("Zeitachse logarithmisch"); self.log_x_check.toggled.connect(lambda: self.refresh(rescale=True))
+        self.log_y_check = QCheckBox("Konzentration logarithmisch"); self.log_y_check.toggled.connect(lambda: self.refresh(rescale=True))
+        side.addWidget(self.log_x_check); side.addWidget(self.log_y_check)
+        layout.addLayout(side, 1)
+
+        plot_layout = QVBoxLayout()
+        self.figure = Figure(tight_layout=True)
+        self.axes = self.figure.add_subplot(111)
+        self.canvas = FigureCanvasQTAgg(self.figure)
+        plot_layout.addWidget(NavigationToolbar2QT(self.canvas, self))
+        plot_layout.addWidget(self.canvas)
+        layout.addLayout(plot_layout, 4)
+
+        # Zoom/Pan erzeugt viele xlim-Änderungen; neu dezimiert wird erst, wenn sie abklingen.
+        self.decimate_timer = QTimer(self); self.decimate_timer.setSingleShot(True); self.decimate_timer.setInterval(50)
+        self.decimate_timer.timeout.connect(lambda: self.refresh(rescale=False))
+        self.axes.callbacks.connect('xlim_changed', self._on_xlim_changed)
+        self.canvas.mpl_connect('resize_event', lambda event: self.decimate_timer.start())
+        self.refresh(rescale=True)
+
+    def _apply_filter(self, text):
+        text = text.strip().lower()
+        for row in range(self.species_list.count()):
+            item = self.species_list.item(row)
+            item.setHidden(bool(text) and text not in item.text().lower())
+
+    def visible_species(self):
+        return [row for row in range(self.species_list.count())
+                if self.species_list.item(row).checkState() == Qt.CheckState.Checked]
+
+    def _on_xlim_changed(self, axes):
+        if not self._updating:
+            self.decimate_timer.start()
+
+    def _full_range(self, log_x):
+        positive = self.time[self.time > 0]
+        x_min = positive[0] if log_x and positive.size else self.time[0]
+        return x_min, self.time[-1]
+
+    def refresh(self, rescale=False):
+        if self.time.size == 0:
+            return
+        log_x, log_y = self.log_x_check.isChecked(), self.log_y_check.isChecked()
+        visible = self.visible_species()
+        self._updating = True
+        try:
+            self.axes.set_xscale('log' if log_x else 'linear')
+            self.axes.set_yscale('log' if log_y else 'linear')
+            x_min, x_max = self._full_range(log_x) if rescale else self.axes.get_xlim()
+            n_bins = max(int(self.canvas.width() * self.canvas.devicePixelRatioF()), 100)
+
+            key = (tuple(visible), log_x, n_bins)
+            full_view = rescale or (x_min, x_max) == self._full_range(log_x)
+            if full_view and self._full_view_cache is not None and self._full_view_cache[0] == key:
+                t, y = self._full_view_cache[1]
+            else:
+                t, y = decimate_minmax(self.time, self.values[visible], x_min, x_max, n_bins, log_x)
+                if full_view:
+                    self._full_view_cache = (key, (t, y))
+
+            for idx in list(self.lines):
+                if idx not in visible:
+                    self.lines.pop(idx).remove()
+            for row, idx in enumerate(visible):
+                if idx not in self.lines:
+                    self.lines[idx], = self.axes.plot([], [], label=self.species_names[idx])
+                self.lines[idx].set_data(t, y[row])
+            if self.bands is not None:
+                for idx in list(self.band_patches):
+                    if idx not in visible:
+                        self.band_patches.pop(idx).remove()
+                for idx in visible:
+                    if idx not in self.band_patches:
+                        self.band_patches[idx] = self.axes.fill_between(self.bands[0], self.bands[1][idx], self.bands[2][idx],
+                                                                        color=self.lines[idx].get_color(), alpha=0.2, linewidth=0)
+
+            legend = self.axes.get_legend()
+            if legend is not None:
+                legend.remove()
+            if 0 < len(visible) <= self.MAX_INITIAL_SPECIES:
+                self.axes.legend(loc='best')
+            if rescale:
+                self.axes.set_xlim(x_min, x_max)
+                self.axes.relim(); self.axes.autoscale_view(scalex=False)
+            self.axes.set_xlabel("Zeit (s)"); self.axes.set_ylabel("Konzentration (mol/L)")
+            self.canvas.draw_idle()
+        finally:
+            self._updating = False
+
 class PlotDialog(QDialog):
     def __init__(self, results, parent=None):
         super().__init__(parent)
@@ -65,10 +367,19 @@ class PlotDialog(QDialog):
         self.tabs = QTabWidget()
         main_layout.addWidget(self.tabs)
 
+        self.create_interactive_tab()
         self.create_overview_tab()
         self.create_rate_law_tab() 
         self.create_analysis_tabs_per_reaction()
 
+    def create_interactive_tab(self):
+        simulation = self.results.get("simulation", {})
+        if not simulation.get("time_points"):
+            return
+        widget = TrajectoryPlotWidget(simulation["time_points"], simulation["concentrations"], simulation["species_names"],
+                                      uncertainty_bands(self.results.get("uncertainty")))
+        self.tabs.addTab(widget, "Interaktiv")
+
     def create_overview_tab(self):
         tab = QWidget()
         layout = QVBoxLayout(tab)
@@ -82,12 +393,28 @@ class PlotDialog(QDialog):
         if concentration_plot_path and Path(concentration_plot_path).exists():
             pixmap = QPixmap(concentration_plot_path)
             image_label.setPixmap(pixmap.scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+        elif self.report_url() is not None:
+            image_label.setText("Alle Plots stehen im HTML-Bericht (eine Datei, im Browser gezeichnet).")
         else:
             image_label.setText("Konzentrationsplot konnte nicht geladen werden.")
 
         layout.addWidget(image_label)
+        if self.report_url() is not None:
+            open_button = QPushButton("Bericht im Browser öffnen")
+            open_button.clicked.connect(lambda: QDesktopServices.openUrl(self.report_url()))
+            layout.addWidget(open_button)
         self.tabs.addTab(tab, "Gesamtübersicht")
 
+    def report_url(self, rate_label=None):
+        """URL des HTML-Berichts (optional direkt bei einer Reaktion) oder None."""
+        path = self.results.get("plot_files", {}).get("report")
+        if not path or not Path(path).exists():
+            return None
+        url = QUrl.fromLocalFile(path)
+        if rate_label is not None:
+            url.setFragment(rate_label)
+        return url
+
     def create_rate_law_tab(self):
         rate_laws = self.results.get("simulation", {}).get("rate_law_equations")
         if not rate_laws:
@@ -141,6 +468,10 @@ class PlotDialog(QDialog):
                     image_label.setPixmap(pixmap.scaled(image_label.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
                     img_layout.addWidget(image_label)
                     order_tabs.addTab(img_tab, title)
+            if order_tabs.count() == 0 and self.report_url(rate_label) is not None:
+                link = QLabel(f'<a href="{self.report_url(rate_label).toString()}">Ordnungsplots im HTML-Bericht öffnen</a>')
+                link.setOpenExternalLinks(True)
+                reaction_layout.addWidget(link)
             
             self.tabs.addTab(reaction_tab, f"Analyse: {rate_label}")
 
@@ -174,10 +505,10 @@ class AddCommand(QUndoCommand):
     def __init__(self, item, scene, description):
         super().__init__(description)
         self.item, self.scene = item, scene
-    def redo(self): self.scene.addItem(self.item)
+    def redo(self): self.scene.addItem(self.item); self.scene.mark_model_dirty(self.item)
     def undo(self):
         if isinstance(self.item, (ArrowItem, GroupItem)): self.item.detach()
-        self.scene.removeItem(self.item)
+        self.scene.removeItem(self.item); self.scene.mark_model_dirty(self.item)
 
 class DeleteCommand(QUndoCommand):
     def __init__(self, items, scene, description):
@@ -187,11 +518,23 @@ class DeleteCommand(QUndoCommand):
         for item in self.items:
             if isinstance(item, (ArrowItem, GroupItem)): item.detach()
             self.scene.removeItem(item)
+        self.scene.mark_model_dirty(*self.items)
     def undo(self):
         for item in self.items:
             self.scene.addItem(item)
             if isinstance(item, ArrowItem):
                 item.start_item.add_arrow(item); item.end_item.add_arrow(item)
+        self.scene.mark_model_dirty(*self.items)
+
+class MoveItemsCommand(QUndoCommand):
+    def __init__(self, items, old_positions, new_positions, scene, description):
+        super().__init__(description)
+        self.items, self.old_positions, self.new_positions, self.scene = items, old_positions, new_positions, scene
+    def _apply(self, positions):
+        for item, pos in zip(self.items, positions): item.setPos(pos)
+        for group in self.scene.items_of_type(GroupItem): group.recalculate_bounds()
+    def redo(self): self._apply(self.new_positions)
+    def undo(self): self._apply(self.old_positions)
 
 class SpeciesItem(QGraphicsTextItem):
     def __init__(self, text, position, parent=None):
@@ -202,6 +545,7 @@ class SpeciesItem(QGraphicsTextItem):
         self.setTextInteractionFlags(Qt.TextInteractionFlag.NoTextInteraction)
         self.setDefaultTextColor(QColor("#333")); self.setFont(QFont("Arial", 12, QFont.Weight.Bold))
         self._pen, self._brush, self.arrows = QPen(Qt.PenStyle.NoPen), QBrush(QColor("#ffffff")), []
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
         
         self.formula, self.smiles, self.molar_mass = "unbekannt", "", 0.0
         self.mass, self.moles = 0.0, 0.0
@@ -235,18 +579,24 @@ class SpeciesItem(QGraphicsTextItem):
         self.setTextInteractionFlags(Qt.TextInteractionFlag.NoTextInteraction)
         cursor = self.textCursor(); cursor.clearSelection(); self.setTextCursor(cursor)
         super().focusOutEvent(event)
+        if self.scene(): self.scene().mark_model_dirty(self)
         for arrow in self.arrows:
             if arrow.isSelected():
                 arrow.scene().properties_panel.show_properties(arrow)
 
     def boundingRect(self): return super().boundingRect().adjusted(-5, -5, 5, 5)
     def paint(self, painter, option, widget):
+        if option.levelOfDetailFromTransform(painter.worldTransform()) < LOD_TEXT:
+            # Weit herausgezoomt: nur ein Kästchen, der Text wäre ohnehin unlesbar.
+            painter.fillRect(self.boundingRect(), QColor("#007bff") if self.isSelected() else QColor("#8aa4c8")); return
         painter.setRenderHint(QPainter.RenderHint.Antialiasing); painter.setBrush(self._brush)
         painter.setPen(self._pen); painter.drawRoundedRect(self.boundingRect(), 8, 8)
         super().paint(painter, option, widget)
     def itemChange(self, change, value):
         if change == QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged:
-            for arrow in self.arrows: arrow.update_position()
+            if self.scene(): self.scene().schedule_arrow_update(self.arrows)
+            else:
+                for arrow in self.arrows: arrow.update_position()
         if change == QGraphicsItem.GraphicsItemChange.ItemSelectedHasChanged: self.update_visual_state()
         return super().itemChange(change, value)
     def hoverEnterEvent(self, event): self.update_visual_state(hover=True)
@@ -310,7 +660,7 @@ class ArrowItem(QGraphicsPathItem):
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable); self.rate_constant, self.arrow_type = rate_constant, "Forward"
         pen = QPen(QColor("#444"), 2, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap, Qt.PenJoinStyle.RoundJoin); self.setPen(pen)
         self.start_item.add_arrow(self); self.end_item.add_arrow(self); self.label = QGraphicsTextItem(self.rate_constant, self)
-        self.label.setDefaultTextColor(QColor("#c1121f")); self.label.setFont(QFont("Arial", 10)); self.reaction_string, self.reaction_order = "", "1"
+        self.label.setDefaultTextColor(QColor("#c1121f")); self.label.setFont(QFont("Arial", 10)); self.label.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache); self.reaction_string, self.reaction_order = "", "1"
         self.temperature_min, self.temperature_max, self.pressure = 500.0, 2000.0, 101325.0
         self.arrhenius_A, self.temperature_exponent_n, self.activation_energy_Ea = 1.0, 0.0, 0.0
         self.rate_expression = "k = A * (T/T_ref)^n * exp(-Ea/RT)"
@@ -350,6 +700,13 @@ class ArrowItem(QGraphicsPathItem):
                 self.stoich_labels[s_item] = label
         
         self.update_label_positions()
+        if not self.scene().labels_visible: self.set_labels_visible(False)
+
+    def set_labels_visible(self, visible):
+        self.label.setVisible(visible)
+        for label in self.stoich_labels.values():
+            if visible: label.update_text()
+            else: label.setVisible(False)
 
     def update_label_positions(self):
         for s_item, label in self.stoich_labels.items():
@@ -366,6 +723,7 @@ class ArrowItem(QGraphicsPathItem):
         
         if role not in self.stoichiometry_by_name: self.stoichiometry_by_name[role] = {}
         self.stoichiometry_by_name[role][s_name] = new_factor
+        self._mark_model_dirty()
         
         if self.isSelected() and self.scene() and hasattr(self.scene(), 'properties_panel'):
              self.scene().properties_panel.show_properties(self)
@@ -373,6 +731,7 @@ class ArrowItem(QGraphicsPathItem):
     def update_stoichiometry_from_panel(self, role, species_name, new_factor):
         if role not in self.stoichiometry_by_name: self.stoichiometry_by_name[role] = {}
         self.stoichiometry_by_name[role][species_name] = new_factor
+        self._mark_model_dirty()
         
         for s_item, label in self.stoich_labels.items():
             if s_item.toPlainText() == species_name:
@@ -384,7 +743,9 @@ class ArrowItem(QGraphicsPathItem):
         return {key: getattr(self, key) for key in ['rate_constant', 'arrow_type', 'reaction_string', 'reaction_order', 'temperature_min', 'temperature_max', 'pressure', 'arrhenius_A', 'temperature_exponent_n', 'activation_energy_Ea', 'rate_expression']}
 
     def set_rate_constant(self, text): self.rate_constant = text; self.label.setPlainText(text); self.update_position()
-    def set_arrow_type(self, arrow_type): self.arrow_type = arrow_type; self.update_position()
+    def set_arrow_type(self, arrow_type): self.arrow_type = arrow_type; self.update_position(); self._mark_model_dirty()
+    def _mark_model_dirty(self):
+        if self.scene(): self.scene().mark_model_dirty(self)
     def update_position(self):
         if not self.start_item or not self.end_item: return
         start_center, end_center = self.start_item.sceneBoundingRect().center(), self.end_item.sceneBoundingRect().center()
@@ -446,7 +807,7 @@ class GroupItem(QGraphicsItem):
             old_pos = self.pos(); dx, dy = value.x() - old_pos.x(), value.y() - old_pos.y()
             if dx != 0 or dy != 0:
                 for item in self.contained_items: item.moveBy(dx, dy)
-                for arrow in self.arrows: arrow.update_position()
+                self.scene().schedule_arrow_update(self.arrows)
         return super().itemChange(change, value)
     def add_arrow(self, arrow): self.arrows.append(arrow)
     def remove_arrow(self, arrow):
@@ -587,6 +948,7 @@ class PropertiesPanel(QWidget):
             if widget.text() != new_val_str:
                 widget.setText(new_val_str)
 
+        self.main_window.scene.mark_model_dirty(self.current_item)
         self._is_updating = False
 
     def update_property(self, attr, value):
@@ -606,6 +968,7 @@ class PropertiesPanel(QWidget):
             elif hasattr(self.current_item, attr) and isinstance(getattr(self.current_item, attr), (int, float)): setattr(self.current_item, attr, float(value))
             else: setattr(self.current_item, attr, value)
             if attr == "rate_constant": self.current_item.label.setPlainText(value)
+            self.main_window.scene.mark_model_dirty(self.current_item)
         except (ValueError, TypeError, AttributeError): pass
     def clear_layout(self):
         while self.form_layout.count():
@@ -617,6 +980,47 @@ class GraphicsScene(QGraphicsScene):
     def __init__(self, mode_provider, undo_stack, status_bar_notifier):
         super().__init__(); self.mode_provider, self.undo_stack, self.status_bar_notifier = mode_provider, undo_stack, status_bar_notifier; self.arrow_start_item, self.rubber_band_line = None, None
         self.properties_panel = None
+        self.model_tracker, self._dirty_model_items, self._model_keys = ModelTracker(), set(), itertools.count()
+        # Elemente nach Typ (Einfügereihenfolge), damit nicht ständig self.items() durchsucht werden muss.
+        self._items_by_type = {SpeciesItem: {}, ArrowItem: {}, GroupItem: {}}
+        # Pfeilgeometrie wird gesammelt und einmal pro Ereignisschleifen-Durchlauf aktualisiert.
+        self._pending_arrows = {}
+        self._arrow_timer = QTimer(); self._arrow_timer.setSingleShot(True); self._arrow_timer.setInterval(0)
+        self._arrow_timer.timeout.connect(self.flush_arrow_updates)
+        self.labels_visible = True
+        # Kalibrierte Toleranzen der geladenen .kin-Datei (backend_main.py --calibrate), beim Speichern unverändert übernommen
+        self.solver_settings = None
+
+    def addItem(self, item):
+        super().addItem(item)
+        if type(item) in self._items_by_type: self._items_by_type[type(item)][item] = None
+
+    def removeItem(self, item):
+        super().removeItem(item)
+        if type(item) in self._items_by_type: self._items_by_type[type(item)].pop(item, None)
+
+    def clear(self):
+        self._pending_arrows.clear()
+        for items in self._items_by_type.values(): items.clear()
+        super().clear()
+
+    def items_of_type(self, *types):
+        return [item for t in types for item in self._items_by_type[t]]
+
+    def schedule_arrow_update(self, arrows):
+        self._pending_arrows.update(dict.fromkeys(arrows))
+        if self._pending_arrows and not self._arrow_timer.isActive(): self._arrow_timer.start()
+
+    def flush_arrow_updates(self):
+        arrows, self._pending_arrows = self._pending_arrows, {}
+        for arrow in arrows:
+            if arrow.scene() is self: arrow.update_position()
+
+    def set_labels_visible(self, visible):
+        """Blendet Pfeil- und Stöchiometrie-Beschriftungen aus (Detailstufe beim Herauszoomen)."""
+        if visible == self.labels_visible: return
+        self.labels_visible = visible
+        for arrow in self.items_of_type(ArrowItem): arrow.set_labels_visible(visible)
     
     def update_from_analysis(self, analysis_data):
         selected_arrows = [item for item in self.selectedItems() if isinstance(item, ArrowItem)]
@@ -629,9 +1033,9 @@ class GraphicsScene(QGraphicsScene):
                 self.properties_panel.show_properties(selected_arrow)
     
     def serialize(self):
-        all_species = [i for i in self.items() if isinstance(i, SpeciesItem)]
-        arrows = [i for i in self.items() if isinstance(i, ArrowItem)]
-        groups = [i for i in self.items() if isinstance(i, GroupItem)]
+        all_species = self.items_of_type(SpeciesItem)
+        arrows = self.items_of_type(ArrowItem)
+        groups = self.items_of_type(GroupItem)
 
         s_map_obj_to_idx = {item: i for i, item in enumerate(all_species)}
         g_map_obj_to_id = {item: f"group_{i}" for i, item in enumerate(groups)}
@@ -657,10 +1061,62 @@ class GraphicsScene(QGraphicsScene):
             base_data['stoichiometry'] = stoich_by_idx
             arrow_data.append(base_data)
 
-        return {'species': species_data, 'groups': group_data, 'arrows': arrow_data}
+        data = {'species': species_data, 'groups': group_data, 'arrows': arrow_data}
+        if self.solver_settings: data['solver_settings'] = self.solver_settings
+        return data
+
+    def model_key(self, item):
+        """Stabiler Schlüssel eines Elements im Modell des Workers (unabhängig von Listenpositionen)."""
+        if not hasattr(item, 'model_key'):
+            item.model_key = f"{type(item).__name__[0].lower()}{next(self._model_keys)}"
+        return item.model_key
+
+    def mark_model_dirty(self, *items):
+        """Vermerkt geänderte oder hinzugefügte/entfernte Elemente für das nächste Modell-Delta."""
+        self._dirty_model_items.update(item for item in items if isinstance(item, (SpeciesItem, ArrowItem, GroupItem)))
+
+    def model_entry(self, item):
+        if isinstance(item, SpeciesItem):
+            entry = item.to_dict(); entry.pop('pos'); entry['kind'] = 'species'
+            return entry
+        if isinstance(item, GroupItem):
+            return {'kind': 'group', 'title': item.title, 'items': [self.model_key(s) for s in item.contained_items]}
+        entry = item.to_dict() | {'kind': 'arrow', 'start': self.model_key(item.start_item), 'end': self.model_key(item.end_item)}
+        stoichiometry = {}
+        for role in ["reactants", "products"]:
+            keys_by_name = {s.toPlainText(): self.model_key(s) for s in item.get_unique_species(role)}
+            stoichiometry[role] = {keys_by_name[name]: factor for name, factor in item.stoichiometry_by_name.get(role, {}).items() if name in keys_by_name}
+        entry['stoichiometry'] = stoichiometry
+        return entry
+
+    def model_delta(self):
+        """
+        Delta seit dem letzten Lauf aus den als geändert markierten Elementen;
+        ohne bekannten Stand des Workers ein vollständiges Modell.
+        Rückgabe: (delta, full).
+        """
+        full = self.model_tracker.needs_full
+        if full:
+            items = self.items_of_type(SpeciesItem, ArrowItem, GroupItem)
+        else:
+            items = set(self._dirty_model_items)
+            # Die Stöchiometrie hängt an Spezies-Namen: Pfeile geänderter Spezies (auch über Gruppen) mitschicken.
+            species = {i for i in items if isinstance(i, SpeciesItem)}
+            for item in species:
+                items.update(item.arrows)
+            if species:
+                for group in self.items_of_type(GroupItem):
+                    if species.intersection(group.contained_items):
+                        items.update(group.arrows)
+        entries = {self.model_key(i): self.model_entry(i) for i in items if i.scene() is self}
+        removed = [self.model_key(i) for i in items if i.scene() is not self]
+        self._dirty_model_items.clear()
+        return self.model_tracker.diff(entries, removed, full=full), full
 
     def deserialize(self, data):
         self.clear(); self.undo_stack.clear()
+        self.model_tracker.reset(); self._dirty_model_items.clear()
+        self.solver_settings = data.get('solver_settings')
         if 'species' not in data: return
         
         species_items = [SpeciesItem.from_dict(sd) for sd in data.get('species', [])]
@@ -716,10 +1172,9 @@ class GraphicsScene(QGraphicsScene):
             self.cancel_arrow_drawing()
     def get_next_k_value(self):
         max_k = 0;
-        for item in self.items():
-            if isinstance(item, ArrowItem):
-                rate = item.rate_constant
-                if rate.startswith('k') and rate[1:].isdigit(): max_k = max(max_k, int(rate[1:]))
+        for item in self.items_of_type(ArrowItem):
+            rate = item.rate_constant
+            if rate.startswith('k') and rate[1:].isdigit(): max_k = max(max_k, int(rate[1:]))
         return f"k{max_k + 1}"
     def mouseMoveEvent(self, event):
         if self.rubber_band_line: self.rubber_band_line.setLine(QLineF(self.arrow_start_item.sceneBoundingRect().center(), event.scenePos()))
@@ -742,15 +1197,33 @@ class GraphicsScene(QGraphicsScene):
         cmd = DeleteCommand(list(all_items_to_delete), self, "Elemente gelöscht"); self.undo_stack.push(cmd)
 
 
+class CanvasView(QGraphicsView):
+    """Ansicht mit Zoom (Strg + Mausrad) und Detailstufen für große Netzwerke."""
+    def __init__(self, scene):
+        super().__init__(scene)
+        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.SmartViewportUpdate)
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontSavePainterState)
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+    def wheelEvent(self, event):
+        if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            factor = 1.15 if event.angleDelta().y() > 0 else 1 / 1.15
+            self.scale(factor, factor); self.scene().set_labels_visible(self.transform().m11() >= LOD_LABELS)
+        else: super().wheelEvent(event)
+    def fit_all(self):
+        rect = self.scene().itemsBoundingRect()
+        if not rect.isEmpty(): self.fitInView(rect.adjusted(-50, -50, 50, 50), Qt.AspectRatioMode.KeepAspectRatio)
+        self.scene().set_labels_visible(self.transform().m11() >= LOD_LABELS)
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__(); self.setWindowTitle("Kinetics Canvas"); self.setGeometry(100, 100, 1400, 900)
         self.current_mode, self.undo_stack = 'SELECT', QUndoStack(self)
         self.scene = GraphicsScene(lambda: self.current_mode, self.undo_stack, self.statusBar().showMessage)
         self.scene.setSceneRect(0, 0, 2000, 2000); self.scene.setBackgroundBrush(QColor("#fafafa"))
-        self.view = QGraphicsView(self.scene); self.view.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.TextAntialiasing); self.setCentralWidget(self.view)
+        self.view = CanvasView(self.scene); self.view.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.TextAntialiasing); self.setCentralWidget(self.view)
         
         self.plot_dir = tempfile.mkdtemp(prefix="kinetics_plots_")
+        self.backend_worker = BackendWorker()
         
         self.create_actions(); self.create_menus(); self.create_toolbars(); self.create_properties_dock()
         self.scene.selectionChanged.connect(self.on_selection_changed); self.statusBar().showMessage("Bereit."); self.set_mode(self.current_mode)
@@ -764,11 +1237,16 @@ class MainWindow(QMainWindow):
         self.redo_action = self.undo_stack.createRedoAction(self, "Wiederherstellen"); self.redo_action.setShortcut(QKeySequence.StandardKey.Redo)
         self.delete_action = QAction("Löschen", self); self.delete_action.setShortcut(QKeySequence.StandardKey.Delete); self.delete_action.triggered.connect(self.scene.delete_selected_items); self.addAction(self.delete_action)
         self.create_group_action = QAction(QIcon.fromTheme('object-group'), "Gruppe erstellen", self); self.create_group_action.triggered.connect(self.handle_create_group)
+        self.layout_action = QAction(QIcon.fromTheme('view-grid'), "Automatisches Layout", self); self.layout_action.triggered.connect(self.handle_auto_layout)
+        self.fit_view_action = QAction(QIcon.fromTheme('zoom-fit-best'), "Alles anzeigen", self); self.fit_view_action.triggered.connect(self.view.fit_all)
         self.start_simulation_action = QAction(QIcon.fromTheme('media-playback-start'), "Simulation starten", self); self.start_simulation_action.triggered.connect(self.handle_start_simulation)
+        self.uncertainty_action = QAction("Unsicherheitsanalyse...", self); self.uncertainty_action.triggered.connect(self.handle_start_uncertainty)
+        self.cancel_simulation_action = QAction(QIcon.fromTheme('process-stop'), "Simulation abbrechen", self); self.cancel_simulation_action.triggered.connect(self.handle_cancel_simulation); self.cancel_simulation_action.setEnabled(False)
     def create_menus(self):
         file_menu = self.menuBar().addMenu("&Datei"); file_menu.addAction(self.open_action); file_menu.addAction(self.save_action); file_menu.addSeparator(); file_menu.addAction(self.export_png_action)
-        edit_menu = self.menuBar().addMenu("&Bearbeiten"); edit_menu.addAction(self.undo_action); edit_menu.addAction(self.redo_action); edit_menu.addSeparator(); edit_menu.addAction(self.delete_action); edit_menu.addSeparator(); edit_menu.addAction(self.create_group_action)
-        sim_menu = self.menuBar().addMenu("&Simulation"); sim_menu.addAction(self.start_simulation_action)
+        edit_menu = self.menuBar().addMenu("&Bearbeiten"); edit_menu.addAction(self.undo_action); edit_menu.addAction(self.redo_action); edit_menu.addSeparator(); edit_menu.addAction(self.delete_action); edit_menu.addSeparator(); edit_menu.addAction(self.create_group_action); edit_menu.addAction(self.layout_action)
+        view_menu = self.menuBar().addMenu("&Ansicht"); view_menu.addAction(self.fit_view_action)
+        sim_menu = self.menuBar().addMenu("&Simulation"); sim_menu.addAction(self.start_simulation_action); sim_menu.addAction(self.uncertainty_action); sim_menu.addAction(self.cancel_simulation_action)
     def create_toolbars(self):
         main_toolbar = QToolBar("Hauptwerkzeuge"); self.addToolBar(Qt.ToolBarArea.LeftToolBarArea, main_toolbar)
         self.action_group = QActionGroup(self); self.action_group.setExclusive(True)
@@ -776,13 +1254,13 @@ class MainWindow(QMainWindow):
         for icon, text, mode in actions_data:
             action = QAction(QIcon.fromTheme(icon), text, self); action.setCheckable(True)
             action.setData(mode); action.triggered.connect(self.toolbar_action_triggered); main_toolbar.addAction(action); self.action_group.addAction(action)
-        self.action_group.actions()[0].setChecked(True); main_toolbar.addSeparator(); main_toolbar.addAction(self.create_group_action)
+        self.action_group.actions()[0].setChecked(True); main_toolbar.addSeparator(); main_toolbar.addAction(self.create_group_action); main_toolbar.addAction(self.layout_action)
         
         sim_toolbar = QToolBar("Simulation"); self.addToolBar(Qt.ToolBarArea.TopToolBarArea, sim_toolbar)
         sim_toolbar.addWidget(QLabel(" Dauer (s): ")); self.sim_time_edit = QLineEdit("30.0"); self.sim_time_edit.setFixedWidth(50); sim_toolbar.addWidget(self.sim_time_edit)
         sim_toolbar.addWidget(QLabel(" Temp. (K): ")); self.sim_temp_edit = QLineEdit("298.15"); self.sim_temp_edit.setFixedWidth(60); sim_toolbar.addWidget(self.sim_temp_edit)
         sim_toolbar.addWidget(QLabel(" Volumen (L): ")); self.sim_volume_edit = QLineEdit("1.0"); self.sim_volume_edit.setFixedWidth(50); sim_toolbar.addWidget(self.sim_volume_edit)
-        sim_toolbar.addAction(self.start_simulation_action)
+        sim_toolbar.addAction(self.start_simulation_action); sim_toolbar.addAction(self.cancel_simulation_action)
 
         self.sim_temp_edit.textChanged.connect(lambda: self.properties_panel._on_widget_changed('temperature'))
         self.sim_volume_edit.textChanged.connect(lambda: self.properties_panel._on_widget_changed('volume'))
@@ -794,30 +1272,72 @@ class MainWindow(QMainWindow):
         self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, dock)
         
     def handle_start_simulation(self):
+        self.start_simulation()
+
+    def handle_start_uncertainty(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Unsicherheiten laden (JSON)", "", "JSON (*.json)")
+        if not path: return
+        try:
+            with open(path, 'r', encoding='utf-8') as f: spec = json.load(f)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Fehler", f"Unsicherheiten konnten nicht gelesen werden:\n{e}"); return
+        samples, ok = QInputDialog.getInt(self, "Unsicherheitsanalyse", "Anzahl Stichproben:", 200, 10, 100000)
+        if ok: self.start_simulation(uncertainty={"spec": spec, "samples": samples})
+
+    def start_simulation(self, uncertainty=None):
         try: 
             sim_time = float(self.sim_time_edit.text())
             temp_k = float(self.sim_temp_edit.text())
         except ValueError: 
             QMessageBox.critical(self, "Fehler", "Ungültige Eingabe für Simulationsparameter."); return
             
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix=".kin", encoding='utf-8') as tmp_file:
-            json.dump(self.scene.serialize(), tmp_file, indent=4); self.temp_kin_path = tmp_file.name
-            
-        self.statusBar().showMessage("Simulation läuft..."); self.start_simulation_action.setEnabled(False)
-        self.sim_thread = SimulationThread(self.temp_kin_path, sim_time, temp_k, self.plot_dir)
-        self.sim_thread.finished.connect(self.on_simulation_finished); self.sim_thread.error.connect(self.on_simulation_error); self.sim_thread.start()
+        # Nur die Änderungen seit dem letzten Lauf gehen an den Worker, der das Modell im Speicher hält.
+        if self.backend_worker.ensure_running(): self.scene.model_tracker.reset()
+        delta, full = self.scene.model_delta()
+        request = {"type": "run", "reset": full, "delta": delta, "time": sim_time, "temp": temp_k, "plot_dir": self.plot_dir, "output": "both"}
+        if uncertainty is not None: request["uncertainty"] = uncertainty
+        if self.scene.solver_settings: request["solver_settings"] = self.scene.solver_settings
+        # Erst nach einem erfolgreichen Lauf gilt der Stand als beim Worker angekommen.
+        self.pending_delta = delta
+
+        self.statusBar().showMessage("Simulation läuft..."); self.set_simulation_running(True)
+        self.live_plot_dialog = LivePlotDialog(self)
+        self.sim_thread = SimulationThread(self.backend_worker, request)
+        self.sim_thread.started_stream.connect(self.live_plot_dialog.start); self.sim_thread.chunk.connect(self.live_plot_dialog.add_chunk)
+        self.sim_thread.progress.connect(self.live_plot_dialog.set_progress); self.live_plot_dialog.cancel_requested.connect(self.handle_cancel_simulation)
+        self.sim_thread.finished.connect(self.on_simulation_finished); self.sim_thread.error.connect(self.on_simulation_error); self.sim_thread.cancelled.connect(self.on_simulation_cancelled)
+        self.live_plot_dialog.show(); self.sim_thread.start()
+
+    def set_simulation_running(self, running):
+        self.start_simulation_action.setEnabled(not running); self.uncertainty_action.setEnabled(not running); self.cancel_simulation_action.setEnabled(running)
+
+    def handle_cancel_simulation(self):
+        if getattr(self, 'sim_thread', None) is not None and self.sim_thread.isRunning():
+            self.statusBar().showMessage("Simulation wird abgebrochen..."); self.sim_thread.cancel()
 
     def on_simulation_finished(self, results):
-        self.statusBar().showMessage("Simulation erfolgreich!", 5000); self.start_simulation_action.setEnabled(True)
+        self.scene.model_tracker.commit(self.pending_delta)
+        self.statusBar().showMessage("Simulation erfolgreich!", 5000); self.set_simulation_running(False)
+        self.live_plot_dialog.finish("Simulation abgeschlossen."); self.live_plot_dialog.close()
         # BUG-FIX: Die folgende Zeile wurde entfernt, um das automatische Ändern des Modells zu verhindern.
         # if "analysis" in results:
         #     self.scene.update_from_analysis(results["analysis"])
         self.plot_dialog = PlotDialog(results, self); self.plot_dialog.show()
         
     def on_simulation_error(self, message):
-        self.statusBar().showMessage("Simulation fehlgeschlagen.", 5000); self.start_simulation_action.setEnabled(True)
+        self.scene.model_tracker.reset()  # Modellstand des Workers unbekannt: nächster Lauf schickt alles
+        self.statusBar().showMessage("Simulation fehlgeschlagen.", 5000); self.set_simulation_running(False)
+        self.live_plot_dialog.finish("Simulation fehlgeschlagen.")
         QMessageBox.critical(self, "Simulationsfehler", message)
+
+    def on_simulation_cancelled(self):
+        self.scene.model_tracker.reset()
+        self.statusBar().showMessage("Simulation abgebrochen.", 5000); self.set_simulation_running(False)
+        self.live_plot_dialog.finish("Simulation abgebrochen – Teilergebnis bleibt sichtbar.")
         
+    def closeEvent(self, event):
+        self.backend_worker.stop(); super().closeEvent(event)
+
     def handle_create_group(self):
         selected = [item for item in self.scene.selectedItems() if isinstance(item, SpeciesItem)]
         if len(selected) < 1: self.statusBar().showMessage("Bitte mind. eine Spezies auswählen.", 3000); return
@@ -829,12 +1349,35 @@ class MainWindow(QMainWindow):
                 for arrow in item.arrows:
                     arrow.update_stoichiometry_display()
 
+    def handle_auto_layout(self):
+        species = self.scene.items_of_type(SpeciesItem)
+        if not species: return
+        index = {item: i for i, item in enumerate(species)}
+        edges = [(index[a], index[b]) for arrow in self.scene.items_of_type(ArrowItem)
+                 for a in arrow.get_unique_species('reactants') for b in arrow.get_unique_species('products') if a in index and b in index]
+        positions = [[item.pos().x(), item.pos().y()] for item in species]
+        self.layout_action.setEnabled(False); self.statusBar().showMessage("Layout wird berechnet...")
+        self.layout_thread = LayoutThread(len(species), edges, positions)
+        self.layout_thread.progress.connect(lambda percent: self.statusBar().showMessage(f"Layout wird berechnet... {percent} %"))
+        self.layout_thread.finished.connect(lambda new_positions: self.on_layout_finished(species, new_positions)); self.layout_thread.start()
+
+    def on_layout_finished(self, species, new_positions):
+        self.layout_action.setEnabled(True)
+        # Während der Berechnung gelöschte Spezies werden übergangen.
+        moved = [(item, QPointF(*new_positions[i])) for i, item in enumerate(species) if item.scene() is self.scene]
+        if not moved: return
+        species, new = [item for item, _ in moved], [pos for _, pos in moved]
+        old = [item.pos() for item in species]
+        self.undo_stack.push(MoveItemsCommand(species, old, new, self.scene, "Automatisches Layout"))
+        self.scene.setSceneRect(self.scene.itemsBoundingRect().adjusted(-200, -200, 200, 200).united(self.scene.sceneRect()))
+        self.view.fit_all(); self.statusBar().showMessage("Layout angewendet.", 5000)
+
     def handle_open(self):
         path, _ = QFileDialog.getOpenFileName(self, "Szene öffnen", "", "Kinetics Files (*.kin)")
         if path:
             try:
                 with open(path, 'r', encoding='utf-8') as f: data = json.load(f)
-                self.scene.deserialize(data); self.statusBar().showMessage(f"Szene geladen von {path}", 5000)
+                self.scene.deserialize(data); self.view.fit_all(); self.statusBar().showMessage(f"Szene geladen von {path}", 5000)
             except Exception as e: QMessageBox.critical(self, "Fehler beim Laden", str(e)); self.statusBar().showMessage(f"Fehler beim Laden: {e}", 5000)
 
     def handle_save(self):
@@ -0,0 +1,51 @@
+# python/layout.py
+import numpy as np
+
+def force_directed_layout(n_nodes, edges, positions=None, spacing=120.0, iterations=300, seed=None,
+                          block_size=1024, progress_callback=None):
+    """
+    Kräftebasiertes Layout nach Fruchterman/Reingold für n_nodes Knoten und
+    eine Kantenliste [(i, j), ...]. Die Abstoßung aller Knotenpaare wird
+    blockweise vektorisiert berechnet (Speicher O(block_size * n_nodes)).
+    spacing ist der angestrebte Kantenabstand in Szenenkoordinaten.
+    progress_callback(iteration) kann False zurückgeben, um abzubrechen.
+    Rückgabe: Array (n_nodes, 2) mit Positionen ab (0, 0).
+    """
+    if n_nodes == 0:
+        return np.zeros((0, 2))
+    rng = np.random.default_rng(seed)
+    side = spacing * np.sqrt(n_nodes)
+    pos = np.array(positions, dtype=float) if positions is not None else rng.uniform(0.0, side, size=(n_nodes, 2))
+    # Identische Startpositionen (z. B. alle Knoten bei (0, 0)) leicht auseinanderziehen.
+    pos += rng.uniform(-1e-3, 1e-3, size=pos.shape) * spacing
+
+    edges = np.asarray(list(edges), dtype=np.int64).reshape(-1, 2)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    k2 = spacing ** 2
+    temperature = side / 10.0
+    cooling = temperature / (iterations + 1)
+
+    for iteration in range(iterations):
+        displacement = np.zeros_like(pos)
+        x, y = pos[:, 0], pos[:, 1]
+        for start in range(0, n_nodes, block_size):
+            dx = x[start:start + block_size, None] - x[None, :]
+            dy = y[start:start + block_size, None] - y[None, :]
+            weight = k2 / np.maximum(dx * dx + dy * dy, 1e-4)
+            displacement[start:start + block_size, 0] = (dx * weight).sum(axis=1)
+            displacement[start:start + block_size, 1] = (dy * weight).sum(axis=1)
+
+        if edges.size:
+            delta = pos[edges[:, 0]] - pos[edges[:, 1]]
+            dist = np.maximum(np.linalg.norm(delta, axis=1), 1e-2)
+            force = delta * (dist / spacing)[:, None]
+            np.add.at(displacement, edges[:, 0], -force)
+            np.add.at(displacement, edges[:, 1], force)
+
+        length = np.maximum(np.linalg.norm(displacement, axis=1), 1e-9)
+        pos += displacement / length[:, None] * np.minimum(length, temperature)[:, None]
+        temperature = max(temperature - cooling, spacing * 0.01)
+        if progress_callback is not None and progress_callback(iteration) is False:
+            break
+
+    return pos - pos.min(axis=0)
@@ -0,0 +1,142 @@
+# python/model_sync.py
+from parser import parse_kin_data
+from data_model import Species, Reaction
+
+# Felder eines Pfeils, die die Struktur des Netzwerks festlegen.
+STRUCTURAL_ARROW_FIELDS = ('start', 'end', 'stoichiometry')
+
+class ModelTracker:
+    """
+    GUI-Seite des Modellabgleichs: merkt sich, welche Einträge zuletzt an
+    den Worker geschickt wurden, und erzeugt daraus ein kompaktes Delta
+    {"upsert": {Schlüssel: Eintrag}, "remove": [Schlüssel]}.
+
+    Einträge sind JSON-fähige Dictionaries mit "kind" = species | group |
+    arrow; Pfeile und Gruppen verweisen über stabile Schlüssel auf Spezies,
+    nicht über Listenpositionen.
+    """
+    def __init__(self):
+        self.sent = {}
+        self.needs_full = True
+
+    def reset(self):
+        """Der Worker kennt kein Modell mehr (neu gestartet, neue Szene)."""
+        self.sent = {}
+        self.needs_full = True
+
+    def diff(self, entries, removed=(), full=False):
+        """
+        entries: aktuelle Einträge der geänderten (bei full: aller) Elemente.
+        removed: Schlüssel entfernter Elemente. Bei full werden zusätzlich alle
+        bekannten Schlüssel entfernt, die in entries nicht mehr vorkommen.
+        """
+        upsert = {key: entry for key, entry in entries.items() if self.sent.get(key) != entry}
+        removed = {key for key in removed if key in self.sent and key not in entries}
+        if full:
+            removed |= set(self.sent) - set(entries)
+        return {"upsert": upsert, "remove": sorted(removed)}
+
+    def commit(self, delta):
+        """Übernimmt ein verschicktes Delta als neuen Stand des Workers."""
+        for key in delta["remove"]:
+            self.sent.pop(key, None)
+        self.sent.update(delta["upsert"])
+        self.needs_full = False
+
+class KineticModel:
+    """
+    Worker-Seite: hält das Modell aus Einträgen und das daraus übersetzte
+    ReactionSystem im Speicher. Ändern sich nur Parameter (Startwerte,
+    Arrhenius-Parameter, ...), werden die betroffenen Species- bzw.
+    Reaction-Objekte ersetzt; erst strukturelle Änderungen (Elemente
+    hinzugefügt/entfernt, Pfeilenden, Stöchiometrie, Umbenennungen) führen
+    zu einem vollständigen Neuaufbau mit parse_kin_data.
+    """
+    def __init__(self):
+        self.entries = {}
+        self.system = None
+        self._species_index, self._reaction_index = {}, {}
+        self._pending = set()
+        self.stats = {"rebuilds": 0, "patched": 0}
+
+    def apply_delta(self, delta):
+        structural = False
+        for key in delta.get("remove", []):
+            if self.entries.pop(key, None) is not None:
+                structural = True
+            self._pending.discard(key)
+        for key, entry in delta.get("upsert", {}).items():
+            old = self.entries.get(key)
+            self.entries[key] = entry
+            if old is None or old["kind"] != entry["kind"] or entry["kind"] == "group" or self._is_structural(old, entry):
+                structural = True
+            else:
+                self._pending.add(key)
+        if structural:
+            self.system = None
+        return structural
+
+    @staticmethod
+    def _is_structural(old, new):
+        if new["kind"] == "species":
+            return old.get("name") != new.get("name")
+        return any(old.get(field) != new.get(field) for field in STRUCTURAL_ARROW_FIELDS)
+
+    def to_kin_data(self):
+        """Übersetzt die Einträge in das Format einer .kin-Datei (Listenindizes statt Schlüssel)."""
+        species_keys = [k for k, e in self.entries.items() if e["kind"] == "species"]
+        group_keys = [k for k, e in self.entries.items() if e["kind"] == "group"]
+        arrow_keys = [k for k, e in self.entries.items() if e["kind"] == "arrow"]
+        species_idx = {key: i for i, key in enumerate(species_keys)}
+        node_ids = species_idx | {key: f"group_{i}" for i, key in enumerate(group_keys)}
+
+        def field_data(entry):
+            return {k: v for k, v in entry.items() if k not in ('kind', 'start', 'end', 'items')}
+
+        species = [field_data(self.entries[k]) for k in species_keys]
+        groups = [{'id': node_ids[k], 'title': self.entries[k].get('title', ''),
+                   'items': [species_idx[s] for s in self.entries[k]['items'] if s in species_idx]} for k in group_keys]
+        arrows = []
+        for key in arrow_keys:
+            entry = self.entries[key]
+            data = field_data(entry)
+            data['start_id'], data['end_id'] = node_ids.get(entry['start']), node_ids.get(entry['end'])
+            data['stoichiometry'] = {role: {str(species_idx[s]): f for s, f in entry.get('stoichiometry', {}).get(role, {}).items() if s in species_idx}
+                                     for role in ('reactants', 'products')}
+            arrows.append(data)
+        return {'species': species, 'groups': groups, 'arrows': arrows}, species_keys, arrow_keys
+
+    def _node_has_species(self, node_key):
+        entry = self.entries.get(node_key)
+        if entry is None:
+            return False
+        if entry["kind"] == "group":
+            return any(self.entries.get(s, {}).get("kind") == "species" for s in entry["items"])
+        return entry["kind"] == "species"
+
+    def get_system(self):
+        """Liefert das aktuelle ReactionSystem und wendet ausstehende Parameteränderungen an."""
+        if self.system is None:
+            data, species_keys, arrow_keys = self.to_kin_data()
+            self.system = parse_kin_data(data)
+            self._species_index = {key: i for i, key in enumerate(species_keys)}
+            # parse_kin_data überspringt Pfeile ohne Edukte oder Produkte.
+            kept = [k for k in arrow_keys if self._node_has_species(self.entries[k]['start']) and self._node_has_species(self.entries[k]['end'])]
+            self._reaction_index = {key: i for i, key in enumerate(kept)}
+            self._pending.clear()
+            self.stats["rebuilds"] += 1
+            return self.system
+
+        for key in self._pending:
+            entry = self.entries[key]
+            if entry["kind"] == "species" and key in self._species_index:
+                fields = {k: v for k, v in entry.items() if k != 'kind'}
+                self.system.species[self._species_index[key]] = Species(**fields)
+            elif entry["kind"] == "arrow" and key in self._reaction_index:
+                idx = self._reaction_index[key]
+                old = self.system.reactions[idx]
+                fields = {k: v for k, v in entry.items() if k not in ('kind', 'start', 'end', 'stoichiometry')}
+                self.system.reactions[idx] = Reaction(old.reactants, old.products, entry['rate_constant'], **fields)
+            self.stats["patched"] += 1
+        self._pending.clear()
+        return self.system
@@ -7,7 +7,10 @@ def parse_kin_file(filepath):
     """Liest eine .kin-Datei und erstellt ein ReactionSystem-Objekt."""
     with open(filepath, 'r') as f:
         data = json.load(f)
+    return parse_kin_data(data)
 
+def parse_kin_data(data):
+    """Erstellt ein ReactionSystem aus dem bereits geladenen Inhalt einer .kin-Datei."""
     species_list = [Species(**s) for s in data['species']]
 
     def resolve_node_to_indices(node_id, groups_map):
@@ -51,4 +54,4 @@ def parse_kin_file(filepath):
         reaction = Reaction(reactants, products, r_data['rate_constant'], **r_data)
         reaction_list.append(reaction)
         
-    return ReactionSystem(species_list, reaction_list)
\ No newline at end of file
+    return ReactionSystem(species_list, reaction_list, data.get('solver_settings'))
\ No newline at end of file
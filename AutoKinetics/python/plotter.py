@@ -1,35 +1,57 @@
+import os
+import json
+import hashlib
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
+from trajectory_store import species_series
 
-def generate_plots(sim_results, analysis, plot_dir):
+# Höchstzahl an Pixelspalten für Linien aus sehr langen Trajektorien
+PLOT_BINS = 2000
+# Ändert sich das Aussehen der Plots, wird über diese Version der ganze Cache ungültig.
+PLOT_CACHE_VERSION = 2
+
+
+def generate_plots(sim_results, analysis, plot_dir, uncertainty=None):
     """
     Erstellt und speichert die Ergebnis-Plots für die Gesamtübersicht und
-    für jeden einzelnen analysierten Reaktionsschritt.
+    für jeden einzelnen analysierten Reaktionsschritt. Die Trajektorien
+    werden pro Spezies gelesen (auch aus einer Trajektoriendatei) und bei
+    sehr vielen Punkten mit decimate_minmax ausgedünnt. Über PlotCache
+    werden nur Abbildungen neu gezeichnet, deren Daten sich geändert haben.
+    Mit uncertainty (Ergebnis von propagate_uncertainty) zeigt die
+    Gesamtübersicht das Band zwischen kleinstem und größtem Quantil.
     """
     plot_dir = Path(plot_dir)
     plot_dir.mkdir(exist_ok=True)
+    cache = PlotCache(plot_dir)
     
-    time = np.array(sim_results['time_points'])
     species_names = sim_results['species_names']
-    concentrations = np.array(sim_results['concentrations'])
     
     # Dictionary zum Sammeln aller erstellten Dateipfade
     plot_files = {}
 
     # 1. Haupt-Plot (Konzentrationsverlauf)
-    plt.figure(figsize=(10, 7))
-    for i, name in enumerate(species_names):
-        plt.plot(time, concentrations[i], label=name)
-    plt.title('Konzentrationsverlauf über die Zeit')
-    plt.xlabel('Zeit (s)')
-    plt.ylabel('Konzentration (mol/L)')
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
+    series = [(name, *_plot_series(*species_series(sim_results, i))) for i, name in enumerate(species_names)]
     concentration_plot_path = plot_dir / "concentration.png"
-    plt.savefig(concentration_plot_path)
-    plt.close()
+    bands = uncertainty_bands(uncertainty)
+    key = figure_key("concentration", *[part for entry in series for part in entry],
+                     *([] if bands is None else [bands[0], *bands[1:]]))
+    if not cache.is_fresh(concentration_plot_path, key):
+        plt.figure(figsize=(10, 7))
+        for i, (name, time, concentration) in enumerate(series):
+            line, = plt.plot(time, concentration, label=name)
+            if bands is not None:
+                plt.fill_between(bands[0], bands[1][i], bands[2][i], color=line.get_color(), alpha=0.2, linewidth=0)
+        plt.title('Konzentrationsverlauf über die Zeit')
+        plt.xlabel('Zeit (s)')
+        plt.ylabel('Konzentration (mol/L)')
+        plt.legend()
+        plt.grid(True)
+        plt.tight_layout()
+        plt.savefig(concentration_plot_path)
+        plt.close()
+        cache.store(concentration_plot_path, key)
     plot_files["concentration"] = str(concentration_plot_path)
 
     # 2. Analyse-Plots für JEDE Reaktion im Analyse-Ergebnis
@@ -41,12 +63,11 @@ def generate_plots(sim_results, analysis, plot_dir):
         except ValueError:
             continue
 
-        reactant_conc = concentrations[reactant_idx]
+        time, reactant_conc = species_series(sim_results, reactant_idx)
         
         # Nur valide Datenpunkte für die Analyse verwenden
         valid_indices = reactant_conc > 1e-9
-        time_valid = time[valid_indices]
-        conc_valid = reactant_conc[valid_indices]
+        time_valid, conc_valid = _plot_series(time[valid_indices], reactant_conc[valid_indices])
 
         if len(time_valid) < 2:
             continue
@@ -54,52 +75,150 @@ def generate_plots(sim_results, analysis, plot_dir):
         k_fits = analysis_data.get('all_fits', {})
         paths_for_reaction = {}
 
-        # Plot: 0. Ordnung
-        k0_info = k_fits.get('zero_order', {})
-        k0 = k0_info.get('k', 0)
-        u0 = k0_info.get('unit', 'mol·L⁻¹·s⁻¹')
-        plt.figure(figsize=(8, 6))
-        plt.plot(time_valid, conc_valid, 'o', label=f'[{reactant_name}]')
-        plt.title(f'Analyse 0. Ordnung für {rate_label} (k = {k0:.3g} {u0})')
-        plt.xlabel('Zeit (s)')
-        plt.ylabel('Konzentration (mol/L)')
-        plt.grid(True); plt.legend(); plt.tight_layout()
-        path = plot_dir / f"{rate_label}_zero_order.png"
-        plt.savefig(path)
-        plt.close()
-        paths_for_reaction["zero_order"] = str(path)
-        
-        # Plot: 1. Ordnung
-        k1_info = k_fits.get('first_order', {})
-        k1 = k1_info.get('k', 0)
-        u1 = k1_info.get('unit', 's⁻¹')
-        plt.figure(figsize=(8, 6))
-        plt.plot(time_valid, np.log(conc_valid), 'o', label=f'ln([{reactant_name}])')
-        plt.title(f'Analyse 1. Ordnung für {rate_label} (k = {k1:.3g} {u1})')
-        plt.xlabel('Zeit (s)')
-        plt.ylabel('ln(Konzentration)')
-        plt.grid(True); plt.legend(); plt.tight_layout()
-        path = plot_dir / f"{rate_label}_first_order.png"
-        plt.savefig(path)
-        plt.close()
-        paths_for_reaction["first_order"] = str(path)
-
-        # Plot: 2. Ordnung
-        k2_info = k_fits.get('second_order', {})
-        k2 = k2_info.get('k', 0)
-        u2 = k2_info.get('unit', 'L·mol⁻¹·s⁻¹')
-        plt.figure(figsize=(8, 6))
-        plt.plot(time_valid, 1 / conc_valid, 'o', label=f'1/[{reactant_name}]')
-        plt.title(f'Analyse 2. Ordnung für {rate_label} (k = {k2:.3g} {u2})')
-        plt.xlabel('Zeit (s)')
-        plt.ylabel('1/Konzentration (L/mol)')
-        plt.grid(True); plt.legend(); plt.tight_layout()
-        path = plot_dir / f"{rate_label}_second_order.png"
-        plt.savefig(path)
-        plt.close()
-        paths_for_reaction["second_order"] = str(path)
+        # Je Ordnung: (Schlüssel, Transformation, Legende, Titel, y-Achse, Standardeinheit)
+        order_plots = [
+            ('zero_order', conc_valid, f'[{reactant_name}]', '0. Ordnung', 'Konzentration (mol/L)', 'mol·L⁻¹·s⁻¹'),
+            ('first_order', np.log(conc_valid), f'ln([{reactant_name}])', '1. Ordnung', 'ln(Konzentration)', 's⁻¹'),
+            ('second_order', 1 / conc_valid, f'1/[{reactant_name}]', '2. Ordnung', '1/Konzentration (L/mol)', 'L·mol⁻¹·s⁻¹'),
+        ]
+        for order, values, legend, order_title, ylabel, default_unit in order_plots:
+            info = k_fits.get(order, {})
+            title = f"Analyse {order_title} für {rate_label} (k = {info.get('k', 0):.3g} {info.get('unit', default_unit)})"
+            path = plot_dir / f"{rate_label}_{order}.png"
+            key = figure_key(title, legend, ylabel, time_valid, values)
+            if not cache.is_fresh(path, key):
+                plt.figure(figsize=(8, 6))
+                plt.plot(time_valid, values, 'o', label=legend)
+                plt.title(title)
+                plt.xlabel('Zeit (s)')
+                plt.ylabel(ylabel)
+                plt.grid(True); plt.legend(); plt.tight_layout()
+                plt.savefig(path)
+                plt.close()
+                cache.store(path, key)
+            paths_for_reaction[order] = str(path)
         
         analysis_plots[rate_label] = paths_for_reaction
         
     plot_files["analysis_plots"] = analysis_plots
-    return plot_files
\ No newline at end of file
+    cache.finish()
+    plot_files["cache"] = cache.stats
+    return plot_files
+
+
+def uncertainty_bands(uncertainty):
+    """(Zeitpunkte, untere, obere Grenze) aus dem kleinsten und größten Quantil oder None."""
+    if not uncertainty or not uncertainty.get("quantiles") or not uncertainty.get("n_samples"):
+        return None
+    levels = sorted(uncertainty["quantiles"], key=float)
+    return (np.asarray(uncertainty["time_points"], dtype=float),
+            np.asarray(uncertainty["quantiles"][levels[0]], dtype=float), np.asarray(uncertainty["quantiles"][levels[-1]], dtype=float))
+
+
+def figure_key(*parts):
+    """
+    Schlüssel einer Abbildung: Hash über Texte, Zahlen und alle gezeichneten
+    Arrays vollständig (als float32, also auf Darstellungsgenauigkeit; die
+    Arrays sind schon auf höchstens 2 * PLOT_BINS Punkte reduziert). Jede
+    Änderung eines gezeichneten Punkts, auch eine schmale Spitze, zeichnet
+    die Abbildung neu.
+    """
+    digest = hashlib.sha256(str(PLOT_CACHE_VERSION).encode())
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            part = np.ascontiguousarray(np.nan_to_num(np.asarray(part, dtype=np.float64), nan=0.0, posinf=0.0, neginf=0.0), dtype=np.float32)
+            digest.update(f"a{part.shape}".encode())
+            digest.update(part.tobytes())
+        else:
+            digest.update(f"s{part!r}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class PlotCache:
+    """
+    Merkt sich in plot_dir/.plot_cache.json, mit welchen Daten jede
+    Abbildung gezeichnet wurde (figure_key). Stimmt der Hash überein,
+    wird die Datei von der Platte übernommen;
+    Dateien aus früheren Läufen, die diesmal nicht mehr entstehen (z. B.
+    gelöschte Reaktionen), entfernt finish(). Nur selbst angelegte Dateien
+    werden je gelöscht.
+    """
+    INDEX_NAME = ".plot_cache.json"
+
+    def __init__(self, plot_dir):
+        self.plot_dir = Path(plot_dir)
+        self.index_path = self.plot_dir / self.INDEX_NAME
+        try:
+            self.previous = json.loads(self.index_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self.previous = {}
+        self.current = {}
+        self.stats = {"reused": 0, "rendered": 0, "evicted": 0}
+
+    def is_fresh(self, path, key):
+        name = Path(path).name
+        entry = self.previous.get(name)
+        if isinstance(entry, dict) and entry.get("key") == key and Path(path).exists():
+            self.current[name] = entry
+            self.stats["reused"] += 1
+            return True
+        return False
+
+    def store(self, path, key):
+        self.current[Path(path).name] = {"key": key}
+        self.stats["rendered"] += 1
+
+    def finish(self):
+        for name in set(self.previous) - set(self.current):
+            try:
+                (self.plot_dir / name).unlink()
+                self.stats["evicted"] += 1
+            except OSError:
+                pass
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.current), encoding='utf-8')
+        os.replace(tmp, self.index_path)
+
+
+def _plot_series(time, values):
+    """Eine Spezies für statische Plots: bei mehr als 2 * PLOT_BINS Punkten Min/Max pro Spalte."""
+    if len(time) <= 2 * PLOT_BINS:
+        return np.asarray(time), np.asarray(values)
+    t, y = decimate_minmax(time, values, time[0], time[-1], PLOT_BINS)
+    return t, y[0]
+
+
+def decimate_minmax(time, values, x_min, x_max, n_bins, log_x=False):
+    """
+    Reduziert Trajektorien für die Darstellung auf n_bins Pixelspalten im
+    Bereich [x_min, x_max]: pro Spalte bleiben Minimum und Maximum jeder
+    Spezies erhalten, sodass Spitzen und schnelle Transienten sichtbar
+    bleiben. values hat die Form (Spezies, Zeitpunkte); alle Spezies werden
+    in einem Durchgang verarbeitet. Mit log_x sind die Spalten logarithmisch
+    verteilt. Rückgabe: (Zeitpunkte, Werte) mit höchstens 2 * n_bins Punkten.
+    """
+    time = np.asarray(time, dtype=float)
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    # Je einen Punkt außerhalb mitnehmen, damit die Linien bis zum Rand reichen.
+    i0 = max(int(np.searchsorted(time, x_min, side='left')) - 1, 0)
+    i1 = min(int(np.searchsorted(time, x_max, side='right')) + 1, len(time))
+    t, y = time[i0:i1], values[:, i0:i1]
+    if t.size <= 2 * n_bins:
+        return t, y
+
+    if log_x:
+        positive = t[t > 0]
+        floor = positive[0] if positive.size else 1.0
+        u = np.log10(np.maximum(t, floor))
+    else:
+        u = t
+    starts = np.unique(np.searchsorted(u, np.linspace(u[0], u[-1], n_bins + 1)[:-1], side='left'))
+    starts = starts[starts < t.size]
+    ends = np.append(starts[1:], t.size) - 1
+
+    t_out = np.empty(2 * starts.size)
+    t_out[0::2], t_out[1::2] = t[starts], t[ends]
+    y_out = np.empty((y.shape[0], 2 * starts.size))
+    y_out[:, 0::2] = np.minimum.reduceat(y, starts, axis=1)
+    y_out[:, 1::2] = np.maximum.reduceat(y, starts, axis=1)
+    return t_out, y_out
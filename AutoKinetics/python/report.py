@@ -0,0 +1,267 @@
+# python/report.py
+import json
+import zlib
+import base64
+import numpy as np
+from pathlib import Path
+from plotter import decimate_minmax, PLOT_BINS
+from trajectory_store import species_series
+
+def _series_groups(sim_results, n_bins):
+    """
+    Dezimiert alle Spezies auf höchstens 2 * n_bins Punkte. Spezies mit
+    demselben Zeitgitter (gleiche Schrittweite) teilen sich ein Zeit-Array.
+    Rückgabe: (Liste der Zeit-Arrays, [(Gruppenindex, Werte)] je Spezies).
+    """
+    times, series, group_of = [], [], {}
+    for idx in range(len(sim_results['species_names'])):
+        t, c = species_series(sim_results, idx)
+        key = (len(t), float(t[0]) if len(t) else 0.0, float(t[-1]) if len(t) else 0.0)
+        if len(t) > 2 * n_bins:
+            t, c = decimate_minmax(t, c, t[0], t[-1], n_bins)
+            c = c[0]
+        if key not in group_of:
+            group_of[key] = len(times)
+            times.append(np.asarray(t, dtype=float))
+        series.append((group_of[key], np.asarray(c, dtype=float)))
+    return times, series
+
+def _json_safe(value):
+    """NaN/Inf (z. B. R² konstanter Verläufe) sind kein gültiges JSON und werden zu None."""
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+def build_report_data(sim_results, analysis, n_bins=PLOT_BINS):
+    """
+    Daten des Berichts: Metadaten als JSON-fähiges Dictionary und alle
+    Arrays als ein zlib-komprimierter float32-Block, auf den die Einträge
+    über [Offset, Länge] verweisen.
+    """
+    times, series = _series_groups(sim_results, n_bins)
+    arrays, offset = [], 0
+
+    def add(values):
+        nonlocal offset
+        values = np.asarray(values, dtype=np.float32)
+        arrays.append(values)
+        ref = [offset, len(values)]
+        offset += len(values)
+        return ref
+
+    time_refs = [add(t) for t in times]
+    species_names = sim_results['species_names']
+    meta = {
+        "species": [{"name": name, "time": time_refs[group], "values": add(values)}
+                    for name, (group, values) in zip(species_names, series)],
+        "reactions": [{"label": label, "reactant": data['analyzed_reactant'],
+                       "species_index": species_names.index(data['analyzed_reactant']),
+                       "best_fit_order": data['best_fit_order'], "k": data['calculated_k'], "k_unit": data['k_unit'],
+                       "r_squared": data['r_squared'], "all_fits": data.get('all_fits', {}), "regimes": data.get('regimes', [])}
+                      for label, data in analysis.items() if data['analyzed_reactant'] in species_names],
+        "parameters": sim_results.get("simulation_parameters", {}),
+        "stop_condition": sim_results.get("stop_condition"),
+        "rate_law_equations": sim_results.get("rate_law_equations", ""),
+    }
+    blob = np.concatenate(arrays).tobytes() if arrays else b""
+    return meta, zlib.compress(blob, 6)
+
+def write_report(sim_results, analysis, path, title="AutoKinetics – Simulationsbericht"):
+    """
+    Schreibt einen eigenständigen HTML-Bericht: Gesamtübersicht und die
+    Ordnungsplots jeder Reaktion werden im Browser aus den eingebetteten,
+    komprimierten Trajektorien gezeichnet (Canvas, ohne Netzwerkzugriff).
+    Eine Datei statt einer PNG-Datei pro Plot.
+    """
+    meta, blob = build_report_data(sim_results, analysis)
+    html = (REPORT_TEMPLATE
+            .replace("__TITLE__", title)
+            .replace("__META__", json.dumps(_json_safe(meta), allow_nan=False).replace("</", "<\\/"))
+            .replace("__DATA__", base64.b64encode(blob).decode('ascii')))
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(html, encoding='utf-8')
+    return str(path)
+
+REPORT_TEMPLATE = r"""<!DOCTYPE html>
+<html lang="de">
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+  body { font-family: sans-serif; margin: 0; display: flex; height: 100vh; }
+  #side { width: 240px; padding: 8px; border-right: 1px solid #ccc; display: flex; flex-direction: column; gap: 6px; }
+  #species { flex: 1; overflow-y: auto; font-size: 13px; }
+  #main { flex: 1; overflow-y: auto; padding: 8px 16px; }
+  canvas { width: 100%; border: 1px solid #ddd; }
+  .orders { display: grid; grid-template-columns: repeat(3, 1fr); gap: 8px; }
+  .orders canvas { height: 260px; }
+  #overview { height: 420px; }
+  table { border-collapse: collapse; font-size: 13px; }
+  td, th { border: 1px solid #ccc; padding: 2px 6px; text-align: right; }
+  pre { background: #f6f6f6; padding: 6px; overflow-x: auto; }
+</style>
+</head>
+<body>
+<div id="side">
+  <input id="filter" placeholder="Spezies filtern...">
+  <div id="species"></div>
+  <label><input type="checkbox" id="logx"> Zeitachse logarithmisch</label>
+  <label><input type="checkbox" id="logy"> Konzentration logarithmisch</label>
+</div>
+<div id="main">
+  <h2>Konzentrationsverlauf</h2>
+  <canvas id="overview"></canvas>
+  <div id="params"></div>
+  <h2>Analyse je Reaktion</h2>
+  <select id="reaction"></select>
+  <div id="summary"></div>
+  <div class="orders"><canvas id="o0"></canvas><canvas id="o1"></canvas><canvas id="o2"></canvas></div>
+  <h2>Zeitgesetz</h2>
+  <pre id="ratelaw"></pre>
+</div>
+<script type="application/json" id="meta">__META__</script>
+<script type="application/octet-stream" id="data">__DATA__</script>
+<script>
+"use strict";
+const META = JSON.parse(document.getElementById("meta").textContent);
+const COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf"];
+const ORDERS = [
+  ["zero_order", "0. Ordnung", "[X] (mol/L)", c => c],
+  ["first_order", "1. Ordnung", "ln([X])", c => Math.log(c)],
+  ["second_order", "2. Ordnung", "1/[X] (L/mol)", c => 1 / c]];
+let DATA = null;
+const visible = META.species.map((_, i) => i < 20);
+
+async function loadData() {
+  const bytes = Uint8Array.from(atob(document.getElementById("data").textContent), ch => ch.charCodeAt(0));
+  const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("deflate"));
+  return new Float32Array(await new Response(stream).arrayBuffer());
+}
+const view = ref => DATA.subarray(ref[0], ref[0] + ref[1]);
+
+function niceTicks(lo, hi, n) {
+  if (!(hi > lo)) { hi = lo + 1; }
+  const step0 = (hi - lo) / n, mag = Math.pow(10, Math.floor(Math.log10(step0)));
+  const step = [1, 2, 5, 10].map(m => m * mag).find(s => s >= step0);
+  const ticks = [];
+  for (let v = Math.ceil(lo / step) * step; v <= hi + step * 1e-9; v += step) ticks.push(v);
+  return ticks;
+}
+const fix4 = v => v == null ? "–" : v.toFixed(4);
+const fmt = v => v == null ? "–" : (Math.abs(v) >= 1e4 || (Math.abs(v) < 1e-3 && v !== 0)) ? v.toExponential(1) : +v.toPrecision(3) + "";
+
+// Zeichnet Serien [{x, y, color, label, points}] mit Achsen; tx/ty transformieren die Werte (z. B. log10).
+function plot(canvas, series, opts) {
+  const dpr = window.devicePixelRatio || 1, w = canvas.clientWidth, h = canvas.clientHeight;
+  canvas.width = w * dpr; canvas.height = h * dpr;
+  const g = canvas.getContext("2d");
+  g.setTransform(dpr, 0, 0, dpr, 0, 0); g.clearRect(0, 0, w, h);
+  const tx = opts.logx ? Math.log10 : v => v, ty = opts.logy ? Math.log10 : v => v;
+  let x0 = Infinity, x1 = -Infinity, y0 = Infinity, y1 = -Infinity;
+  for (const s of series) for (let i = 0; i < s.x.length; i++) {
+    const x = tx(s.x[i]), y = ty(s.y[i]);
+    if (!isFinite(x) || !isFinite(y)) continue;
+    x0 = Math.min(x0, x); x1 = Math.max(x1, x); y0 = Math.min(y0, y); y1 = Math.max(y1, y);
+  }
+  if (!isFinite(x0)) { g.fillText("Keine Daten", w / 2 - 30, h / 2); return; }
+  if (y1 === y0) { y0 -= 0.5; y1 += 0.5; }
+  if (x1 === x0) { x0 -= 0.5; x1 += 0.5; }
+  const L = 60, R = 10, T = 22, B = 36;
+  const px = x => L + (x - x0) / (x1 - x0) * (w - L - R), py = y => h - B - (y - y0) / (y1 - y0) * (h - T - B);
+  g.strokeStyle = "#ddd"; g.fillStyle = "#333"; g.font = "11px sans-serif"; g.lineWidth = 1;
+  for (const v of niceTicks(x0, x1, 6)) { g.beginPath(); g.moveTo(px(v), T); g.lineTo(px(v), h - B); g.stroke();
+    g.fillText(opts.logx ? "1e" + fmt(v) : fmt(v), px(v) - 12, h - B + 14); }
+  for (const v of niceTicks(y0, y1, 5)) { g.beginPath(); g.moveTo(L, py(v)); g.lineTo(w - R, py(v)); g.stroke();
+    g.fillText(opts.logy ? "1e" + fmt(v) : fmt(v), 4, py(v) + 4); }
+  g.fillText(opts.xlabel || "", w / 2 - 20, h - 6);
+  g.font = "bold 12px sans-serif"; g.fillText(opts.title || "", L, 14); g.font = "11px sans-serif";
+  g.fillText(opts.ylabel || "", L + 4, T + 12);
+  for (const s of series) {
+    g.strokeStyle = g.fillStyle = s.color; g.lineWidth = s.width || 1.5;
+    if (s.points) {
+      for (let i = 0; i < s.x.length; i++) { const x = tx(s.x[i]), y = ty(s.y[i]);
+        if (isFinite(x) && isFinite(y)) g.fillRect(px(x) - 1.5, py(y) - 1.5, 3, 3); }
+    } else {
+      g.beginPath(); let pen = false;
+      for (let i = 0; i < s.x.length; i++) { const x = tx(s.x[i]), y = ty(s.y[i]);
+        if (!isFinite(x) || !isFinite(y)) { pen = false; continue; }
+        if (pen) g.lineTo(px(x), py(y)); else g.moveTo(px(x), py(y)); pen = true; }
+      g.stroke();
+    }
+  }
+}
+
+function drawOverview() {
+  const opts = {logx: document.getElementById("logx").checked, logy: document.getElementById("logy").checked,
+                xlabel: "Zeit (s)", ylabel: "Konzentration (mol/L)"};
+  const series = META.species.map((s, i) => ({x: view(s.time), y: view(s.values), color: COLORS[i % COLORS.length]}))
+                             .filter((_, i) => visible[i]);
+  plot(document.getElementById("overview"), series, opts);
+}
+
+function regression(x, y) {
+  let n = 0, sx = 0, sy = 0, sxx = 0, sxy = 0;
+  for (let i = 0; i < x.length; i++) { if (!isFinite(y[i])) continue;
+    n++; sx += x[i]; sy += y[i]; sxx += x[i] * x[i]; sxy += x[i] * y[i]; }
+  const slope = (n * sxy - sx * sy) / (n * sxx - sx * sx);
+  return [slope, (sy - slope * sx) / n];
+}
+
+function drawReaction(index) {
+  const r = META.reactions[index];
+  if (!r) return;
+  const s = META.species[r.species_index], t = view(s.time), c = view(s.values);
+  const keep = []; for (let i = 0; i < c.length; i++) if (c[i] > 1e-9) keep.push(i);
+  const x = Float64Array.from(keep, i => t[i]);
+  const rows = ORDERS.map(([key, name]) => { const f = r.all_fits[key] || {};
+    return `<tr><td style="text-align:left">${name}${key === r.best_fit_order ? " ✔" : ""}</td><td>${fmt(f.k)} ${f.unit || ""}</td><td>${fix4(f.r_squared)}</td></tr>`; });
+  const regimes = (r.regimes || []).map(g => `<tr><td>${fmt(g.t_start)}–${fmt(g.t_end)} s</td><td style="text-align:left">${g.order}</td><td>${fmt(g.k)} ${g.unit}</td><td>${fix4(g.r_squared)}</td></tr>`);
+  document.getElementById("summary").innerHTML =
+    `<p><b>Analysierter Reaktant:</b> ${r.reactant} – <b>beste Passung:</b> ${r.best_fit_order} (R² = ${fix4(r.r_squared)}), k = ${fmt(r.k)} ${r.k_unit}</p>` +
+    `<table><tr><th>Ordnung</th><th>k</th><th>R²</th></tr>${rows.join("")}</table>` +
+    (regimes.length > 1 ? `<p><b>Abschnitte:</b></p><table><tr><th>Zeit</th><th>Ordnung</th><th>k</th><th>R²</th></tr>${regimes.join("")}</table>` : "");
+  ORDERS.forEach(([key, name, ylabel, f], j) => {
+    const y = Float64Array.from(keep, i => f(c[i]));
+    const [slope, intercept] = regression(x, y);
+    const fit = {x: [x[0], x[x.length - 1]], y: [intercept + slope * x[0], intercept + slope * x[x.length - 1]], color: "#d62728", width: 1};
+    plot(document.getElementById("o" + j), [{x, y, color: "#1f77b4", points: true}, fit],
+         {title: `${name}: ${r.label}`, xlabel: "Zeit (s)", ylabel: ylabel.replace("X", r.reactant)});
+  });
+}
+
+function buildControls() {
+  const list = document.getElementById("species");
+  META.species.forEach((s, i) => {
+    const label = document.createElement("label"); label.style.display = "block"; label.style.color = COLORS[i % COLORS.length];
+    const box = document.createElement("input"); box.type = "checkbox"; box.checked = visible[i];
+    box.onchange = () => { visible[i] = box.checked; drawOverview(); };
+    label.append(box, " " + s.name); list.append(label);
+  });
+  document.getElementById("filter").oninput = e => { const q = e.target.value.toLowerCase();
+    [...list.children].forEach((el, i) => el.style.display = META.species[i].name.toLowerCase().includes(q) ? "block" : "none"); };
+  for (const id of ["logx", "logy"]) document.getElementById(id).onchange = drawOverview;
+  const select = document.getElementById("reaction");
+  META.reactions.forEach((r, i) => select.add(new Option(`${r.label} (${r.reactant})`, i)));
+  select.onchange = () => { drawReaction(+select.value); history.replaceState(null, "", "#" + encodeURIComponent(META.reactions[+select.value].label)); };
+  const wanted = META.reactions.findIndex(r => "#" + encodeURIComponent(r.label) === location.hash);
+  if (wanted >= 0) select.value = wanted;
+  const p = META.parameters;
+  document.getElementById("params").textContent = Object.entries(p).map(([k, v]) => `${k}: ${JSON.stringify(v)}`).join(" · ") +
+    (META.stop_condition ? ` · Abbruch: ${META.stop_condition.label} bei t = ${fmt(META.stop_condition.time)} s` : "");
+  document.getElementById("ratelaw").textContent = META.rate_law_equations;
+  window.onresize = () => { drawOverview(); drawReaction(+select.value); };
+}
+
+loadData().then(data => {
+  DATA = data; buildControls(); drawOverview();
+  if (META.reactions.length) drawReaction(+document.getElementById("reaction").value);
+}).catch(err => { document.getElementById("main").textContent = "Daten konnten nicht geladen werden: " + err; });
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,227 @@
+import json
+import time
+import uuid
+import asyncio
+import hashlib
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from parser import parse_kin_data
+from backend_main import simulate
+from analyzer import analyze_kinetics
+
+HOST = "127.0.0.1"  # Der Dienst ist bewusst nur lokal erreichbar.
+STATUS_TEXT = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 503: "Service Unavailable"}
+
+# Im Worker-Prozess: gemeinsamer Fortschritt {job_id: Anteil} (Manager-Dictionary)
+_PROGRESS = None
+
+def _init_worker(progress):
+    global _PROGRESS
+    _PROGRESS = progress
+
+def execute_job(job_id, mechanism, params):
+    """Läuft im Worker-Prozess: Simulation plus Analyse, ohne Plots."""
+    reaction_system = parse_kin_data(mechanism)
+    sim_time = float(params.get("time", 10.0))
+    last_report = [0.0]
+
+    def report(t):
+        now = time.monotonic()
+        if now - last_report[0] > 0.2:
+            last_report[0] = now
+            _PROGRESS[job_id] = min(t / sim_time, 1.0) if sim_time > 0 else 1.0
+
+    sim_results = simulate(reaction_system, sim_time, float(params.get("temp", 298.15)),
+                           num_points=int(params.get("num_points", 200)), progress_callback=report)
+    return {"simulation": sim_results, "analysis": analyze_kinetics(sim_results, reaction_system)}
+
+class Job:
+    def __init__(self, key, mechanism, params):
+        self.id = uuid.uuid4().hex[:12]
+        self.key, self.mechanism, self.params = key, mechanism, params
+        self.state, self.result, self.error = "queued", None, None
+        self.submitted, self.finished = time.time(), None
+
+    def to_dict(self, progress=None):
+        data = {"job_id": self.id, "state": self.state, "submitted": self.submitted, "finished": self.finished}
+        if self.state == "running":
+            data["progress"] = progress
+        elif self.state == "done":
+            data["progress"] = 1.0
+            data["result"] = self.result
+        elif self.state == "error":
+            data["error"] = self.error
+        return data
+
+class SimulationService:
+    """
+    Lokaler asyncio-HTTP-Dienst mit Jobwarteschlange.
+
+    POST /jobs     {"mechanism": <.kin-Inhalt>, "params": {"time", "temp", "num_points"}}
+    GET  /jobs/ID  Zustand, Fortschritt und (wenn fertig) Ergebnis
+    DELETE /jobs/ID  bricht einen noch wartenden Job ab
+    GET  /health   Warteschlangenlänge und Anzahl Jobs
+
+    Identische Anfragen, die noch warten oder laufen, erhalten dieselbe
+    Job-ID. Warten bereits queue_size Jobs, wird mit 503 und Retry-After
+    geantwortet statt unbegrenzt Jobs anzunehmen; abgebrochene Jobs zählen
+    dabei nicht mehr, auch wenn sie noch in der asyncio.Queue stehen. Stirbt
+    ein Worker-Prozess (z. B. OOM), scheitern die laufenden Jobs und der
+    Prozess-Pool wird neu aufgebaut.
+    """
+    def __init__(self, workers=2, queue_size=64, keep_finished=1000):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.queue = asyncio.Queue()
+        self.queued = 0  # wartende, nicht abgebrochene Jobs
+        self.jobs, self.in_flight = {}, {}
+        self.keep_finished = keep_finished
+        self.manager = multiprocessing.Manager()
+        self.progress = self.manager.dict()
+        self.executor = self._new_executor()
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.progress,))
+
+    @staticmethod
+    def request_key(mechanism, params):
+        return hashlib.sha256(json.dumps([mechanism, params], sort_keys=True).encode('utf-8')).hexdigest()
+
+    def submit(self, mechanism, params):
+        key = self.request_key(mechanism, params)
+        if key in self.in_flight:
+            return self.in_flight[key], False
+        if self.queued >= self.queue_size:
+            raise asyncio.QueueFull()
+        job = Job(key, mechanism, params)
+        self.queue.put_nowait(job)
+        self.queued += 1
+        self.jobs[job.id] = job
+        self.in_flight[key] = job
+        return job, True
+
+    async def worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            try:
+                if job.state != "queued":
+                    continue  # abgebrochen, während er wartete
+                self.queued -= 1
+                job.state = "running"
+                executor = self.executor
+                try:
+                    job.result = await loop.run_in_executor(executor, execute_job, job.id, job.mechanism, job.params)
+                    job.state = "done"
+                except BrokenProcessPool:
+                    job.state, job.error = "error", "Worker-Prozess abgestürzt."
+                    if executor is self.executor:
+                        # Nur einmal pro Absturz neu aufbauen, auch wenn mehrere Jobs daran scheitern
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        self.executor = self._new_executor()
+                except Exception as e:
+                    job.state, job.error = "error", str(e)
+                job.finished = time.time()
+                job.mechanism = None
+                self.progress.pop(job.id, None)
+                self.in_flight.pop(job.key, None)
+                self._evict_finished()
+            finally:
+                self.queue.task_done()
+
+    def _evict_finished(self):
+        finished = [j for j in self.jobs.values() if j.finished is not None]
+        for job in sorted(finished, key=lambda j: j.finished)[:max(0, len(finished) - self.keep_finished)]:
+            del self.jobs[job.id]
+
+    def cancel(self, job):
+        if job.state != "queued":
+            return False
+        job.state, job.error, job.finished = "error", "abgebrochen", time.time()
+        self.queued -= 1
+        self.in_flight.pop(job.key, None)
+        return True
+
+    def route(self, method, path, body):
+        """Liefert (Status, Antwort-Dictionary, zusätzliche Header)."""
+        parts = [p for p in path.split("?")[0].split("/") if p]
+        if parts == ["health"] and method == "GET":
+            return 200, {"queued": self.queued, "capacity": self.queue_size, "jobs": len(self.jobs), "workers": self.workers}, {}
+        if parts == ["jobs"] and method == "POST":
+            try:
+                request = json.loads(body or b"{}")
+                mechanism, params = request["mechanism"], request.get("params", {})
+            except (ValueError, KeyError, TypeError):
+                return 400, {"error": "Erwartet JSON mit 'mechanism' und optional 'params'."}, {}
+            try:
+                job, created = self.submit(mechanism, params)
+            except asyncio.QueueFull:
+                return 503, {"error": "Warteschlange voll."}, {"Retry-After": "1"}
+            return 202, {"job_id": job.id, "state": job.state, "deduplicated": not created}, {}
+        if len(parts) == 2 and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                return 404, {"error": "Unbekannter Job."}, {}
+            if method == "GET":
+                return 200, job.to_dict(self.progress.get(job.id, 0.0) if job.state == "running" else None), {}
+            if method == "DELETE":
+                return 200, {"job_id": job.id, "cancelled": self.cancel(job)}, {}
+            return 405, {"error": "Methode nicht erlaubt."}, {}
+        return 404, {"error": "Unbekannter Pfad."}, {}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+            if len(request_line) < 2:
+                status, payload, extra = 400, {"error": "Ungültige Anfrage."}, {}
+            else:
+                status, payload, extra = self.route(request_line[0].upper(), request_line[1], body)
+            data = json.dumps(payload).encode('utf-8')
+            head = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}", "Content-Type: application/json",
+                    f"Content-Length: {len(data)}", "Connection: close"] + [f"{k}: {v}" for k, v in extra.items()]
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode('latin-1') + data)
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, port):
+        server = await asyncio.start_server(self.handle_connection, HOST, port)
+        workers = [asyncio.create_task(self.worker()) for _ in range(self.workers)]
+        print(json.dumps({"listening": f"http://{HOST}:{server.sockets[0].getsockname()[1]}"}), flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in workers:
+                task.cancel()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.manager.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run AutoKinetics as a local simulation service.")
+    parser.add_argument("--port", type=int, default=8765, help="Port on 127.0.0.1 (0 picks a free port).")
+    parser.add_argument("--workers", type=int, default=2, help="Number of simulation worker processes.")
+    parser.add_argument("--queue_size", type=int, default=64, help="Maximum number of queued jobs before requests are rejected.")
+    args = parser.parse_args()
+
+    async def run():
+        await SimulationService(args.workers, args.queue_size).serve(args.port)
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
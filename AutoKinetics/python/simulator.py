@@ -1,116 +1,1197 @@
 # backend/simulator.py
+import sys
+import json
 import numpy as np
-from scipy.integrate import solve_ivp
-from scipy.optimize import fsolve
-from data_model import ReactionSystem
+from concurrent.futures import ProcessPoolExecutor
+from scipy.integrate import solve_ivp, Radau
+from scipy.optimize import fsolve, brentq
+from scipy.linalg import null_space, qr, eig
+from data_model import ReactionSystem, RateConstantTable
+from codegen import load_compiled, mechanism_hash
+from checkpoint import signature, radau_state, restore_radau
+
+# Bereits gemeldete (Integrator, Grund), aus denen integrator="native"/"blocks"/"multirate" auf SciPy zurückfällt
+_FALLBACKS = set()
+
+def _report_fallback(integrator, reason):
+    """Meldet den Rückfall auf SciPy nur einmal pro Prozess, z. B. bei Monte-Carlo-Läufen."""
+    if (integrator, reason) not in _FALLBACKS:
+        _FALLBACKS.add((integrator, reason))
+        print(f"Integrator '{integrator}' nicht verwendbar ({reason}), verwende SciPy.", file=sys.stderr)
+
+# Punkte pro chunk_callback, wenn solve_stream eine fertige Lösung weitergibt
+_STREAM_CHUNK = 64
+
+# ODESolver eines Worker-Prozesses für integrator="blocks", einmal pro Prozess aufgebaut
+_block_solver = None
+
+def _init_block_worker(system, temperature, temperature_program, codegen, rtol, atol):
+    global _block_solver
+    _block_solver = ODESolver(system, temperature, temperature_program, codegen=codegen, integrator="blocks", rtol=rtol, atol=atol)
+
+def _integrate_block_worker(job):
+    """Integriert einen Block in einem Worker-Prozess (siehe ODESolver._solve_blocks)."""
+    return _block_solver._integrate_block(*job)
+
+class FullSolution:
+    def __init__(self, t, y, temperature=None):
+        self.t, self.y, self.temperature = t, y, temperature
+
+class SteadyStateResult:
+    def __init__(self, y, converged, method, iterations, residual_norm):
+        self.y, self.converged, self.method = y, converged, method
+        self.iterations, self.residual_norm = iterations, residual_norm
+
+class ConservationReduction:
+    """
+    Eliminiert über die Erhaltungsgrößen L @ c = L @ c0 abhängige Spezies.
+    Die abhängigen Spezies werden per QR-Zerlegung mit Spaltenpivotisierung
+    so gewählt, dass L_D gut konditioniert ist; es gilt
+    c_D = L_D^-1 (L @ c0 - L_I @ c_I).
+    """
+    def __init__(self, conservation_laws, initial_concentrations):
+        L = conservation_laws
+        n_laws, n_species = L.shape
+        _, _, pivots = qr(L, pivoting=True, mode='economic')
+        self.dependent = np.sort(pivots[:n_laws])
+        self.independent = np.setdiff1d(np.arange(n_species), self.dependent)
+        L_D_inv = np.linalg.inv(L[:, self.dependent])
+        self.offset = L_D_inv @ (L @ initial_concentrations)
+        self.coupling = -L_D_inv @ L[:, self.independent]
+        self.n_species = n_species
+
+    def expand(self, c_independent):
+        """Vollständige Konzentrationen aus den unabhängigen (1D-Vektor oder Spezies x Zeitpunkte)."""
+        c_independent = np.asarray(c_independent)
+        full = np.zeros((self.n_species,) + c_independent.shape[1:])
+        full[self.independent] = c_independent
+        offset = self.offset if c_independent.ndim == 1 else self.offset[:, None]
+        full[self.dependent] = offset + self.coupling @ c_independent
+        return full
+
+    def reduce_jacobian(self, J):
+        """d(dc_I/dt)/dc_I unter Berücksichtigung der Abhängigkeit c_D(c_I)."""
+        I, D = self.independent, self.dependent
+        return J[np.ix_(I, I)] + J[np.ix_(I, D)] @ self.coupling
 
 class ODESolver:
-    def __init__(self, system: ReactionSystem, temperature):
+    # Standardtoleranzen (wie solve_ivp), wenn weder Argumente noch solver_settings der .kin-Datei etwas vorgeben
+    DEFAULT_RTOL, DEFAULT_ATOL = 1e-3, 1e-6
+    # Startwert für Konzentrationen 0 bei Integration in ln c (log_space)
+    LOG_FLOOR = 1e-30
+    # Mindestverhältnis der Zeitskalen, ab dem integrator="multirate" schnelle Moden abtrennt
+    MULTIRATE_GAP = 100.0
+    # Mindestzahl langsamer Spezies für integrator="multirate": darunter ist gekoppeltes Radau schneller
+    # (gemessen: schnelles Gleichgewicht + langsame Kette, Gleichstand bei etwa 1000 Spezies)
+    MULTIRATE_MIN_SLOW = 1000
+
+    def __init__(self, system: ReactionSystem, temperature, temperature_program=None, energy_balance=None, k_table_points=512, reduce_conservation=True, codegen="python", log_space=False, integrator="scipy", rtol=None, atol=None, workers=None):
         self.system = system
+        self.log_space = log_space
+        self.integrator = integrator
+        self.workers = workers
+        self.codegen = codegen
         self.temperature = temperature
-        
-        self.qssa_indices = [i for i, s in enumerate(self.system.species) if getattr(s, 'is_intermediate', False)]
+        self.temperature_program = temperature_program
+        self.energy_balance = energy_balance
+        if temperature_program is not None and energy_balance is not None:
+            raise ValueError("Temperaturprogramm und Energiebilanz schließen sich gegenseitig aus.")
+
+        intermediates = [i for i, s in enumerate(self.system.species) if getattr(s, 'is_intermediate', False)]
+        # Für integrator="multirate" sind markierte Zwischenprodukte schnelle Spezies statt QSSA-Spezies.
+        self.qssa_indices = intermediates if integrator != "multirate" else []
+        self.fast_tags = intermediates if integrator == "multirate" else []
         self.normal_indices = [i for i in range(len(self.system.species)) if i not in self.qssa_indices]
+        if self.energy_balance is not None and self.qssa_indices:
+            raise ValueError("Die Energiebilanz wird zusammen mit QSSA-Zwischenprodukten nicht unterstützt.")
+
+        self.stoichiometry = self.system.get_stoichiometry_matrix()
+        # Auf den Mechanismus spezialisierte Raten/Jacobi-Funktionen (codegen.py), sonst die generische Auswertung.
+        self.compiled = load_compiled(self.system, codegen) if codegen and self.system.reactions else None
+        # Mit Erhaltungsgrößen werden nur die unabhängigen Spezies integriert (nicht zusammen mit QSSA).
+        # Im logarithmischen Zustand sind die Erhaltungsgrößen nicht mehr linear, dann ohne Reduktion;
+        # der native Integrator löst das volle System mit dünnbesetzter LU-Zerlegung, "blocks"/"multirate" zerlegen es selbst.
+        self.reduction = None
+        if reduce_conservation and not log_space and integrator not in ("native", "blocks", "multirate") and not self.qssa_indices and self.system.reactions:
+            L = self.system.get_conservation_laws()
+            if 0 < L.shape[0] < len(self.system.species):
+                self.reduction = ConservationReduction(L, self.system.get_initial_concentrations())
+        self.rtol, self.atol = self._tolerances(rtol, atol)
+        self._k_cache = (None, None)
+        self.k_table = None
+        self._table_left = False
+        if self.is_nonisothermal:
+            self.reaction_enthalpies = self.system.get_reaction_enthalpies()
+            if self.energy_balance is not None and self.energy_balance.ambient_temperature is None:
+                self.energy_balance.ambient_temperature = self.temperature
+            self.k_table = RateConstantTable(self.system.reactions, *self._table_range(), num_points=k_table_points)
 
-    def _calculate_rates(self, concentrations):
-        """Berechnet die Geschwindigkeiten aller Reaktionen für einen gegebenen Konzentrationsvektor."""
-        rates = []
-        for reaction in self.system.reactions:
-            k = reaction.calculate_k(self.temperature)
-            rate = k
+    def _tolerances(self, rtol, atol):
+        """
+        rtol und atol (Skalar, Array je Spezies oder {Spezies: Wert}); was
+        nicht angegeben ist, kommt aus system.solver_settings (kalibriert,
+        siehe tolerances.py) oder den Standardwerten.
+        """
+        settings = getattr(self.system, 'solver_settings', None) or {}
+        rtol = float(settings.get("rtol", self.DEFAULT_RTOL) if rtol is None else rtol)
+        atol = settings.get("atol", self.DEFAULT_ATOL) if atol is None else atol
+        if isinstance(atol, dict):
+            atol = np.array([float(atol.get(s.name, self.DEFAULT_ATOL)) for s in self.system.species])
+        elif np.ndim(atol):
+            atol = np.asarray(atol, dtype=float)
+        else:
+            atol = float(atol)
+        return rtol, atol
+
+    def _state_atol(self):
+        """atol für den Integrationszustand (unabhängige bzw. Nicht-QSSA-Spezies, ggf. Temperatur)."""
+        if self.log_space:
+            # In ln c ist jeder Fehler relativ; atol in mol/L hat dort keine Bedeutung, für alle Spezies gilt rtol.
+            atol = np.full(len(self.normal_indices) if self.qssa_indices else len(self.system.species), self.rtol)
+            temperature_atol = self.atol if np.ndim(self.atol) == 0 else self.DEFAULT_ATOL
+            return np.append(atol, temperature_atol) if self.energy_balance is not None else atol
+        if np.ndim(self.atol) == 0:
+            return self.atol
+        if self.qssa_indices:
+            return self.atol[self.normal_indices]
+        atol = self.atol if self.reduction is None else self.atol[self.reduction.independent]
+        return np.append(atol, self.DEFAULT_ATOL) if self.energy_balance is not None else atol
+
+    @property
+    def is_nonisothermal(self):
+        return self.temperature_program is not None or self.energy_balance is not None
+
+    def _table_range(self):
+        """Temperaturbereich der k(T)-Tabelle: Start- und Programmtemperaturen bzw. Schätzung der Energiebilanz."""
+        bounds = [self.temperature]
+        if self.temperature_program is not None:
+            bounds.extend(self.temperature_program.temperature_range())
+        else:
+            dT = self.energy_balance.max_temperature_change(self.reaction_enthalpies, self.system.get_initial_concentrations())
+            bounds.extend([self.temperature - dT, self.temperature + dT, self.energy_balance.ambient_temperature])
+        T_min, T_max = max(min(bounds), 1.0), max(bounds)
+        if T_max - T_min < 1.0:
+            T_max = T_min + 1.0
+        return T_min, T_max
+
+    def _temperature_at(self, t):
+        if self.temperature_program is not None:
+            return self.temperature_program(t)
+        return self.temperature
+
+    def reset_rate_constants(self):
+        """Verwirft zwischengespeicherte k-Werte, z. B. nach Änderung der Arrhenius-Parameter."""
+        self._k_cache = (None, None)
+
+    def _note_table_range(self, temperatures):
+        """
+        Meldet einmalig, dass der ausgegebene Temperaturverlauf die
+        k(T)-Tabelle verlässt (k wird dort direkt berechnet). Probe-
+        temperaturen des Integrators zählen nicht, nur die Lösung.
+        """
+        outside = [T for T in (np.min(temperatures), np.max(temperatures)) if not self.k_table.covers(T)]
+        if outside and not self._table_left:
+            self._table_left = True
+            print(f"Temperatur {outside[0]:.1f} K außerhalb der k(T)-Tabelle [{self.k_table.T_min:.1f}, {self.k_table.T_max:.1f}] K, "
+                  "k wird dort direkt berechnet.", file=sys.stderr)
+
+    def _rate_constants(self, T):
+        if self.k_table is not None:
+            return self.k_table(T)
+        if self._k_cache[0] != T:
+            self._k_cache = (T, np.array([reaction.calculate_k(T) for reaction in self.system.reactions], dtype=float))
+        return self._k_cache[1]
+
+    def _calculate_rates(self, concentrations, T=None, reactions=None):
+        """
+        Berechnet die Geschwindigkeiten aller Reaktionen (bzw. nur der
+        Reaktionen mit den Indizes reactions) für einen Konzentrationsvektor.
+        """
+        k = self._rate_constants(self.temperature if T is None else T)
+        if reactions is None:
+            if self.compiled is not None:
+                return self.compiled.rates(concentrations, k)
+            reactions = range(len(self.system.reactions))
+        rates = k[list(reactions)]
+        for n, r_idx in enumerate(reactions):
+            reaction = self.system.reactions[r_idx]
             for reactant_idx, _ in reaction.reactants:
                 conc = concentrations[reactant_idx] if concentrations[reactant_idx] > 0 else 0
                 order = reaction.reaction_order.get(reactant_idx, 1.0)
-                rate *= conc ** order
-            rates.append(rate)
-        return np.array(rates)
+                rates[n] *= conc ** order
+        return rates
 
-    def model_standard(self, t, y):
-        dydt = np.zeros_like(y)
-        rates = self._calculate_rates(y)
-        
+    def reaction_rates(self, concentrations, temperatures=None):
+        """
+        Reaktionsgeschwindigkeiten für viele Zustände in einem Durchgang:
+        concentrations (Spezies x Zeitpunkte), temperatures optional je
+        Zeitpunkt. Gleiche k(T)-Auswertung und Ordnungen wie
+        _calculate_rates; Rückgabe (Reaktionen x Zeitpunkte).
+        """
+        concentrations = np.maximum(np.asarray(concentrations, dtype=float), 0.0)
+        n_points = concentrations.shape[1]
+        if temperatures is None:
+            k = np.repeat(self._rate_constants(self.temperature)[:, None], n_points, axis=1)
+        elif self.k_table is not None:
+            k = self.k_table.evaluate(temperatures)
+        else:
+            k = np.array([self._rate_constants(T) for T in temperatures]).T
+        rates = np.array(k, dtype=float).reshape(len(self.system.reactions), n_points)
         for r_idx, reaction in enumerate(self.system.reactions):
-            rate = rates[r_idx]
-            for reactant_idx, stoich in reaction.reactants:
-                dydt[reactant_idx] -= stoich * rate
-            for product_idx, stoich in reaction.products:
-                dydt[product_idx] += stoich * rate
+            for reactant_idx, _ in reaction.reactants:
+                order = reaction.reaction_order.get(reactant_idx, 1.0)
+                rates[r_idx] *= concentrations[reactant_idx] if order == 1.0 else concentrations[reactant_idx] ** order
+        return rates
+
+    def _rate_derivatives(self, concentrations, T=None, reactions=None):
+        """
+        Liefert die Reaktionsgeschwindigkeiten und ihre analytischen Ableitungen
+        dr_j/dc_i (Reaktionen x Spezies), für alle oder nur die Reaktionen reactions.
+        """
+        k = self._rate_constants(self.temperature if T is None else T)
+        if reactions is None:
+            reactions = range(len(self.system.reactions))
+        rates = np.zeros(len(reactions))
+        drdc = np.zeros((len(reactions), len(self.system.species)))
+        for n, j in enumerate(reactions):
+            reaction = self.system.reactions[j]
+            factors = []
+            for reactant_idx, _ in reaction.reactants:
+                conc = concentrations[reactant_idx] if concentrations[reactant_idx] > 0 else 0
+                factors.append((reactant_idx, conc, reaction.reaction_order.get(reactant_idx, 1.0)))
+            powers = [conc ** order for _, conc, order in factors]
+            rates[n] = k[j] * np.prod(powers)
+            for m, (reactant_idx, conc, order) in enumerate(factors):
+                # Wie in _calculate_rates gilt c <= 0 als 0 (konstant), die Ableitung dort ist also 0.
+                if conc > 0:
+                    others = k[j] * np.prod(powers[:m] + powers[m + 1:])
+                    drdc[n, reactant_idx] += others if order == 1.0 else others * order * conc ** (order - 1.0)
+        return rates, drdc
+
+    def jacobian(self, concentrations, T=None):
+        """Analytische Jacobi-Matrix d(dc/dt)/dc des Standardmodells."""
+        if self.compiled is not None:
+            return self.compiled.jacobian(concentrations, self._rate_constants(self.temperature if T is None else T))
+        _, drdc = self._rate_derivatives(concentrations, T)
+        return self.stoichiometry @ drdc
+
+    def _jacobian_standard(self, t, y):
+        return self.jacobian(y, self._temperature_at(t))
+
+    def _expand_state(self, y):
+        """Reduzierter Integrationszustand -> vollständiger Zustand des Standardmodells."""
+        if self.energy_balance is not None:
+            return np.concatenate([self.reduction.expand(y[:-1]), y[-1:]])
+        return self.reduction.expand(y)
+
+    def model_reduced(self, t, y):
+        return self.model_standard(t, self._expand_state(y))[self._state_indices]
+
+    def _jacobian_reduced(self, t, y):
+        return self.reduction.reduce_jacobian(self.jacobian(self.reduction.expand(y), self._temperature_at(t)))
+
+    def _standard_problem(self):
+        """(rhs, y0, jac) für die Integration ohne QSSA, mit Temperatur als letzter Zustandsgröße bei Energiebilanz."""
+        y0 = self.system.get_initial_concentrations()
+        if self.reduction is not None:
+            y0 = y0[self.reduction.independent]
+            self._state_indices = self.reduction.independent
+            if self.energy_balance is not None:
+                self._state_indices = np.append(self._state_indices, len(self.system.species))
+        if self.energy_balance is not None:
+            y0 = np.append(y0, self.temperature)
+        if self.reduction is not None:
+            return self.model_reduced, y0, (self._jacobian_reduced if self.energy_balance is None else None)
+        return self.model_standard, y0, (self._jacobian_standard if self.energy_balance is None else None)
+
+    def _integration_problem(self):
+        """(rhs, y0, jac) des Integrationszustands: Standardmodell oder QSSA, bei log_space in u = ln c."""
+        if self.qssa_indices:
+            problem = self.model_qssa, self.system.get_initial_concentrations()[self.normal_indices], None
+        else:
+            problem = self._standard_problem()
+        return self._log_problem(*problem) if self.log_space else problem
+
+    def _log_problem(self, fun, y0, jac):
+        """
+        Integration in u = ln c statt c: du/dt = (dc/dt) / c, die Temperatur
+        (Energiebilanz) bleibt linear. Konzentrationen bleiben so streng
+        positiv, und der Fehler wird relativ zu jeder Konzentration
+        kontrolliert, auch bei 1e-20 mol/L. Anfangskonzentrationen 0 starten
+        bei LOG_FLOOR.
+
+        Für das Standardmodell wird jeder Beitrag r_j / c_i direkt als
+        k_j exp(sum_m o_jm u_m - u_i) berechnet, also ohne durch ein
+        unterlaufenes c = exp(u) = 0 zu teilen; die Jacobi-Matrix folgt
+        daraus als J_u[i, m] = sum_j N_ij (r_j / c_i) (o_jm - δ_im). Andere
+        Modelle (QSSA) teilen durch c, mindestens durch die kleinste
+        normalisierte Gleitkommazahl.
+        """
+        n = len(y0) - (1 if self.energy_balance is not None else 0)
+        u0 = np.array(y0, dtype=float)
+        u0[:n] = np.log(np.maximum(u0[:n], self.LOG_FLOOR))
+        if fun != self.model_standard:
+            def rhs(t, u):
+                y = self._linear_state(u)
+                dydt = fun(t, y)
+                dydt[:n] /= np.maximum(y[:n], np.finfo(float).tiny)
+                return dydt
+            return rhs, u0, None
+
+        orders = self.system.get_reactant_order_matrix()
+        species, reactions = np.nonzero(self.stoichiometry)
+        coefficients = self.stoichiometry[species, reactions]
+
+        def contributions(t, u):
+            """ln r_j und die Beiträge N_ij r_j / c_i an den Besetzungsstellen von N."""
+            T = u[-1] if self.energy_balance is not None else self._temperature_at(t)
+            with np.errstate(divide='ignore'):
+                ln_rates = np.log(self._rate_constants(T)) + orders @ u[:n]
+            return T, ln_rates, coefficients * np.exp(ln_rates[reactions] - u[species])
+
+        def rhs(t, u):
+            T, ln_rates, terms = contributions(t, u)
+            dudt = np.zeros(len(u))
+            dudt[:n] = np.bincount(species, weights=terms, minlength=n)
+            if self.energy_balance is not None:
+                dudt[-1] = self.energy_balance.dTdt(T, np.exp(ln_rates), self.reaction_enthalpies)
+            return dudt
+
+        def log_jacobian(t, u):
+            _, _, terms = contributions(t, u)
+            W = np.zeros((n, len(self.system.reactions)))
+            np.add.at(W, (species, reactions), terms)
+            J = W @ orders
+            J[np.arange(n), np.arange(n)] -= W.sum(axis=1)
+            return J
+
+        return rhs, u0, (log_jacobian if jac is not None else None)
+
+    def _linear_state(self, u):
+        """Integrationszustand -> Zustand in Konzentrationen (1D-Vektor oder Zustände x Zeitpunkte)."""
+        if not self.log_space:
+            return u
+        y = np.array(u, dtype=float)
+        n = len(y) - (1 if self.energy_balance is not None else 0)
+        y[:n] = np.exp(y[:n])
+        return y
+
+    def model_standard(self, t, y):
+        if self.energy_balance is not None:
+            concentrations, T = y[:-1], y[-1]
+        else:
+            concentrations, T = y, self._temperature_at(t)
+
+        rates = self._calculate_rates(concentrations, T)
+        dydt = self._species_rates(rates)
+        if self.energy_balance is not None:
+            dTdt = self.energy_balance.dTdt(T, rates, self.reaction_enthalpies)
+            return np.append(dydt, dTdt)
         return dydt
 
-    def _qssa_equations(self, qssa_concs, normal_concs_array):
+    def state_temperature(self, t, y):
+        """Temperatur zum Zeitpunkt t (bei Energiebilanz aus dem Zustandsvektor)."""
+        if self.energy_balance is not None and y is not None:
+            return y[-1]
+        return self._temperature_at(t)
+
+    def full_concentrations(self, t, y):
+        """Rekonstruiert aus dem Integrationszustand den vollständigen Konzentrationsvektor."""
+        y = self._linear_state(y)
+        if self.energy_balance is not None:
+            y = y[:-1]
+        if self.reduction is not None:
+            return self.reduction.expand(y)
+        if self.energy_balance is not None or not self.qssa_indices:
+            return y
+        qssa_concs, converged = self._solve_qssa(np.full(len(self.qssa_indices), 1e-9), y, self._temperature_at(t))
+        if not converged:
+            qssa_concs.fill(1e-12)
+        concentrations = np.zeros(len(self.system.species))
+        concentrations[self.normal_indices] = y
+        concentrations[self.qssa_indices] = np.maximum(qssa_concs, 0)
+        return concentrations
+
+    def _species_rates(self, rates):
+        if self.compiled is not None:
+            return self.compiled.species_rates(rates)
+        return self.stoichiometry @ rates
+
+    def concentration_rates(self, concentrations, T=None):
+        """dc/dt für einen vollständigen Konzentrationsvektor."""
+        return self._species_rates(self._calculate_rates(concentrations, T))
+
+    def _qssa_equations(self, qssa_concs, normal_concs_array, T=None):
         full_concs = np.zeros(len(self.system.species))
         full_concs[self.normal_indices] = normal_concs_array
         full_concs[self.qssa_indices] = qssa_concs
-        
-        rates = self._calculate_rates(full_concs)
-        d_qssa_dt = np.zeros_like(qssa_concs)
-
-        for i, qssa_idx in enumerate(self.qssa_indices):
-            net_rate = 0
-            for r_idx, reaction in enumerate(self.system.reactions):
-                for product_idx, stoich in reaction.products:
-                    if product_idx == qssa_idx:
-                        net_rate += stoich * rates[r_idx]
-                for reactant_idx, stoich in reaction.reactants:
-                    if reactant_idx == qssa_idx:
-                        net_rate -= stoich * rates[r_idx]
-            d_qssa_dt[i] = net_rate
-        return d_qssa_dt
+
+        rates = self._calculate_rates(full_concs, T)
+        return self.stoichiometry[self.qssa_indices] @ rates
+
+    def _solve_qssa(self, initial_guess, normal_concs_array, T=None):
+        """
+        Löst die QSSA-Bedingungen; Rückgabe (Konzentrationen, konvergiert).
+        Bei log_space wird in ln c gelöst und die Bilanz durch c geteilt
+        (wie du/dt), sodass die Lösung streng positiv und gut skaliert ist.
+        """
+        if not self.log_space:
+            qssa_concs, _, ier, _ = fsolve(self._qssa_equations, initial_guess, args=(normal_concs_array, T), full_output=True)
+            return qssa_concs, ier == 1
+        def residual(v):
+            qssa_concs = np.exp(v)
+            return self._qssa_equations(qssa_concs, normal_concs_array, T) / qssa_concs
+        v, _, ier, _ = fsolve(residual, np.log(np.maximum(initial_guess, self.LOG_FLOOR)), full_output=True)
+        return np.exp(v), ier == 1
 
     def model_qssa(self, t, y_normal):
+        T = self._temperature_at(t)
         initial_guess = np.full(len(self.qssa_indices), 1e-9)
         # Robusterer Aufruf, der prüft, ob eine Lösung gefunden wurde
-        qssa_concs, _, ier, _ = fsolve(self._qssa_equations, initial_guess, args=(y_normal,), full_output=True)
-        if ier != 1:
+        qssa_concs, converged = self._solve_qssa(initial_guess, y_normal, T)
+        if not converged:
             qssa_concs.fill(1e-12) # Fallback, falls Löser versagt
         qssa_concs[qssa_concs < 0] = 0
 
         concentrations = np.zeros(len(self.system.species))
         concentrations[self.normal_indices] = y_normal
         concentrations[self.qssa_indices] = qssa_concs
-        
-        rates = self._calculate_rates(concentrations)
-        dydt_full = np.zeros_like(concentrations)
-        for r_idx, reaction in enumerate(self.system.reactions):
-            rate = rates[r_idx]
-            for reactant_idx, stoich in reaction.reactants:
-                dydt_full[reactant_idx] -= stoich * rate
-            for product_idx, stoich in reaction.products:
-                dydt_full[product_idx] += stoich * rate
-        
+
+        rates = self._calculate_rates(concentrations, T)
+        dydt_full = self.stoichiometry @ rates
         return dydt_full[self.normal_indices]
 
-    def solve(self, t_span, t_eval):
+    def _temperature_profile(self, t, y):
+        if self.energy_balance is not None:
+            return y[-1]
+        return np.array([self._temperature_at(t_i) for t_i in t])
+
+    def range_warnings(self, temperatures):
+        """Liefert die Reaktionen, deren Gültigkeitsbereich während der Simulation verlassen wurde."""
+        if self.k_table is None:
+            return []
+        if len(temperatures):
+            self._note_table_range(temperatures)
+        return self.k_table.out_of_range(temperatures)
+
+    def _stop_report(self, solution, stop_conditions):
+        """Hängt an die Lösung, welche Abbruchbedingung ausgelöst hat (stop_condition)."""
+        solution.stop_condition = None
+        if getattr(solution, 'status', 0) != 1:
+            return
+        for condition, t_events, y_events in zip(stop_conditions, solution.t_events, solution.y_events):
+            if len(t_events):
+                y_stop = self.full_concentrations(t_events[0], y_events[0])
+                solution.stop_condition = {"label": condition.label, "time": float(t_events[0]), "concentrations": np.asarray(y_stop).tolist()}
+                return
+
+    @staticmethod
+    def _with_progress(fun, progress_callback):
+        """Meldet bei jeder RHS-Auswertung den bisher größten Zeitpunkt t an progress_callback."""
+        if progress_callback is None:
+            return fun
+        latest = [-np.inf]
+        def wrapped(t, y):
+            if t > latest[0]:
+                latest[0] = t
+                progress_callback(t)
+            return fun(t, y)
+        return wrapped
+
+    def solve(self, t_span, t_eval, stop_conditions=None, progress_callback=None):
+        """
+        Integriert das System über t_span. Optionale stop_conditions (siehe
+        events.py) beenden die Integration vorzeitig; welche ausgelöst hat,
+        steht in solution.stop_condition. progress_callback(t) wird mit dem
+        Fortschritt der Integration aufgerufen. Mit integrator="native" läuft
+        die ganze Integration in C++ (siehe _solve_native), mit "blocks"
+        getrennt nach entkoppelten Teilnetzen (siehe _solve_blocks), mit
+        "multirate" getrennt nach Zeitskalen (siehe _solve_multirate).
+        """
+        stop_conditions = list(stop_conditions or [])
+        solve_special = {"native": self._solve_native, "blocks": self._solve_blocks,
+                         "multirate": self._solve_multirate}.get(self.integrator)
+        if solve_special is not None:
+            solution = solve_special(t_span, t_eval, stop_conditions, progress_callback)
+            if solution is not None:
+                return solution
+        events = [condition.make_event(self) for condition in stop_conditions] or None
+        fun, y0, jac = self._integration_problem()
         if not self.qssa_indices:
-            y0 = self.system.get_initial_concentrations()
             solution = solve_ivp(
-                fun=self.model_standard, t_span=t_span, y0=y0, t_eval=t_eval, method='Radau'
+                fun=self._with_progress(fun, progress_callback), t_span=t_span, y0=y0, t_eval=t_eval, method='Radau', jac=jac, events=events,
+                rtol=self.rtol, atol=self._state_atol()
             )
+            self._stop_report(solution, stop_conditions)
+            solution.y, solution.temperature = self._split_state(solution.t, self._linear_state(solution.y))
             return solution
         else:
-            y0_full = self.system.get_initial_concentrations()
-            y0_normal = y0_full[self.normal_indices]
-            
             solution_normal = solve_ivp(
-                fun=self.model_qssa, t_span=t_span, y0=y0_normal, t_eval=t_eval, method='Radau'
+                fun=self._with_progress(fun, progress_callback), t_span=t_span, y0=y0, t_eval=t_eval, method='Radau', events=events,
+                rtol=self.rtol, atol=self._state_atol()
             )
-            
-            y_full = np.zeros((len(self.system.species), len(solution_normal.t)))
-            y_full[self.normal_indices, :] = solution_normal.y
-            
+
+            y_full, _ = self._reconstruct_qssa(solution_normal.t, self._linear_state(solution_normal.y))
+
+            temperature = self._temperature_profile(solution_normal.t, y_full) if self.is_nonisothermal else None
+            full_solution = FullSolution(solution_normal.t, y_full, temperature)
+            full_solution.status, full_solution.t_events, full_solution.y_events = solution_normal.status, solution_normal.t_events, solution_normal.y_events
+            self._stop_report(full_solution, stop_conditions)
+            return full_solution
+
+    def native_mechanism(self):
+        """Mechanismus in der CSR-Form von autokinetics_binding.integrate: je Reaktion Edukte mit Ordnung und Stöchiometrie."""
+        reactant_ptr, reactant_species, reactant_orders = [0], [], []
+        stoich_ptr, stoich_species, stoich_coeffs = [0], [], []
+        for j, reaction in enumerate(self.system.reactions):
+            for reactant_idx, _ in reaction.reactants:
+                reactant_species.append(reactant_idx)
+                reactant_orders.append(reaction.reaction_order.get(reactant_idx, 1.0))
+            reactant_ptr.append(len(reactant_species))
+            for i in np.flatnonzero(self.stoichiometry[:, j]):
+                stoich_species.append(int(i))
+                stoich_coeffs.append(float(self.stoichiometry[i, j]))
+            stoich_ptr.append(len(stoich_species))
+        return reactant_ptr, reactant_species, reactant_orders, stoich_ptr, stoich_species, stoich_coeffs
+
+    def _solve_native(self, t_span, t_eval, stop_conditions, progress_callback):
+        """
+        Integration vollständig in C++ (autokinetics_binding, RODAS3 mit
+        dünnbesetzter LU-Zerlegung und dichter Ausgabe), ohne Python-Aufrufe
+        pro Schritt. Abgedeckt ist das isotherme Standardmodell; sonst None,
+        und solve fällt auf SciPy zurück.
+        """
+        reason = ("QSSA-Zwischenprodukte" if self.qssa_indices else "nicht-isotherme Simulation" if self.is_nonisothermal
+                  else "log_space" if self.log_space else "Abbruchbedingungen" if stop_conditions else None)
+        if reason is None:
+            try:
+                import autokinetics_binding
+            except ImportError:
+                reason = "autokinetics_binding nicht übersetzt"
+        if reason is not None:
+            _report_fallback(self.integrator, reason)
+            return None
+        t_eval = np.asarray(t_span if t_eval is None else t_eval, dtype=float)
+        y, status, message, stats = autokinetics_binding.integrate(
+            self.native_mechanism(), self._rate_constants(self.temperature), self.system.get_initial_concentrations(),
+            t_span[0], t_eval, t_span[1], self.rtol, self.atol)
+        solution = FullSolution(t_eval[:y.shape[1]], y)
+        solution.status, solution.message, solution.stats = (0 if status == 0 else -1), message, stats
+        solution.stop_condition = None
+        if progress_callback is not None and len(solution.t):
+            progress_callback(solution.t[-1])
+        return solution
+
+    def _block_dependencies(self, blocks):
+        """Je Block: Reaktionen, die seine Spezies verändern, und die anderen Blöcke, von deren Spezies diese abhängen."""
+        block_of = np.empty(len(self.system.species), dtype=int)
+        for b, block in enumerate(blocks):
+            block_of[block] = b
+        reactions = [np.flatnonzero(np.any(self.stoichiometry[block] != 0, axis=0)) for block in blocks]
+        upstream = [sorted({int(block_of[i]) for j in reactions[b] for i, _ in self.system.reactions[j].reactants} - {b})
+                    for b in range(len(blocks))]
+        return reactions, upstream
+
+    def block_plan(self):
+        """
+        Zerlegung für integrator="blocks": die starken Zusammenhangskomponenten
+        des Mechanismus (ReactionSystem.get_species_blocks), wobei reine
+        Ketten (einziger Vorgänger mit einzigem Nachfolger) zu einem Block
+        zusammengefasst werden, da das Interpolieren jedes Glieds mehr kostet
+        als es spart. Je Block: Spezies, Reaktionen, die sie verändern,
+        vorgelagerte Blöcke und Stufe (Blöcke einer Stufe sind unabhängig).
+        """
+        components = self.system.get_species_blocks()
+        _, upstream = self._block_dependencies(components)
+        consumers = np.zeros(len(components), dtype=int)
+        for ups in upstream:
+            consumers[ups] += 1
+        group = list(range(len(components)))
+        for b, ups in enumerate(upstream):
+            if len(ups) == 1 and consumers[ups[0]] == 1:
+                group[b] = group[ups[0]]
+        # Die Reihenfolge nach dem ersten Glied jeder Gruppe bleibt topologisch.
+        heads = sorted(set(group))
+        blocks = [sorted(i for b, component in enumerate(components) if group[b] == head for i in component) for head in heads]
+        reactions, upstream = self._block_dependencies(blocks)
+        plan = []
+        for b, block in enumerate(blocks):
+            level = 1 + max((plan[u]["level"] for u in upstream[b]), default=-1)
+            plan.append({"species": block, "reactions": reactions[b], "upstream": upstream[b], "level": level})
+        return plan
+
+    def _subsystem(self, species, reactions, concentrations):
+        """
+        (rhs, jac) für die Konzentrationen der Spezies species, die nur die
+        Reaktionen reactions verändern; concentrations(t, y) ergänzt y zum
+        vollständigen Konzentrationsvektor (übrige Spezies als Eingänge).
+        """
+        S = self.stoichiometry[np.ix_(species, reactions)]
+        def rhs(t, y):
+            c, T = concentrations(t, y), self._temperature_at(t)
+            if self.compiled is not None:  # der spezialisierte Code rechnet alle Reaktionen schneller als die Schleife wenige
+                return S @ self.compiled.rates(c, self._rate_constants(T))[reactions]
+            return S @ self._calculate_rates(c, T, reactions)
+        def jac(t, y):
+            c, T = concentrations(t, y), self._temperature_at(t)
+            if self.compiled is not None:
+                return self.jacobian(c, T)[np.ix_(species, species)]
+            _, drdc = self._rate_derivatives(c, T, reactions)
+            return S @ drdc[:, species]
+        return rhs, jac
+
+    def _integrate_block(self, block, reactions, inputs, t_span):
+        """
+        Integriert die Spezies block über t_span; die Konzentrationen der
+        vorgelagerten Blöcke kommen aus deren dichter Ausgabe (inputs: Liste
+        aus (Spezies, OdeSolution oder None für konstant)). Rückgabe
+        (OdeSolution oder None, Status, erreichtes t, Meldung, RHS-, Jacobi-Auswertungen).
+        """
+        if len(reactions) == 0:
+            return None, 0, t_span[1], "", 0, 0  # nichts verändert den Block, er bleibt konstant
+        base = self.system.get_initial_concentrations().astype(float)
+        def concentrations(t, y):
+            c = base.copy()
+            for species, sol in inputs:
+                if sol is not None:
+                    c[species] = sol(t)
+            c[block] = y
+            return c
+        rhs, jac = self._subsystem(block, reactions, concentrations)
+        atol = self.atol if np.ndim(self.atol) == 0 else self.atol[block]
+        result = solve_ivp(rhs, t_span, base[block], method='Radau', jac=jac, dense_output=True, rtol=self.rtol, atol=atol)
+        return result.sol, result.status, float(result.t[-1]), result.message, result.nfev, result.njev
+
+    def _solve_blocks(self, t_span, t_eval, stop_conditions, progress_callback):
+        """
+        Block-Dreieckszerlegung: Teilnetze, die nicht aufeinander
+        zurückwirken, werden in topologischer Reihenfolge einzeln integriert,
+        jedes mit der eigenen Schrittweite; vorgelagerte Verläufe gehen über
+        ihre dichte Ausgabe interpoliert ein. Blöcke einer Stufe sind
+        unabhängig und laufen bei workers > 1 parallel in Prozessen.
+        Abgedeckt ist das Modell ohne QSSA und Energiebilanz; sonst (oder
+        wenn alles ein Block ist) None, und solve fällt auf SciPy zurück.
+        """
+        reason = ("QSSA-Zwischenprodukte" if self.qssa_indices else "Energiebilanz" if self.energy_balance is not None
+                  else "log_space" if self.log_space else "Abbruchbedingungen" if stop_conditions else None)
+        plan = self.block_plan() if reason is None else None
+        if plan is not None and len(plan) < 2:
+            reason = "nur ein gekoppelter Block"
+        if reason is not None:
+            _report_fallback(self.integrator, reason)
+            return None
+        solutions, t_end, status, message = [None] * len(plan), t_span[1], 0, ""
+        n_levels = max(entry["level"] for entry in plan) + 1
+        widest = max(sum(entry["level"] == level for entry in plan) for level in range(n_levels))
+        pool = None
+        if self.workers and self.workers > 1 and widest > 1:
+            pool = ProcessPoolExecutor(max_workers=min(self.workers, widest), initializer=_init_block_worker,
+                                       initargs=(self.system, self.temperature, self.temperature_program, self.codegen, self.rtol, self.atol))
+        stats = {"blocks": len(plan), "levels": n_levels, "largest_block": max(len(entry["species"]) for entry in plan),
+                 "parallel": pool is not None, "function_evaluations": 0, "jacobian_evaluations": 0}
+        finished = 0
+        try:
+            for level in range(n_levels):
+                members = [b for b, entry in enumerate(plan) if entry["level"] == level]
+                jobs = [(plan[b]["species"], plan[b]["reactions"], [(plan[u]["species"], solutions[u]) for u in plan[b]["upstream"]],
+                         (t_span[0], t_end)) for b in members]
+                if pool is not None and len(jobs) > 1:
+                    results = list(pool.map(_integrate_block_worker, jobs))
+                else:
+                    results = [self._integrate_block(*job) for job in jobs]
+                for b, (sol, block_status, t_reached, block_message, nfev, njev) in zip(members, results):
+                    solutions[b] = sol
+                    stats["function_evaluations"] += nfev
+                    stats["jacobian_evaluations"] += njev
+                    if block_status < 0:
+                        # Nachgelagerte Blöcke nur noch so weit, wie ihre Eingänge bekannt sind
+                        t_end, status = min(t_end, t_reached), -1
+                        message = f"Block {b} ({', '.join(self.system.species[i].name for i in plan[b]['species'])}): {block_message}"
+                finished += len(members)
+                if progress_callback is not None:
+                    progress_callback(t_span[0] + (t_end - t_span[0]) * finished / len(plan))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        t_out = np.asarray(t_span if t_eval is None else t_eval, dtype=float)
+        t_out = t_out[t_out <= t_end]
+        y = np.repeat(self.system.get_initial_concentrations().astype(float)[:, None], len(t_out), axis=1)
+        for entry, sol in zip(plan, solutions):
+            if sol is not None and len(t_out):
+                y[entry["species"]] = sol(t_out)
+        solution = FullSolution(t_out, y, self._temperature_profile(t_out, y) if self.is_nonisothermal else None)
+        solution.status, solution.message, solution.stats = status, message or "Alle Blöcke integriert.", stats
+        solution.stop_condition = None
+        return solution
+
+    def multirate_partition(self):
+        """
+        Aufteilung für integrator="multirate" nach dem Spektrum der
+        Jacobi-Matrix im Anfangszustand (Nullen durch einen kleinen Anteil
+        der größten Konzentration ersetzt): Die größte Lücke zwischen den
+        Zeitskalen |Re λ| trennt die schnellen Moden ab, sofern sie
+        mindestens MULTIRATE_GAP beträgt; schnell ist eine Spezies, die
+        merklich an diesen Moden beteiligt ist (Partizipationsfaktoren aus
+        Links- und Rechtseigenvektoren). Mit is_intermediate markierte
+        Spezies sind immer schnell.
+        Rückgabe (schnelle Indizes, langsame Indizes, Quelle, Lücke oder None).
+        """
+        fast, gap = self._fast_modes()
+        source = "eigenvalues"
+        if self.fast_tags:
+            source = "is_intermediate" if len(fast) == 0 else "is_intermediate+eigenvalues"
+            fast = np.union1d(fast, self.fast_tags).astype(int)
+        return fast, np.setdiff1d(np.arange(len(self.system.species)), fast), source, gap
+
+    def _fast_modes(self):
+        """Schnelle Spezies aus dem Spektrum der Jacobi-Matrix (siehe multirate_partition) und die Zeitskalenlücke."""
+        none = np.array([], dtype=int)
+        c0 = self.system.get_initial_concentrations()
+        c = np.maximum(c0, 1e-6 * max(np.max(c0), self.LOG_FLOOR))
+        eigenvalues, left, right = eig(self.jacobian(c, self._temperature_at(0.0)), left=True, right=True)
+        timescales = np.abs(eigenvalues.real)
+        active = np.sort(timescales[timescales > 1e-12 * max(np.max(timescales), self.LOG_FLOOR)])
+        if len(active) < 2:
+            return none, None
+        ratios = active[1:] / active[:-1]
+        k = int(np.argmax(ratios))
+        if ratios[k] < self.MULTIRATE_GAP:
+            return none, float(ratios[k])
+        participation = np.abs(left.conj() * right)
+        participation /= np.maximum(participation.sum(axis=0), self.LOG_FLOOR)
+        share = participation[:, timescales > np.sqrt(active[k] * active[k + 1])].sum(axis=1)
+        # Schon eine merkliche Beteiligung macht eine Spezies schnell: explizit wäre sie instabil (z. B. beide Seiten eines Gleichgewichts).
+        return np.flatnonzero(share > 0.1 * np.maximum(participation.sum(axis=1), self.LOG_FLOOR)), float(ratios[k])
+
+    def _solve_multirate(self, t_span, t_eval, stop_conditions, progress_callback):
+        """
+        Mehrraten-Integration (IMEX-Prädiktor-Korrektor) für Systeme aus
+        schnellen und langsamen Teilen (Aufteilung siehe multirate_partition).
+        Je Makroschritt H:
+          1. Prädiktor der langsamen Spezies: Adams-Bashforth 2 aus der
+             aktuellen und der vorigen Steigung (im ersten Schritt Euler).
+          2. Die schnellen Spezies werden implizit mit Radau in eigenen,
+             fehlergesteuerten Teilschritten über H integriert, die langsamen
+             dabei quadratisch zwischen Start und Prädiktor interpoliert
+             (Anfangssteigung f_slow, Krümmung aus dem AB2-Term).
+          3. Korrektor: Zuwachs der langsamen Spezies als Integral ihrer
+             Bildungsgeschwindigkeit entlang der schnellen Lösung
+             (2-Punkt-Gauß auf jedem Teilschritt).
+        Korrektor minus Prädiktor schätzt den Fehler über die Aufteilung
+        hinweg und steuert H mit rtol/atol (abgelehnte Schritte werden
+        wiederholt). Ausgabe: schnelle Spezies aus der dichten Ausgabe von
+        Radau, langsame quadratisch interpoliert. Abgedeckt ist das Modell
+        ohne Energiebilanz, log_space und Abbruchbedingungen; sonst (oder
+        ohne Zeitskalentrennung) None, und solve fällt auf SciPy zurück.
+
+        Jeder Makroschritt startet einen eigenen Radau-Lauf für die schnellen
+        Spezies; dieser feste Aufwand lohnt sich erst, wenn gekoppeltes Radau
+        an der LU-Zerlegung des ganzen Systems hängt, also bei vielen
+        langsamen Spezies. Mit weniger als MULTIRATE_MIN_SLOW langsamen
+        Spezies wird deshalb ebenfalls SciPy verwendet.
+        """
+        reason = ("Energiebilanz" if self.energy_balance is not None else "log_space" if self.log_space
+                  else "Abbruchbedingungen" if stop_conditions else None)
+        if reason is None:
+            fast, slow, source, gap = self.multirate_partition()
+            if len(fast) == 0 or len(slow) == 0:
+                reason = "keine getrennten Zeitskalen"
+            elif len(slow) < self.MULTIRATE_MIN_SLOW:
+                reason = f"nur {len(slow)} langsame Spezies, gekoppelt ist schneller"
+        if reason is not None:
+            _report_fallback(self.integrator, reason)
+            return None
+
+        t0, t_end = float(t_span[0]), float(t_span[1])
+        t_out = np.asarray(t_span if t_eval is None else t_eval, dtype=float)
+        y = self.system.get_initial_concentrations().astype(float)
+        y_out = np.zeros((len(y), len(t_out)))
+        y_out[:, t_out <= t0] = y[:, None]
+        fast_reactions = np.flatnonzero(np.any(self.stoichiometry[fast] != 0, axis=0))
+        S_slow = self.stoichiometry[slow]
+        atol_fast, atol_slow = (self.atol, self.atol) if np.ndim(self.atol) == 0 else (self.atol[fast], self.atol[slow])
+        gauss = np.array([-1.0, 1.0]) / np.sqrt(3.0)
+        stats = {"partition": source, "timescale_gap": gap, "fast_species": [self.system.species[i].name for i in fast],
+                 "macro_steps": 0, "rejected": 0, "fast_function_evaluations": 0, "fast_jacobian_evaluations": 0}
+        status, message = 0, "Integration erfolgreich."
+        t, H, h_fast = t0, 1e-3 * (t_end - t0), None
+        f_previous, H_previous = None, None
+
+        while t < t_end:
+            H = min(H, t_end - t)
+            y_slow = y[slow]
+            f_slow = S_slow @ self._calculate_rates(y, self._temperature_at(t))
+            # Adams-Bashforth 2 (im ersten Schritt Euler); dazwischen quadratisch mit Anfangssteigung f_slow
+            curvature = np.zeros_like(f_slow) if f_previous is None else (H * H / 2) * (f_slow - f_previous) / H_previous
+            def slow_at(tau, t=t, H=H, y_slow=y_slow, f_slow=f_slow, curvature=curvature):
+                theta = np.asarray((tau - t) / H)[..., None]
+                return (y_slow + theta * H * f_slow + theta ** 2 * curvature).T
+            predicted = y_slow + H * f_slow + curvature
+            def concentrations(tau, y_fast, slow_at=slow_at):
+                c = np.empty(len(y))
+                c[slow] = slow_at(tau)
+                c[fast] = y_fast
+                return c
+            rhs, jac = self._subsystem(fast, fast_reactions, concentrations)
+            t_next = t_end if t + H >= t_end else t + H
+            sub = solve_ivp(rhs, (t, t_next), y[fast], method='Radau', jac=jac, dense_output=True, rtol=self.rtol, atol=atol_fast,
+                            first_step=min(h_fast, t_next - t) if h_fast else None)
+            stats["fast_function_evaluations"] += sub.nfev
+            stats["fast_jacobian_evaluations"] += sub.njev
+            error, factor = np.inf, 0.25
+            if sub.status >= 0:
+                half = np.diff(sub.t) / 2
+                tau = ((sub.t[:-1] + half)[:, None] + half[:, None] * gauss).ravel()
+                C = np.empty((len(y), len(tau)))
+                C[fast] = sub.sol(tau)
+                C[slow] = slow_at(tau)
+                temperatures = np.array([self._temperature_at(x) for x in tau]) if self.temperature_program is not None else None
+                corrected = y_slow + S_slow @ (self.reaction_rates(C, temperatures) @ np.repeat(half, 2))
+                scale = atol_slow + self.rtol * np.maximum(np.abs(y_slow), np.abs(corrected))
+                error = np.sqrt(np.mean(((corrected - predicted) / scale) ** 2))
+                factor = 0.9 * max(error, 1e-10) ** (-1 / 3)
+            if error > 1.0:
+                stats["rejected"] += 1
+                H *= max(0.2, min(factor, 0.9))
+                if H <= 1e-12 * max(abs(t), t_end - t0):
+                    status, message = -1, f"Schrittweite bei t = {t:g} zu klein" + (f" ({sub.message})" if sub.status < 0 else ".")
+                    break
+                continue
+
+            new = (t_out > t) & (t_out <= t_next)
+            if np.any(new):
+                theta = (t_out[new] - t) / H
+                y_out[np.ix_(fast, new)] = sub.sol(t_out[new])
+                y_out[np.ix_(slow, new)] = (y_slow[:, None] + (theta * H) * f_slow[:, None]
+                                            + theta ** 2 * (corrected - y_slow - H * f_slow)[:, None])
+            y[fast], y[slow], t = sub.y[:, -1], corrected, t_next
+            h_fast, f_previous, H_previous = sub.t[-1] - sub.t[-2], f_slow, H
+            H *= min(5.0, factor)
+            stats["macro_steps"] += 1
+            if progress_callback is not None:
+                progress_callback(t)
+
+        reached = t_out <= t
+        solution = FullSolution(t_out[reached], y_out[:, reached])
+        solution.temperature = self._temperature_profile(solution.t, solution.y) if self.is_nonisothermal else None
+        solution.status, solution.message, solution.stats = status, message, stats
+        solution.stop_condition = None
+        return solution
+
+    def _reconstruct_qssa(self, t_points, y_normal, last_qssa_sol=None):
+        """Ergänzt die QSSA-Spezies zu den integrierten Konzentrationen (Startwert: letzte Lösung)."""
+        if last_qssa_sol is None:
             last_qssa_sol = np.full(len(self.qssa_indices), 1e-9)
-            for i in range(len(solution_normal.t)):
-                y_normal_t = solution_normal.y[:, i]
-                qssa_concs_t, _, ier, _ = fsolve(self._qssa_equations, last_qssa_sol, args=(y_normal_t,), full_output=True)
-                if ier == 1:
-                    last_qssa_sol = qssa_concs_t
+        y_full = np.zeros((len(self.system.species), len(t_points)))
+        y_full[self.normal_indices, :] = y_normal
+
+        for i in range(len(t_points)):
+            y_normal_t = y_normal[:, i]
+            T = self._temperature_at(t_points[i])
+            qssa_concs_t, converged = self._solve_qssa(last_qssa_sol, y_normal_t, T)
+            if converged:
+                last_qssa_sol = qssa_concs_t
+            else:
+                qssa_concs_t.fill(1e-12)
+
+            qssa_concs_t[qssa_concs_t < 0] = 0
+            y_full[self.qssa_indices, i] = qssa_concs_t
+        return y_full, last_qssa_sol
+
+    def _split_state(self, t_points, y):
+        """Zerlegt Integrationszustände (ohne QSSA) in vollständige Konzentrationen und Temperaturverlauf."""
+        if self.energy_balance is not None:
+            concentrations, temperature = y[:-1], y[-1]
+        else:
+            concentrations, temperature = y, (self._temperature_profile(t_points, y) if self.is_nonisothermal else None)
+        if self.reduction is not None:
+            concentrations = self.reduction.expand(concentrations)
+        elif self.log_space:
+            concentrations = self._project_conserved(concentrations)
+        return concentrations, temperature
+
+    def _project_conserved(self, concentrations):
+        """
+        Projiziert in ln c integrierte Zustände (Spezies x Zeitpunkte) auf
+        L @ c = L @ c0 (ohne Reduktion nur bis auf rtol erhalten). Gewichtet
+        mit c², sodass sich jede Konzentration relativ zu sich selbst ändert
+        und Spuren positiv bleiben.
+        """
+        L = self.system.get_conservation_laws()
+        if L.shape[0] == 0 or L.shape[0] == len(self.system.species) or concentrations.shape[1] == 0:
+            return concentrations
+        residual = L @ concentrations - (L @ self.system.get_initial_concentrations())[:, None]
+        W = concentrations ** 2
+        A = np.einsum('ms,sp,ns->pmn', L, W, L)
+        multipliers = np.linalg.solve(A, residual.T[:, :, None])[:, :, 0]
+        return concentrations - W * (L.T @ multipliers.T)
+
+    @staticmethod
+    def _event_crossed(g_old, g_new, direction):
+        if direction < 0:
+            return g_old > 0 >= g_new
+        if direction > 0:
+            return g_old < 0 <= g_new
+        return g_old != 0 and g_old * g_new <= 0
+
+    @staticmethod
+    def _stream_solution(solution, chunk_callback, keep):
+        """Gibt eine fertige Lösung in Teilen an chunk_callback weiter; bei keep=False bleibt sie danach leer."""
+        temperature = getattr(solution, 'temperature', None)
+        for start in range(0, len(solution.t), _STREAM_CHUNK):
+            end = start + _STREAM_CHUNK
+            chunk_callback(solution.t[start:end], solution.y[:, start:end], None if temperature is None else temperature[start:end])
+        if not keep:
+            solution.t, solution.y = np.array([]), np.zeros((solution.y.shape[0], 0))
+            solution.temperature = None if temperature is None else np.array([])
+        return solution
+
+    def solve_stream(self, t_span, t_eval, chunk_callback, progress_callback=None, stop_conditions=None, keep=True, checkpoint=None):
+        """
+        Wie solve, aber Schritt für Schritt mit scipy.integrate.Radau: Sobald
+        ein Schritt Ausgabezeitpunkte aus t_eval überschreitet, werden sie aus
+        der dichten Ausgabe berechnet und als chunk_callback(t, y, temperature)
+        weitergegeben. Die vollständige Lösung wird trotzdem zurückgegeben,
+        außer bei keep=False (dann bleibt sie leer, z. B. wenn chunk_callback
+        die Teile in eine Datei schreibt).
+
+        Mit checkpoint (checkpoint.Checkpoint) wird der Zustand regelmäßig
+        gesichert. Bei checkpoint.resume setzt die Integration an der letzten
+        Sicherung fort und liefert dieselbe Lösung wie ein ununterbrochener
+        Lauf; chunk_callback erhält nur die neuen Punkte. Ist t_span[1]
+        größer als im gesicherten Lauf, wird dieser ab seinem letzten Zustand
+        verlängert: die bisherige Ausgabe bleibt, danach folgen die Punkte
+        aus t_eval hinter dem gesicherten Zeitpunkt.
+
+        integrator="native"/"blocks"/"multirate" rechnen ohne Schrittschleife;
+        ihre fertige Lösung wird in Teilen zu _STREAM_CHUNK Punkten
+        weitergegeben (siehe _stream_solution). Sicherungen brauchen den
+        Radau-Zustand, mit checkpoint wird deshalb immer SciPy verwendet.
+        """
+        stop_conditions = list(stop_conditions or [])
+        if self.integrator != "scipy":
+            if checkpoint is not None:
+                _report_fallback(self.integrator, "Sicherungen nur mit SciPy-Radau")
+            else:
+                solve_special = {"native": self._solve_native, "blocks": self._solve_blocks,
+                                 "multirate": self._solve_multirate}[self.integrator]
+                solution = solve_special(t_span, t_eval, stop_conditions, progress_callback)
+                if solution is not None:
+                    return self._stream_solution(solution, chunk_callback, keep)
+        fun, y0, jac = self._integration_problem()
+        events = [condition.make_event(self) for condition in stop_conditions]
+        integrator = Radau(fun, t_span[0], y0, t_span[1], jac=jac, rtol=self.rtol, atol=self._state_atol())
+        g_previous = [event(integrator.t, integrator.y) for event in events]
+        t_eval = np.asarray(t_eval, dtype=float)
+        next_idx, last_qssa_sol = 0, None
+        times, states, temperatures = [], [], []
+        stop_condition = None
+
+        if checkpoint is not None:
+            problem = signature(mechanism_hash(self.system), [[r.arrhenius_A, r.activation_energy_Ea, r.temp_exponent_n] for r in self.system.reactions],
+                                np.asarray(y0).tolist(), self.rtol, np.asarray(self._state_atol()).tolist(), self.temperature,
+                                self.log_space, list(self.qssa_indices or []), float(t_span[0]), [c.label for c in stop_conditions],
+                                self.temperature_program.segments() if self.temperature_program is not None else None,
+                                [self.energy_balance.heat_capacity, self.energy_balance.heat_transfer_coeff, self.energy_balance.ambient_temperature,
+                                 np.asarray(self.reaction_enthalpies).tolist()] if self.energy_balance is not None else None)
+            saved = checkpoint.load()
+            if saved is not None:
+                if str(saved["signature"]) != problem:
+                    raise ValueError(f"Die Sicherung {checkpoint.path} gehört zu einem anderen Problem "
+                                     "(Mechanismus, Startwerte, Toleranzen, Temperaturprogramm oder Energiebilanz).")
+                if float(saved["radau_t"]) > t_span[1]:
+                    raise ValueError("t_span endet vor dem Zeitpunkt der Sicherung.")
+                restore_radau(integrator, saved, t_span[1])
+                g_previous = list(saved["g_previous"])
+                if "last_qssa_sol" in saved:
+                    last_qssa_sol = saved["last_qssa_sol"]
+                if str(saved["stop_condition"]):
+                    stop_condition = json.loads(str(saved["stop_condition"]))
+                if np.array_equal(saved["t_eval"], t_eval):
+                    next_idx = int(saved["next_idx"])
+                elif not keep:
+                    raise ValueError("Ein Lauf mit Trajektoriendatei kann nur mit denselben Ausgabezeitpunkten fortgesetzt werden.")
+                else:
+                    next_idx = int(np.searchsorted(t_eval, integrator.t, side='right'))
+                if keep:
+                    if "times" not in saved:
+                        raise ValueError("Die Sicherung enthält keine Ausgabe (Lauf mit Trajektoriendatei).")
+                    times.append(saved["times"]); states.append(saved["states"])
+                    if "temperatures" in saved:
+                        temperatures.append(saved["temperatures"])
+
+            def snapshot():
+                state = {"signature": np.asarray(problem), "t_eval": t_eval, "next_idx": np.asarray(next_idx),
+                         "g_previous": np.asarray(g_previous, dtype=float),
+                         "stop_condition": np.asarray(json.dumps(stop_condition) if stop_condition is not None else ""),
+                         **radau_state(integrator)}
+                if last_qssa_sol is not None:
+                    state["last_qssa_sol"] = last_qssa_sol
+                if keep:
+                    # Bisherige Teile zusammenfassen, damit jede Sicherung nur einmal kopiert
+                    times[:] = [np.concatenate(times)] if times else [np.array([])]
+                    states[:] = [np.hstack(states)] if states else [np.zeros((len(self.system.species), 0))]
+                    state["times"], state["states"] = times[0], states[0]
+                    if temperatures:
+                        temperatures[:] = [np.concatenate(temperatures)]
+                        state["temperatures"] = temperatures[0]
+                return state
+
+        while integrator.status == 'running' and stop_condition is None:
+            message = integrator.step()
+            if integrator.status == 'failed':
+                raise RuntimeError(message)
+            dense = integrator.dense_output()
+            t_reached = integrator.t
+
+            for condition, event, g_old in zip(stop_conditions, events, g_previous):
+                g_new = event(integrator.t, integrator.y)
+                if self._event_crossed(g_old, g_new, event.direction):
+                    t_root = brentq(lambda t: event(t, dense(t)), integrator.t_old, integrator.t)
+                    if t_root < t_reached:
+                        t_reached = t_root
+                        stop_condition = {"label": condition.label, "time": float(t_root),
+                                          "concentrations": np.asarray(self.full_concentrations(t_root, dense(t_root))).tolist()}
+            g_previous = [event(integrator.t, integrator.y) for event in events]
+
+            end_idx = np.searchsorted(t_eval, t_reached, side='right')
+            if end_idx > next_idx:
+                t_chunk = t_eval[next_idx:end_idx]
+                y_chunk = self._linear_state(dense(t_chunk))
+                if self.qssa_indices:
+                    y_chunk, last_qssa_sol = self._reconstruct_qssa(t_chunk, y_chunk, last_qssa_sol)
+                    T_chunk = self._temperature_profile(t_chunk, y_chunk) if self.is_nonisothermal else None
                 else:
-                    qssa_concs_t.fill(1e-12)
+                    y_chunk, T_chunk = self._split_state(t_chunk, y_chunk)
+                chunk_callback(t_chunk, y_chunk, T_chunk)
+                if keep:
+                    times.append(t_chunk); states.append(y_chunk)
+                    if T_chunk is not None:
+                        temperatures.append(T_chunk)
+                next_idx = end_idx
+            if progress_callback is not None:
+                progress_callback(t_reached)
+            if checkpoint is not None and checkpoint.due():
+                checkpoint.save(snapshot())
+
+        if checkpoint is not None:
+            checkpoint.save(snapshot())
+        t = np.concatenate(times) if times else np.array([])
+        y = np.hstack(states) if states else np.zeros((len(self.system.species), 0))
+        solution = FullSolution(t, y, np.concatenate(temperatures) if temperatures else None)
+        solution.stop_condition = stop_condition
+        return solution
+
+    def solve_steady_state(self, y0=None, T=None, max_iter=50, ptc_max_iter=500, xtol=1e-10, ftol=1e-12):
+        """
+        Bestimmt den stationären Zustand dc/dt = 0 direkt.
+
+        Zuerst gedämpftes Newton-Verfahren mit analytischer Jacobi-Matrix. Die
+        Erhaltungsgrößen L @ c = L @ c0 ersetzen dabei die linear abhängigen
+        Gleichungen, sodass das System regulär bleibt. Konvergiert Newton
+        nicht, folgt pseudo-transiente Kontinuation (implizite Euler-Schritte
+        mit wachsendem Pseudo-Zeitschritt), die die Erhaltungsgrößen von
+        selbst einhält.
+
+        ftol ist relativ: dc/dt gilt als null, wenn es höchstens ftol mal den
+        Bruttoumsatz sum_j |N_ij| r_j beträgt (Rundungsrauschen der Bilanz),
+        die Erhaltungsgrößen relativ zur größten Konzentration.
+        """
+        if self.energy_balance is not None:
+            raise ValueError("Der stationäre Modus wird mit Energiebilanz nicht unterstützt.")
+        T = self.temperature if T is None else T
+        c0 = self.system.get_initial_concentrations()
+        y = np.array(c0 if y0 is None else y0, dtype=float)
+        L = self.system.get_conservation_laws()
+        Q = null_space(L).T if L.shape[0] else np.eye(len(c0))
+        totals = L @ c0
+
+        def residual(c):
+            return np.concatenate([Q @ (self.stoichiometry @ self._calculate_rates(c, T)), L @ c - totals])
+
+        def negligible(c, f):
+            """dc/dt (bzw. das Residuum F) im Rahmen von ftol null, gemessen an Umsatz und Konzentrationen."""
+            flux = np.abs(self.stoichiometry) @ np.abs(self._calculate_rates(c, T))
+            c_scale = max(np.max(np.abs(c), initial=0.0), np.max(np.abs(totals), initial=0.0), 1e-300)
+            if len(f) == len(c):
+                return bool(np.all(np.abs(f) <= ftol * np.maximum(flux, 1e-300)))
+            n_rates = Q.shape[0]
+            return bool(np.max(np.abs(f[:n_rates]), initial=0.0) <= ftol * max(np.max(np.abs(Q) @ flux, initial=0.0), 1e-300)
+                        and np.max(np.abs(f[n_rates:]), initial=0.0) <= ftol * c_scale)
+
+        y_newton, converged, iterations = self._damped_newton(y, residual, Q, L, T, max_iter, xtol, negligible)
+        if converged:
+            f = self.stoichiometry @ self._calculate_rates(y_newton, T)
+            return SteadyStateResult(y_newton, True, "newton", iterations, float(np.max(np.abs(f), initial=0.0)))
+
+        y_ptc, converged, ptc_iterations, f_norm = self._pseudo_transient(y, T, ptc_max_iter, xtol, negligible)
+        return SteadyStateResult(y_ptc, converged, "pseudo_transient", iterations + ptc_iterations, f_norm)
+
+    @staticmethod
+    def _max_step_to_boundary(y, delta, fraction=0.99):
+        """Größter Schrittanteil, bei dem keine Konzentration negativ wird."""
+        shrinking = delta < 0
+        if not np.any(shrinking):
+            return 1.0
+        limits = -y[shrinking] / delta[shrinking]
+        return min(1.0, fraction * np.min(limits)) if np.min(limits) < 1.0 else 1.0
+
+    def _damped_newton(self, y, residual, Q, L, T, max_iter, xtol, negligible):
+        F = residual(y)
+        if negligible(y, F):
+            return y, True, 0
+        for iteration in range(1, max_iter + 1):
+            J = np.vstack([Q @ self.jacobian(y, T), L])
+            try:
+                delta = np.linalg.solve(J, -F)
+            except np.linalg.LinAlgError:
+                return y, False, iteration
+
+            tiny_step = np.max(np.abs(delta), initial=0.0) <= xtol * max(np.max(np.abs(y), initial=0.0), 1e-30)
+            lam = self._max_step_to_boundary(y, delta)
+            norm_F = np.linalg.norm(F)
+            while lam > 1e-8:
+                y_trial = np.maximum(y + lam * delta, 0.0)
+                F_trial = residual(y_trial)
+                if np.linalg.norm(F_trial) <= (1.0 - 1e-4 * lam) * norm_F or norm_F == 0:
+                    break
+                lam *= 0.5
+            else:
+                # Liniensuche steckt im Rundungsrauschen fest: mit verschwindendem Newton-Schritt ist das die Lösung
+                return y, tiny_step, iteration
+
+            y, F = y_trial, F_trial
+            step = lam * np.max(np.abs(delta), initial=0.0)
+            if negligible(y, F) or step <= xtol * max(np.max(np.abs(y), initial=0.0), 1e-30):
+                return y, True, iteration
+        return y, False, max_iter
 
-                qssa_concs_t[qssa_concs_t < 0] = 0
-                y_full[self.qssa_indices, i] = qssa_concs_t
+    def _pseudo_transient(self, y, T, max_iter, xtol, negligible):
+        identity = np.eye(len(y))
+        f = self.stoichiometry @ self._calculate_rates(y, T)
+        f_norm = np.max(np.abs(f), initial=0.0)
+        J = self.jacobian(y, T)
+        dtau = 1.0 / max(np.max(np.abs(np.diag(J)), initial=0.0), 1e-12)
+        for iteration in range(1, max_iter + 1):
+            try:
+                delta = np.linalg.solve(identity / dtau - J, f)
+            except np.linalg.LinAlgError:
+                dtau *= 0.5
+                continue
+            if self._max_step_to_boundary(y, delta, fraction=1.0) < 1.0:
+                dtau *= 0.5
+                continue
 
-            class FullSolution:
-                def __init__(self, t, y): self.t, self.y = t, y
-            
-            return FullSolution(solution_normal.t, y_full)
\ No newline at end of file
+            y = np.maximum(y + delta, 0.0)
+            f_new = self.stoichiometry @ self._calculate_rates(y, T)
+            f_new_norm = np.max(np.abs(f_new), initial=0.0)
+            newton_like = dtau * max(np.max(np.abs(np.diag(J)), initial=0.0), 1e-12) > 1e6
+            small_step = np.max(np.abs(delta), initial=0.0) <= xtol * max(np.max(np.abs(y), initial=0.0), 1e-30)
+            if negligible(y, f_new) or (newton_like and small_step):
+                return y, True, iteration, f_new_norm
+            # Switched Evolution Relaxation: Pseudo-Zeitschritt wächst mit fallendem Residuum.
+            dtau *= min(max(f_norm / max(f_new_norm, 1e-300), 0.5), 10.0)
+            f, f_norm = f_new, f_new_norm
+            J = self.jacobian(y, T)
+        return y, False, max_iter, f_norm
@@ -0,0 +1,222 @@
+# python/stochastic.py
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from data_model import ReactionSystem
+
+AVOGADRO = 6.02214076e23  # 1/mol
+
+class StochasticSimulator:
+    """
+    Stochastische Kinetik nach Gillespie (SSA, direkte Methode) bzw. mit
+    tau-leaping für ein ReactionSystem in einem Volumen `volume` (L).
+
+    Stöchiometrie und Reaktionsordnungen kommen aus dem ReactionSystem; aus
+    den Reaktionsordnungen werden die Propensitäten der Massenwirkung für
+    Teilchenzahlen abgeleitet. Nach jedem Reaktionsereignis werden über einen
+    Abhängigkeitsgraphen nur die Propensitäten der Reaktionen neu berechnet,
+    deren Edukte sich geändert haben.
+    """
+    def __init__(self, system: ReactionSystem, temperature, volume=1e-21):
+        self.system = system
+        self.omega = AVOGADRO * volume
+        N = system.get_stoichiometry_matrix()
+        if not np.allclose(N, np.rint(N)):
+            raise ValueError("Die stochastische Simulation benötigt ganzzahlige Stöchiometrie.")
+        self.stoichiometry = np.rint(N).astype(np.int64)
+        self.state_changes = self.stoichiometry.T.copy()
+        orders = system.get_reactant_order_matrix()
+
+        k = np.array([reaction.calculate_k(temperature) for reaction in system.reactions], dtype=float)
+        self.scale = k * self.omega ** (1.0 - orders.sum(axis=1))
+        self.reactant_terms = [[(i, orders[j, i], float(orders[j, i]).is_integer()) for i in np.flatnonzero(orders[j])]
+                               for j in range(len(system.reactions))]
+
+        # Abhängigkeitsgraph: Reaktion j ändert Spezies, von denen die Propensität von l abhängt.
+        changed = self.stoichiometry != 0
+        depends = orders > 0
+        self.dependents = [np.flatnonzero(depends[:, changed[:, j]].any(axis=1)) for j in range(len(system.reactions))]
+
+        # Höchste Gesamtordnung der Reaktionen, in denen eine Spezies Edukt ist (für die tau-Auswahl).
+        total_order = orders.sum(axis=1)
+        self.highest_order = np.array([total_order[depends[:, i]].max() if depends[:, i].any() else 0.0
+                                       for i in range(len(system.species))])
+
+    def initial_counts(self):
+        return np.rint(self.system.get_initial_concentrations() * self.omega).astype(np.int64)
+
+    def propensity(self, j, n):
+        a = self.scale[j]
+        for i, order, integer in self.reactant_terms[j]:
+            if integer:
+                for m in range(int(order)):
+                    a *= max(n[i] - m, 0)
+            else:
+                a *= max(n[i], 0) ** order
+        return a
+
+    def propensities(self, n):
+        return np.array([self.propensity(j, n) for j in range(len(self.scale))], dtype=float)
+
+    def _tau_leap(self, rng, n, a, a0, epsilon, horizon=np.inf):
+        """
+        Ein tau-leaping-Schritt (Cao/Gillespie/Petzold), höchstens bis horizon;
+        None, wenn ein SSA-Schritt günstiger ist.
+        """
+        reactant = self.highest_order > 0
+        mu = (self.stoichiometry @ a)[reactant]
+        sigma2 = ((self.stoichiometry ** 2) @ a)[reactant]
+        bound = np.maximum(epsilon * n[reactant] / self.highest_order[reactant], 1.0)
+        with np.errstate(divide='ignore'):
+            tau = min(np.min(bound / np.abs(mu), initial=np.inf), np.min(bound ** 2 / sigma2, initial=np.inf))
+        if not np.isfinite(tau) or tau < 10.0 / a0:
+            return None
+        tau = min(tau, horizon)
+        while True:
+            n_new = n + self.stoichiometry @ rng.poisson(a * tau)
+            if np.all(n_new >= 0):
+                return tau, n_new
+            tau *= 0.5
+
+    def run_trajectory(self, rng, t_points, method='ssa', epsilon=0.03):
+        """Simuliert eine Trajektorie und liefert die Teilchenzahlen an den Zeitpunkten t_points."""
+        n = self.initial_counts()
+        a = self.propensities(n)
+        a0 = a.sum()
+        states = np.empty((len(t_points), len(n)), dtype=np.int64)
+        t, next_idx, steps = t_points[0], 0, 0
+
+        while next_idx < len(t_points):
+            if a0 <= 0:
+                states[next_idx:] = n
+                break
+
+            leap = None
+            if method == 'tau_leap':
+                # Sprünge enden am nächsten Ausgabezeitpunkt, sonst hinge die Ausgabe bis zu tau zurück
+                horizon = t_points[next_idx] - t
+                leap = self._tau_leap(rng, n, a, a0, epsilon, horizon if horizon > 0 else np.inf)
+            tau = leap[0] if leap else rng.exponential(1.0 / a0)
+            while next_idx < len(t_points) and t_points[next_idx] < t + tau:
+                states[next_idx] = n
+                next_idx += 1
+            t += tau
+
+            if leap:
+                n = leap[1]
+                a = self.propensities(n)
+                a0 = a.sum()
+                continue
+
+            j = min(int(np.searchsorted(np.cumsum(a), rng.random() * a0, side='right')), len(a) - 1)
+            n += self.state_changes[j]
+            for l in self.dependents[j]:
+                new = self.propensity(l, n)
+                a0 += new - a[l]
+                a[l] = new
+            steps += 1
+            if steps % 1000 == 0:
+                a0 = a.sum()  # Rundungsdrift der inkrementellen Summe verwerfen
+        return states
+
+class EnsembleSummary:
+    """
+    Laufende Momente (Welford) und ein zusammenführbares Histogramm pro
+    Zeitpunkt und Spezies, aus dem Quantile geschätzt werden. Der
+    Speicherbedarf hängt nicht von der Anzahl der Trajektorien ab.
+    Bins: ganzzahlig bis 16, danach geometrisch mit bins_per_octave pro Verdopplung.
+    """
+    def __init__(self, n_times, n_species, bins_per_octave=16, max_octave=40):
+        geometric = np.unique(np.ceil(2.0 ** np.arange(4, max_octave, 1.0 / bins_per_octave)))
+        self.edges = np.concatenate([np.arange(16.0), geometric[geometric > 15], [np.inf]])
+        self.count = 0
+        self.mean = np.zeros((n_times, n_species))
+        self.m2 = np.zeros((n_times, n_species))
+        self.histogram = np.zeros((n_times, n_species, len(self.edges) - 1), dtype=np.int32)
+        self.minimum = np.full((n_times, n_species), np.inf)
+        self.maximum = np.full((n_times, n_species), -np.inf)
+        self._t_idx, self._s_idx = np.indices((n_times, n_species))
+
+    def add(self, states):
+        self.count += 1
+        delta = states - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (states - self.mean)
+        bins = np.searchsorted(self.edges, states, side='right') - 1
+        self.histogram[self._t_idx, self._s_idx, bins] += 1
+        np.minimum(self.minimum, states, out=self.minimum)
+        np.maximum(self.maximum, states, out=self.maximum)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.histogram += other.histogram
+        np.minimum(self.minimum, other.minimum, out=self.minimum)
+        np.maximum(self.maximum, other.maximum, out=self.maximum)
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / max(self.count - 1, 1)
+
+    def quantile(self, q):
+        cumulative = np.cumsum(self.histogram, axis=-1)
+        target = q * self.count
+        b = np.minimum((cumulative < target).sum(axis=-1), len(self.edges) - 2)
+        below = np.where(b > 0, np.take_along_axis(cumulative, np.maximum(b - 1, 0)[..., None], axis=-1)[..., 0], 0)
+        in_bin = np.take_along_axis(self.histogram, b[..., None], axis=-1)[..., 0]
+        lower, upper = self.edges[b], self.edges[np.minimum(b + 1, len(self.edges) - 2)]
+        fraction = np.where(in_bin > 0, (target - below) / np.maximum(in_bin, 1), 0.0)
+        # Ganzzahlige Bins sind exakt; in geometrischen Bins wird linear interpoliert.
+        estimate = np.where(upper - lower > 1, lower + np.clip(fraction, 0, 1) * (upper - lower), lower)
+        return np.clip(estimate, self.minimum, self.maximum)
+
+def _ensemble_worker(system, temperature, volume, t_points, n_trajectories, seed_sequence, method, epsilon):
+    simulator = StochasticSimulator(system, temperature, volume)
+    rng = np.random.default_rng(seed_sequence)
+    summary = EnsembleSummary(len(t_points), len(system.species))
+    for _ in range(n_trajectories):
+        summary.add(simulator.run_trajectory(rng, t_points, method, epsilon))
+    return summary
+
+def run_ensemble(system: ReactionSystem, temperature, t_end, n_trajectories, volume=1e-21, num_points=200,
+                 n_workers=None, seed=None, method='ssa', epsilon=0.03, quantiles=(0.05, 0.5, 0.95)):
+    """
+    Simuliert n_trajectories unabhängige Trajektorien, verteilt auf n_workers
+    Prozesse mit je einem eigenen Zufallszahlenstrom (SeedSequence.spawn),
+    und gibt Mittelwert, Standardabweichung und Quantile in mol/L zurück.
+    """
+    if method not in ('ssa', 'tau_leap'):
+        raise ValueError(f"Unbekannte Methode '{method}'.")
+    t_points = np.linspace(0.0, t_end, num=num_points)
+    n_workers = max(1, min(n_workers or os.cpu_count() or 1, n_trajectories))
+    shares = [n_trajectories // n_workers + (1 if w < n_trajectories % n_workers else 0) for w in range(n_workers)]
+    seeds = np.random.SeedSequence(seed).spawn(n_workers)
+    jobs = [(system, temperature, volume, t_points, share, seeds[w], method, epsilon) for w, share in enumerate(shares)]
+
+    if n_workers == 1:
+        summaries = [_ensemble_worker(*jobs[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            summaries = list(pool.map(_ensemble_worker, *zip(*jobs)))
+
+    summary = summaries[0]
+    for other in summaries[1:]:
+        summary.merge(other)
+
+    omega = AVOGADRO * volume
+    return {
+        "time_points": t_points.tolist(),
+        "species_names": [s.name for s in system.species],
+        "mean": (summary.mean.T / omega).tolist(),
+        "std": (np.sqrt(summary.variance).T / omega).tolist(),
+        "quantiles": {str(q): (summary.quantile(q).T / omega).tolist() for q in quantiles},
+        "n_trajectories": summary.count,
+        "volume_L": volume,
+        "method": method
+    }
@@ -0,0 +1,75 @@
+# python/thermal.py
+import numpy as np
+
+class TemperatureProgram:
+    """Temperaturprogramm T(t), stückweise linear durch die Stützpunkte (t, T)."""
+    def __init__(self, points):
+        points = sorted((float(t), float(T)) for t, T in points)
+        if not points:
+            raise ValueError("Ein Temperaturprogramm braucht mindestens einen Stützpunkt.")
+        self.times = np.array([p[0] for p in points])
+        self.temperatures = np.array([p[1] for p in points])
+
+    @classmethod
+    def linear_ramp(cls, T_start, rate, t_end, T_end=None):
+        """Lineare Rampe mit `rate` K/s ab T_start; wird optional bei T_end gehalten."""
+        if rate == 0 or T_end is None:
+            return cls([(0.0, T_start), (t_end, T_start + rate * t_end)])
+        t_hold = max(0.0, min(t_end, (T_end - T_start) / rate))
+        return cls([(0.0, T_start), (t_hold, T_start + rate * t_hold), (max(t_end, t_hold), T_start + rate * t_hold)])
+
+    def __call__(self, t):
+        return float(np.interp(t, self.times, self.temperatures))
+
+    def segments(self):
+        """
+        Verlauf ohne kollineare und doppelte Stützpunkte, der letzte Abschnitt
+        als Startpunkt mit Steigung: [(t, T), ..., (t, T, dT/dt)]. Hängt nicht
+        davon ab, wo das Programm endet (z. B. linear_ramp mit anderem t_end).
+        """
+        points = [(t, T) for i, (t, T) in enumerate(zip(self.times, self.temperatures))
+                  if i == 0 or t > self.times[i - 1]]
+        slopes = [(T1 - T0) / (t1 - t0) for (t0, T0), (t1, T1) in zip(points, points[1:])]
+        kept = [(float(points[0][0]), float(points[0][1]))]
+        for i in range(1, len(slopes)):
+            if not np.isclose(slopes[i], slopes[i - 1], rtol=1e-12, atol=0.0):
+                kept.append((float(points[i][0]), float(points[i][1])))
+        return kept[:-1] + [kept[-1] + (float(slopes[-1]) if slopes else 0.0,)]
+
+    def temperature_range(self):
+        return float(self.temperatures.min()), float(self.temperatures.max())
+
+class EnergyBalance:
+    """
+    Energiebilanz eines ideal durchmischten Batch-Reaktors:
+
+        heat_capacity * dT/dt = sum_j (-ΔH_r,j) * r_j + heat_transfer_coeff * (T_amb - T)
+
+    heat_capacity in J/(L·K), heat_transfer_coeff (UA/V) in W/(L·K).
+    Mit heat_transfer_coeff = 0 ist der Reaktor adiabat.
+    """
+    def __init__(self, heat_capacity=4184.0, heat_transfer_coeff=0.0, ambient_temperature=None):
+        if heat_capacity <= 0:
+            raise ValueError("Die Wärmekapazität muss positiv sein.")
+        self.heat_capacity = float(heat_capacity)
+        self.heat_transfer_coeff = float(heat_transfer_coeff)
+        self.ambient_temperature = ambient_temperature
+
+    @property
+    def is_adiabatic(self):
+        return self.heat_transfer_coeff == 0.0
+
+    def dTdt(self, T, rates, reaction_enthalpies):
+        heat_release = -np.dot(reaction_enthalpies, rates)
+        if not self.is_adiabatic:
+            heat_release += self.heat_transfer_coeff * (self.ambient_temperature - T)
+        return heat_release / self.heat_capacity
+
+    def max_temperature_change(self, reaction_enthalpies, initial_concentrations):
+        """
+        Grobe Schätzung der adiabaten Temperaturänderung für den Bereich der
+        k(T)-Tabelle. Keine Schranke: bei stöchiometrischer Vervielfachung
+        (A -> 2 B, B -> 2 C) können die Umsätze sum(c0) übersteigen; außerhalb
+        der Tabelle wird k direkt berechnet (siehe RateConstantTable).
+        """
+        return np.sum(np.abs(reaction_enthalpies)) * np.sum(np.abs(initial_concentrations)) / self.heat_capacity
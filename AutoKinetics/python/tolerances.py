@@ -0,0 +1,140 @@
+# python/tolerances.py
+import os
+import json
+import time
+import numpy as np
+from simulator import ODESolver
+
+def _run(system, temperature, t_span, t_eval, rtol, atol, temperature_program, energy_balance, integrator, codegen, log_space,
+         repeats, time_limit=None):
+    """
+    Löst mit den gegebenen Toleranzen; (Konzentrationen oder None, kürzeste Laufzeit in s).
+    Läufe über time_limit Sekunden werden abgebrochen und zählen als fehlgeschlagen.
+    """
+    best, y = np.inf, None
+    for _ in range(repeats):
+        solver = ODESolver(system, temperature, temperature_program, energy_balance, codegen=codegen,
+                           log_space=log_space, integrator=integrator, rtol=rtol, atol=atol)
+        start = time.perf_counter()
+        def watchdog(t):
+            if time_limit is not None and time.perf_counter() - start > time_limit:
+                raise TimeoutError(f"Zeitlimit von {time_limit:.1f} s überschritten")
+        try:
+            solution = solver.solve(t_span, t_eval, progress_callback=watchdog)
+        except Exception:
+            return None, np.inf
+        best = min(best, time.perf_counter() - start)
+        y = solution.y if solution.y.shape[1] == len(t_eval) else None
+        if best > 1.0:
+            break  # lange Läufe nicht wiederholen, die Messung ist dann ohnehin stabil
+    return y, best
+
+def pareto_front(candidates):
+    """Nicht dominierte Kandidaten (kürzere Laufzeit oder kleinerer Fehler), nach Laufzeit sortiert."""
+    front, best_error = [], np.inf
+    for candidate in sorted(candidates, key=lambda c: (c["time_s"], c["error"])):
+        if candidate["error"] < best_error:
+            front.append(candidate)
+            best_error = candidate["error"]
+    return front
+
+def calibrate_tolerances(system, temperature, sim_time_s, num_points=200, temperature_program=None, energy_balance=None,
+                         reference_rtol=1e-10, rtols=(1e-2, 1e-3, 1e-4, 1e-5, 1e-6, 1e-7, 1e-8),
+                         atol_fractions=(1e-2, 1e-4, 1e-6), target_error=1e-3, integrator="scipy", codegen="python",
+                         log_space=False, repeats=3, progress_callback=None):
+    """
+    Kalibriert rtol/atol für einen Mechanismus:
+
+      1. Referenzlauf mit reference_rtol; atol je Spezies aus einem
+         Vorlauf, damit auch Spuren genau aufgelöst sind.
+      2. Alle Kombinationen aus rtols und atol_fractions, jeweils mit einem
+         gemeinsamen atol (Anteil der größten Konzentration) und mit atol je
+         Spezies (Anteil ihres eigenen Maximums). Gemessen werden die
+         kürzeste Laufzeit aus repeats Läufen und der Fehler: größte
+         Abweichung von der Referenz relativ zum Maximum der jeweiligen
+         Spezies, sodass Spurenspezies genauso zählen wie Hauptprodukte.
+         Kandidaten, die deutlich länger als die Referenz brauchen (etwa
+         durch eine zusammenbrechende Schrittweite), werden abgebrochen.
+      3. Pareto-Front Laufzeit gegen Fehler; empfohlen wird der schnellste
+         Kandidat mit Fehler <= target_error (sonst der genaueste).
+
+    progress_callback(fertig, gesamt) meldet den Fortschritt.
+    """
+    names = [s.name for s in system.species]
+    t_span = (0.0, sim_time_s)
+    t_eval = np.linspace(*t_span, num=num_points)
+    total = 2 + 2 * len(rtols) * len(atol_fractions)
+    done = 0
+    def report():
+        if progress_callback is not None:
+            progress_callback(done, total)
+
+    pilot, _ = _run(system, temperature, t_span, t_eval, ODESolver.DEFAULT_RTOL, 1e-12 * max(np.max(system.get_initial_concentrations()), 1e-30),
+                    temperature_program, energy_balance, integrator, codegen, log_space, 1)
+    if pilot is None:
+        raise RuntimeError("Vorlauf für die Kalibrierung fehlgeschlagen.")
+    done += 1; report()
+    peaks = np.max(np.abs(pilot), axis=1)
+    floor = np.max(peaks) * 1e-12 if np.max(peaks) > 0 else 1e-30
+    reference, reference_time = _run(system, temperature, t_span, t_eval, reference_rtol, 1e-3 * reference_rtol * np.maximum(peaks, floor),
+                                     temperature_program, energy_balance, integrator, codegen, log_space, 1)
+    if reference is None:
+        raise RuntimeError("Referenzlauf für die Kalibrierung fehlgeschlagen"
+                           + ("." if log_space else " (bei QSSA-Spezies hilft oft log_space)."))
+    done += 1; report()
+    peaks = np.max(np.abs(reference), axis=1)
+    scale = np.maximum(peaks, floor)
+    present = peaks > 0
+    time_limit = 2.0 * reference_time + 1.0  # langsamer als die Referenz ist ohnehin kein Kandidat für die Front
+
+    candidates = []
+    for rtol in rtols:
+        for fraction in atol_fractions:
+            for mode in ("uniform", "per_species"):
+                atol = fraction * (np.max(scale) if mode == "uniform" else scale)
+                y, wall_time = _run(system, temperature, t_span, t_eval, rtol, atol, temperature_program, energy_balance,
+                                    integrator, codegen, log_space, repeats, time_limit)
+                error, worst = None, None
+                if y is not None:
+                    deviation = np.max(np.abs(y - reference), axis=1) / scale
+                    deviation[~present] = 0.0
+                    error, worst = float(np.max(deviation)), names[int(np.argmax(deviation))]
+                candidates.append({"rtol": rtol, "atol_mode": mode, "atol_fraction": fraction,
+                                   "atol": float(atol) if mode == "uniform" else dict(zip(names, atol.tolist())),
+                                   "time_s": wall_time if y is not None else None, "error": error, "worst_species": worst})
+                done += 1; report()
+
+    front = pareto_front([c for c in candidates if c["error"] is not None])
+    accurate = [c for c in front if c["error"] <= target_error]
+    recommended = accurate[0] if accurate else (min(front, key=lambda c: c["error"]) if front else None)
+    return {
+        "reference": {"rtol": reference_rtol, "time_s": reference_time, "peaks": dict(zip(names, peaks.tolist()))},
+        "target_error": target_error,
+        "integrator": integrator,
+        "log_space": log_space,
+        "candidates": candidates,
+        "pareto": front,
+        "recommended": recommended,
+    }
+
+def solver_settings(calibration, temperature, sim_time_s):
+    """Empfehlung einer Kalibrierung im Format von solver_settings in der .kin-Datei."""
+    recommended = calibration["recommended"]
+    return {
+        "rtol": recommended["rtol"],
+        "atol": recommended["atol"],
+        "calibration": {"target_error": calibration["target_error"], "error": recommended["error"],
+                        "time_s": recommended["time_s"], "reference_rtol": calibration["reference"]["rtol"],
+                        "integrator": calibration["integrator"], "log_space": calibration["log_space"], "temperature_K": temperature, "duration_s": sim_time_s,
+                        "date": time.strftime("%Y-%m-%d")},
+    }
+
+def save_solver_settings(kin_filepath, settings):
+    """Schreibt solver_settings in die .kin-Datei; alle anderen Inhalte bleiben unverändert."""
+    with open(kin_filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    data["solver_settings"] = settings
+    tmp = f"{kin_filepath}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4)
+    os.replace(tmp, kin_filepath)
@@ -0,0 +1,130 @@
+# python/trajectory_store.py
+import json
+import numpy as np
+from pathlib import Path
+
+# Pro Prozess geöffnete Trajektoriendateien: {Pfad: TrajectoryReader}
+_OPEN_READERS = {}
+
+def _meta_path(path):
+    return Path(str(path) + ".json")
+
+class TrajectoryWriter:
+    """
+    Schreibt eine Trajektorie blockweise in eine speicherabgebildete Datei
+    (float64, pro Spezies zusammenhängend), während die Integration läuft.
+    Die Datei wird für alle Zeitpunkte aus t_eval angelegt; strides legt pro
+    Spezies fest, jeder wievielte Zeitpunkt gespeichert wird (Standard 1).
+    Metadaten (Namen, Offsets, Anzahl geschriebener Punkte) stehen in
+    <Pfad>.json. Mit resume_at wird eine vorhandene Datei gleichen Aufbaus
+    weiterbeschrieben, beginnend beim Punkt resume_at (Fortsetzung aus einer
+    Sicherung, siehe checkpoint.py).
+    """
+    def __init__(self, path, species_names, n_points, strides=None, with_temperature=False, resume_at=None):
+        self.path = Path(path)
+        self.species_names = list(species_names)
+        self.n_points = int(n_points)
+        unknown = set(strides or {}) - set(self.species_names)
+        if unknown:
+            raise ValueError(f"Unbekannte Spezies für die Schrittweite: {', '.join(sorted(unknown))}")
+        self.strides = [max(int((strides or {}).get(name, 1)), 1) for name in self.species_names]
+
+        offset = self.n_points
+        self.temperature_offset = None
+        if with_temperature:
+            self.temperature_offset, offset = offset, offset + self.n_points
+        self.offsets = []
+        for stride in self.strides:
+            self.offsets.append(offset)
+            offset += -(-self.n_points // stride)
+
+        if resume_at is not None:
+            with open(_meta_path(self.path), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            layout = (self.species_names, self.n_points, self.strides, self.offsets, self.temperature_offset)
+            if layout != (meta["species_names"], meta["n_points"], meta["strides"], meta["offsets"], meta["temperature_offset"]):
+                raise ValueError(f"Die Trajektoriendatei {self.path} passt nicht zur fortgesetzten Simulation.")
+            self.data = np.memmap(self.path, dtype=np.float64, mode='r+', shape=(max(offset, 1),))
+            self.filled = int(resume_at)
+        else:
+            self.data = np.memmap(self.path, dtype=np.float64, mode='w+', shape=(max(offset, 1),))
+            self.filled = 0
+        self._write_meta(stop_condition=None, complete=False)
+
+    def _write_meta(self, stop_condition, complete):
+        meta = {"species_names": self.species_names, "n_points": self.n_points, "filled": self.filled,
+                "strides": self.strides, "offsets": self.offsets, "temperature_offset": self.temperature_offset,
+                "dtype": "float64", "complete": complete, "stop_condition": stop_condition}
+        with open(_meta_path(self.path), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+    def append(self, t_chunk, y_chunk, temperature_chunk=None):
+        """Hängt Zeitpunkte t_chunk mit Konzentrationen y_chunk (Spezies x Zeitpunkte) an."""
+        count = len(t_chunk)
+        if count == 0:
+            return
+        start, end = self.filled, self.filled + count
+        if end > self.n_points:
+            raise ValueError("Mehr Zeitpunkte als beim Anlegen der Trajektoriendatei angegeben.")
+        self.data[start:end] = t_chunk
+        if self.temperature_offset is not None and temperature_chunk is not None:
+            self.data[self.temperature_offset + start:self.temperature_offset + end] = temperature_chunk
+        for i, (stride, offset) in enumerate(zip(self.strides, self.offsets)):
+            first = -(-start // stride) * stride  # erster globaler Index >= start, der gespeichert wird
+            if first >= end:
+                continue
+            local = first // stride
+            values = y_chunk[i, first - start::stride]
+            self.data[offset + local:offset + local + len(values)] = values
+        self.filled = end
+
+    def flush(self):
+        """Schreibt die bisherigen Punkte auf die Platte (vor jeder Sicherung)."""
+        self.data.flush()
+
+    def close(self, stop_condition=None):
+        self.data.flush()
+        self._write_meta(stop_condition, complete=True)
+        del self.data
+        _OPEN_READERS.pop(str(self.path), None)
+
+class TrajectoryReader:
+    """Liest eine mit TrajectoryWriter geschriebene Datei; alle Arrays sind Sichten auf die Abbildung."""
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(_meta_path(self.path), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.species_names = self.meta["species_names"]
+        self.filled = self.meta["filled"]
+        self.data = np.memmap(self.path, dtype=np.float64, mode='r')
+
+    @property
+    def time_points(self):
+        return self.data[:self.filled]
+
+    @property
+    def temperature(self):
+        offset = self.meta["temperature_offset"]
+        return None if offset is None else self.data[offset:offset + self.filled]
+
+    def species(self, idx):
+        """(Zeitpunkte, Konzentrationen) einer Spezies, jeweils mit ihrer eigenen Schrittweite."""
+        stride, offset = self.meta["strides"][idx], self.meta["offsets"][idx]
+        count = -(-self.filled // stride)
+        return self.time_points[::stride][:count], self.data[offset:offset + count]
+
+def open_trajectory(path):
+    path = str(path)
+    if path not in _OPEN_READERS:
+        _OPEN_READERS[path] = TrajectoryReader(path)
+    return _OPEN_READERS[path]
+
+def species_series(sim_results, idx):
+    """
+    (Zeitpunkte, Konzentrationen) der Spezies idx aus Simulationsergebnissen,
+    egal ob sie als Listen vorliegen oder auf eine Trajektoriendatei verweisen
+    ("trajectory_file"). Dateien werden nur gelesen, soweit nötig.
+    """
+    if sim_results.get("trajectory_file"):
+        return open_trajectory(sim_results["trajectory_file"]).species(idx)
+    return np.asarray(sim_results['time_points'], dtype=float), np.asarray(sim_results['concentrations'][idx], dtype=float)
@@ -0,0 +1,197 @@
+# python/uncertainty.py
+import os
+import copy
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from data_model import ReactionSystem
+from simulator import ODESolver
+
+# Kurznamen der unsicheren Parameter -> Attribute von Reaction
+PARAMETERS = {"A": "arrhenius_A", "n": "temp_exponent_n", "Ea": "activation_energy_Ea"}
+
+def sample_parameter(rng, nominal, spec, size):
+    """
+    Zieht size Werte eines Parameters. spec (Dictionary):
+      {"dist": "normal", "std": s | "rel_std": r, "mean": m (Standard: Nennwert)}
+      {"dist": "lognormal", "sigma": s}        Median = Nennwert, s in ln-Einheiten
+      {"dist": "uniform", "low": a, "high": b | "rel": r}   r: Nennwert * (1 ± r)
+    """
+    dist = spec.get("dist", "normal")
+    if dist == "normal":
+        std = spec["std"] if "std" in spec else abs(nominal) * float(spec.get("rel_std", 0.0))
+        return rng.normal(float(spec.get("mean", nominal)), std, size)
+    if dist == "lognormal":
+        return nominal * np.exp(rng.normal(0.0, float(spec["sigma"]), size))
+    if dist == "uniform":
+        if "rel" in spec:
+            low, high = nominal * (1 - float(spec["rel"])), nominal * (1 + float(spec["rel"]))
+        else:
+            low, high = float(spec["low"]), float(spec["high"])
+        return rng.uniform(min(low, high), max(low, high), size)
+    raise ValueError(f"Unbekannte Verteilung '{dist}'.")
+
+def validate_spec(system, spec):
+    """Prüft die Unsicherheitsangaben {Reaktion | "*": {A | n | Ea: Verteilung}} gegen das System."""
+    labels = {r.rate_label for r in system.reactions}
+    for label, parameters in spec.items():
+        if label != "*" and label not in labels:
+            raise ValueError(f"Unbekannte Reaktion '{label}' in den Unsicherheitsangaben.")
+        for name, dist in parameters.items():
+            if name not in PARAMETERS:
+                raise ValueError(f"Unbekannter Parameter '{name}' (erlaubt: {', '.join(PARAMETERS)}).")
+            sample_parameter(np.random.default_rng(0), 1.0, dist, 1)
+
+def sampled_system(system, spec, rng):
+    """Kopie von system, in der die unsicheren Parameter jeder Reaktion neu gezogen sind."""
+    reactions = []
+    for reaction in system.reactions:
+        parameters = {**spec.get("*", {}), **spec.get(reaction.rate_label, {})}
+        if parameters:
+            reaction = copy.copy(reaction)
+            for name, dist in parameters.items():
+                attribute = PARAMETERS[name]
+                value = float(sample_parameter(rng, getattr(reaction, attribute), dist, 1)[0])
+                setattr(reaction, attribute, max(value, 0.0) if name == "A" else value)
+        reactions.append(reaction)
+    return ReactionSystem(system.species, reactions, system.solver_settings)
+
+class P2Quantiles:
+    """
+    Streaming-Quantile nach dem P²-Verfahren (Jain/Chlamtac) für ein ganzes
+    Array von Zellen (hier Spezies x Zeitpunkte) gleichzeitig: je Quantil
+    fünf Marker pro Zelle, unabhängig von der Anzahl der Stichproben.
+    """
+    def __init__(self, shape, quantiles):
+        self.quantiles = tuple(quantiles)
+        self.count = 0
+        p = np.array(self.quantiles)[:, None]
+        self._increments = np.hstack([np.zeros_like(p), p / 2, p, (1 + p) / 2, np.ones_like(p)])  # (Q, 5)
+        self.heights = np.zeros((len(self.quantiles),) + tuple(shape) + (5,))
+        self.positions = np.tile(np.arange(1.0, 6.0), (len(self.quantiles),) + tuple(shape) + (1,))
+        self.desired = 1.0 + 4.0 * self._increments
+
+    def add(self, values):
+        values = np.asarray(values, dtype=float)
+        if self.count < 5:
+            self.heights[..., self.count] = values
+            self.count += 1
+            if self.count == 5:
+                self.heights.sort(axis=-1)
+            return
+        self.count += 1
+        q, n = self.heights, self.positions
+        x = np.broadcast_to(values, q.shape[:-1])
+        np.minimum(q[..., 0], x, out=q[..., 0])
+        np.maximum(q[..., 4], x, out=q[..., 4])
+        cell = (x[..., None] >= q[..., 1:4]).sum(axis=-1)  # 0..3
+        n += np.arange(5) > cell[..., None]
+        self.desired += self._increments
+        desired = self.desired.reshape((len(self.quantiles),) + (1,) * (q.ndim - 2) + (5,))
+
+        for i in (1, 2, 3):
+            d = desired[..., i] - n[..., i]
+            move = ((d >= 1) & (n[..., i + 1] - n[..., i] > 1)) | ((d <= -1) & (n[..., i - 1] - n[..., i] < -1))
+            if not move.any():
+                continue
+            s = np.where(d >= 0, 1.0, -1.0)
+            n_lo, n_mid, n_hi = n[..., i - 1], n[..., i], n[..., i + 1]
+            q_lo, q_mid, q_hi = q[..., i - 1], q[..., i], q[..., i + 1]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                parabolic = q_mid + s / (n_hi - n_lo) * ((n_mid - n_lo + s) * (q_hi - q_mid) / (n_hi - n_mid)
+                                                         + (n_hi - n_mid - s) * (q_mid - q_lo) / (n_mid - n_lo))
+                neighbour_q = np.where(s > 0, q_hi, q_lo)
+                neighbour_n = np.where(s > 0, n_hi, n_lo)
+                linear = q_mid + s * (neighbour_q - q_mid) / (neighbour_n - n_mid)
+            new = np.where((q_lo < parabolic) & (parabolic < q_hi), parabolic, linear)
+            q[..., i] = np.where(move, new, q_mid)
+            n[..., i] = np.where(move, n_mid + s, n_mid)
+
+    def result(self):
+        """Schätzwerte (Quantile x Zellen)."""
+        if self.count < 5:
+            # Zu wenige Stichproben für die Marker: exakte Quantile der bisherigen Werte.
+            if self.count == 0:
+                return np.full(self.heights.shape[:-1], np.nan)
+            return np.stack([np.quantile(self.heights[i, ..., :self.count], p, axis=-1) for i, p in enumerate(self.quantiles)])
+        return self.heights[..., 2].copy()
+
+def _run_samples(system, spec, temperature, temperature_program, energy_balance, t_span, t_eval, seeds, codegen, integrator="scipy"):
+    """Worker: löst die Stichproben zu seeds nacheinander; liefert (Trajektorien, Anzahl Fehlschläge)."""
+    trajectories, failed = [], 0
+    for seed in seeds:
+        rng = np.random.default_rng(seed)
+        try:
+            solver = ODESolver(sampled_system(system, spec, rng), temperature, copy.deepcopy(temperature_program),
+                               copy.deepcopy(energy_balance), codegen=codegen, integrator=integrator)
+            solution = solver.solve(t_span, t_eval)
+            if solution.y.shape[1] != len(t_eval):
+                raise RuntimeError("Integration vorzeitig beendet.")
+            trajectories.append(solution.y)
+        except Exception:
+            failed += 1
+    return (np.array(trajectories) if trajectories else np.zeros((0, len(system.species), len(t_eval)))), failed
+
+def propagate_uncertainty(system, spec, temperature, sim_time_s, n_samples=200, num_points=200, quantiles=(0.05, 0.5, 0.95),
+                          temperature_program=None, energy_balance=None, n_workers=None, seed=None, batch_size=8,
+                          codegen="python", integrator="scipy", progress_callback=None):
+    """
+    Monte-Carlo-Fortpflanzung unsicherer Arrhenius-Parameter: n_samples
+    Parametersätze werden gezogen (je Stichprobe ein eigener Zufallsstrom
+    aus SeedSequence, unabhängig von der Zahl der Prozesse), in Paketen zu
+    batch_size auf n_workers Prozesse verteilt und sofort in Mittelwert/
+    Standardabweichung (Welford) und P²-Quantile je Spezies und Zeitpunkt
+    eingerechnet. Der Speicherbedarf hängt nicht von n_samples ab.
+    progress_callback(fertig, gesamt) meldet den Fortschritt. integrator wie
+    bei ODESolver ("native" lohnt sich hier besonders: viele kleine Läufe).
+    """
+    validate_spec(system, spec)
+    t_span = (0.0, sim_time_s)
+    t_eval = np.linspace(*t_span, num=num_points)
+    shape = (len(system.species), num_points)
+    sketch = P2Quantiles(shape, quantiles)
+    count, mean, m2, failed = 0, np.zeros(shape), np.zeros(shape), 0
+
+    def consume(result):
+        nonlocal count, mean, m2, failed
+        trajectories, n_failed = result
+        failed += n_failed
+        for y in trajectories:
+            count += 1
+            delta = y - mean
+            mean += delta / count
+            m2 += delta * (y - mean)
+            sketch.add(y)
+        if progress_callback is not None:
+            progress_callback(count + failed, n_samples)
+
+    seeds = np.random.SeedSequence(seed).spawn(n_samples)
+    batches = [seeds[i:i + batch_size] for i in range(0, n_samples, batch_size)]
+    args = (system, spec, temperature, temperature_program, energy_balance, t_span, t_eval)
+    n_workers = max(1, min(n_workers or os.cpu_count() or 1, len(batches)))
+    if n_workers == 1:
+        for batch in batches:
+            consume(_run_samples(*args, batch, codegen, integrator))
+    else:
+        # Höchstens 2 * n_workers Pakete gleichzeitig unterwegs, damit der Speicher konstant bleibt.
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            pending, queue = set(), iter(batches)
+            for batch in queue:
+                pending.add(pool.submit(_run_samples, *args, batch, codegen, integrator))
+                if len(pending) >= 2 * n_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        consume(future.result())
+            for future in pending:
+                consume(future.result())
+
+    estimates = sketch.result()
+    return {
+        "time_points": t_eval.tolist(),
+        "species_names": [s.name for s in system.species],
+        "n_samples": count,
+        "failed": failed,
+        "mean": mean.tolist(),
+        "std": np.sqrt(m2 / max(count - 1, 1)).tolist(),
+        "quantiles": {str(q): estimates[i].tolist() for i, q in enumerate(quantiles)},
+        "parameters": spec,
+    }
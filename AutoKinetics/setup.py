@@ -4,9 +4,10 @@ from Cython.Build import cythonize
 extensions = [
     Extension(
         "autokinetics_binding",
-        sources=["python/autokinetics_binding.pyx"],
+        sources=["python/autokinetics_binding.pyx", "cpp/solver.cpp"],
         language="c++",
-        include_dirs=["cpp"],  
+        include_dirs=["cpp"],
+        extra_compile_args=["-std=c++17", "-O2"],
     )
 ]
 
@@ -0,0 +1,44 @@
+# tests/conftest.py
+import sys
+import shutil
+import importlib
+import subprocess
+from pathlib import Path
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+# Die Module in python/ importieren sich gegenseitig ohne Paketpräfix (wie backend_main.py).
+sys.path.insert(0, str(ROOT / "python"))
+
+@pytest.fixture(autouse=True)
+def codegen_cache(tmp_path, monkeypatch):
+    """Generierte Module landen je Test in tmp_path statt im gemeinsamen ~/.cache."""
+    path = tmp_path / "codegen_cache"
+    monkeypatch.setenv("AUTOKINETICS_CACHE", str(path))
+    return path
+
+@pytest.fixture(scope="session")
+def native_binding(tmp_path_factory):
+    """
+    autokinetics_binding; ist die Erweiterung nicht übersetzt, wird sie mit
+    setup.py in ein temporäres Verzeichnis gebaut. Übersprungen wird nur,
+    wenn Cython oder ein C++-Compiler fehlt.
+    """
+    try:
+        return importlib.import_module("autokinetics_binding")
+    except ImportError:
+        pass
+    pytest.importorskip("Cython")
+    build = tmp_path_factory.mktemp("native")
+    shutil.copy(ROOT / "setup.py", build)
+    shutil.copytree(ROOT / "cpp", build / "cpp")
+    (build / "python").mkdir()
+    shutil.copy(ROOT / "python" / "autokinetics_binding.pyx", build / "python")
+    result = subprocess.run([sys.executable, "setup.py", "build_ext", "--build-lib", "lib", "--build-temp", "tmp"],
+                            cwd=build, capture_output=True, text=True)
+    if result.returncode != 0:
+        if shutil.which("c++") is None and shutil.which("g++") is None and shutil.which("clang++") is None:
+            pytest.skip("Kein C++-Compiler für autokinetics_binding.")
+        pytest.fail(f"autokinetics_binding ließ sich nicht bauen:\n{result.stderr[-2000:]}")
+    sys.path.insert(0, str(build / "lib"))
+    return importlib.import_module("autokinetics_binding")
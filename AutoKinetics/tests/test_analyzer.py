@@ -0,0 +1,59 @@
+# tests/test_analyzer.py
+import numpy as np
+import pytest
+from scipy import stats
+from analyzer import PrefixRegression, segment_regimes, analyze_regimes, fit_reaction_order
+
+def test_prefix_regression_matches_linregress():
+    rng = np.random.default_rng(0)
+    t = np.sort(rng.uniform(1e3, 2e3, 200))
+    y = 0.3 * t + rng.normal(0.0, 5.0, t.size)
+    regression = PrefixRegression(t, y)
+    a = np.array([0, 10, 50, 120])
+    b = np.array([200, 40, 71, 199])
+    slope, r_squared = regression.fit(a, b)
+    for i in range(len(a)):
+        reference = stats.linregress(t[a[i]:b[i]], y[a[i]:b[i]])
+        assert slope[i] == pytest.approx(reference.slope, rel=1e-9)
+        assert r_squared[i] == pytest.approx(reference.rvalue ** 2, rel=1e-9)
+
+@pytest.mark.parametrize("order, concentration, k", [
+    ("zero_order", lambda t: 1.0 - 0.05 * t, 0.05),
+    ("first_order", lambda t: np.exp(-0.3 * t), 0.3),
+    ("second_order", lambda t: 1.0 / (1.0 + 2.0 * t), 2.0),
+])
+def test_single_regime_is_recognised(order, concentration, k):
+    t = np.linspace(0.0, 10.0, 400)
+    segments = segment_regimes(t, concentration(t))
+    assert len(segments) == 1
+    assert segments[0]["order"] == order and segments[0]["k"] == pytest.approx(k, rel=1e-6)
+    assert segments[0]["n_points"] == 400 and segments[0]["r_squared"] > 0.999999
+    # Die Gesamtanpassung kommt zum selben Ergebnis
+    fits = fit_reaction_order(t, concentration(t))
+    assert max(fits, key=lambda name: fits[name]["r_squared"]) == order
+
+def test_change_of_rate_constant_splits_the_course():
+    t = np.linspace(0.0, 20.0, 801)
+    # Erste Ordnung, k springt bei t = 5 von 1 auf 0,05 (z. B. Katalysator verbraucht)
+    c = np.where(t < 5.0, np.exp(-t), np.exp(-5.0 - 0.05 * (t - 5.0)))
+    segments = segment_regimes(t, c)
+    first, last = segments[0], segments[-1]
+    assert first["order"] == last["order"] == "first_order"
+    assert first["t_start"] == 0.0 and last["t_end"] == 20.0
+    assert first["k"] == pytest.approx(1.0, rel=1e-6) and last["k"] == pytest.approx(0.05, rel=1e-6)
+    # Höchstens ein Übergangsabschnitt um den Knick, kürzer als ein Fenster (5 % der Punkte)
+    assert len(segments) <= 3
+    assert first["t_end"] < 5.0 < last["t_start"] and last["t_start"] - first["t_end"] < 1.0
+    assert sum(s["n_points"] for s in segments) == 801
+
+def test_too_few_points_give_no_regimes():
+    assert segment_regimes([0.0, 1.0, 2.0], [1.0, 0.5, 0.25]) == []
+    assert segment_regimes(np.linspace(0, 1, 50), np.zeros(50)) == []
+
+def test_analyze_regimes_covers_every_species():
+    t = np.linspace(0.0, 10.0, 200)
+    sim_results = {"species_names": ["A", "B"], "time_points": t.tolist(),
+                   "concentrations": [np.exp(-t).tolist(), (1.0 - np.exp(-t)).tolist()]}
+    regimes = analyze_regimes(sim_results)
+    assert set(regimes) == {"A", "B"}
+    assert regimes["A"][0]["order"] == "first_order" and regimes["A"][0]["k"] == pytest.approx(1.0, rel=1e-6)
@@ -0,0 +1,86 @@
+# tests/test_batch_main.py
+import os
+import sys
+import json
+import pytest
+import batch_main
+from batch_main import check_grid, collect_jobs, run_batch, JsonlWriter, ParquetWriter
+
+KIN = {"species": [{"name": "A", "start_concentration": 1.0}, {"name": "B", "start_concentration": 0.0}],
+       "arrows": [{"rate_constant": "k", "start_id": 0, "end_id": 1, "arrhenius_A": 0.5}]}
+
+@pytest.fixture
+def kin_file(tmp_path):
+    path = tmp_path / "decay.kin"
+    path.write_text(json.dumps(KIN), encoding='utf-8')
+    return path
+
+def read_rows(path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+def test_unknown_grid_names_are_rejected(kin_file, tmp_path):
+    check_grid({"temp": [300.0], "time": [1.0], "num_points": [10], "c0:A": [1.0]})
+    with pytest.raises(ValueError, match="temperature"):
+        collect_jobs([str(kin_file)], {"temperature": [300.0, 400.0]})
+    manifest = tmp_path / "jobs.json"
+    manifest.write_text(json.dumps({"kin_files": ["decay.kin"], "grid": {"temps": [300.0]}}), encoding='utf-8')
+    with pytest.raises(ValueError, match="temps"):
+        collect_jobs([str(manifest)], {})
+
+def test_grid_expands_to_stable_job_ids(kin_file):
+    jobs = collect_jobs([str(kin_file)], {"temp": [300.0, 400.0], "c0:A": [1.0, 2.0]})
+    assert len(jobs) == 4 and len({job["job_id"] for job in jobs}) == 4
+    assert [job["job_id"] for job in jobs] == [job["job_id"] for job in collect_jobs([str(kin_file)], {"temp": [300.0, 400.0], "c0:A": [1.0, 2.0]})]
+
+def test_batch_writes_every_job_and_resumes(kin_file, tmp_path):
+    output = tmp_path / "results.jsonl"
+    jobs = collect_jobs([str(kin_file)], {"time": [2.0], "c0:A": [1.0, 2.0], "num_points": [20]})
+    counts = run_batch(jobs[:1], JsonlWriter(output), workers=1)
+    assert counts == {"ok": 1, "error": 0, "timeout": 0}
+
+    writer = JsonlWriter(output)
+    done = writer.completed_ids()
+    remaining = [job for job in jobs if job["job_id"] not in done]
+    assert len(remaining) == 1
+    run_batch(remaining, writer, workers=1)
+    rows = {row["params"]["c0:A"]: row for row in read_rows(output)}
+    assert sorted(rows) == [1.0, 2.0]
+    # A -> B mit k = 0.5: [A](2) = c0 * exp(-1); die Startkonzentration des Mechanismus bleibt unverändert
+    assert rows[2.0]["final_concentrations"][0] == pytest.approx(2.0 * 0.36787944, rel=1e-3)
+
+def test_crashed_worker_is_retried_and_the_batch_completes(kin_file, tmp_path, monkeypatch):
+    simulate = batch_main.simulate
+    def crashing(system, sim_time_s, temp_K, **kwargs):
+        if temp_K == 13.0:
+            os._exit(1)  # Worker-Prozess stirbt wie bei einem OOM-Kill
+        return simulate(system, sim_time_s, temp_K, **kwargs)
+    monkeypatch.setattr(batch_main, "simulate", crashing)  # wird mit fork an die Worker vererbt
+    if sys.platform != "linux":
+        pytest.skip("braucht fork als Startmethode")
+    output = tmp_path / "results.jsonl"
+    jobs = collect_jobs([str(kin_file)], {"temp": [13.0, 300.0, 310.0], "time": [1.0], "num_points": [10]})
+    counts = run_batch(jobs, JsonlWriter(output), workers=2, retries=1)
+    statuses = {row["params"]["temp"]: row["status"] for row in read_rows(output)}
+    assert statuses == {13.0: "error", 300.0: "ok", 310.0: "ok"}
+    assert counts["ok"] == 2 and counts["error"] == 1
+
+def test_existing_output_needs_resume(kin_file, tmp_path, monkeypatch):
+    output = tmp_path / "results.jsonl"
+    output.write_text('{"job_id": "x"}\n', encoding='utf-8')
+    monkeypatch.setattr(sys, "argv", ["batch_main.py", str(kin_file), "-o", str(output)])
+    with pytest.raises(SystemExit):
+        batch_main.main()
+
+def test_parquet_writes_one_complete_file_per_job(kin_file, tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+    output = tmp_path / "results"
+    jobs = collect_jobs([str(kin_file)], {"temp": [300.0, 310.0], "time": [1.0], "num_points": [10]})
+    writer = ParquetWriter(output)
+    assert writer.empty()
+    run_batch(jobs, writer, workers=1)
+    assert ParquetWriter(output).completed_ids() == {job["job_id"] for job in jobs}
+    assert pq.read_table(output).num_rows == 2
+    monkeypatch.setattr(sys, "argv", ["batch_main.py", str(kin_file), "-o", str(output), "--format", "parquet"])
+    with pytest.raises(SystemExit):
+        batch_main.main()
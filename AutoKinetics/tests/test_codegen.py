@@ -0,0 +1,53 @@
+# tests/test_codegen.py
+import numpy as np
+import pytest
+import codegen
+from data_model import Species, Reaction, ReactionSystem
+from simulator import ODESolver
+
+def mechanism():
+    """2 A -> B, A + B -> C (Ordnung 1.5 in A), C -> A."""
+    species = [Species("A", start_concentration=1.0), Species("B", start_concentration=0.2), Species("C", start_concentration=0.1)]
+    reactions = [Reaction([(0, 2)], [(1, 1)], "k1", arrhenius_A=0.7),
+                 Reaction([(0, 1), (1, 1)], [(2, 1)], "k2", arrhenius_A=1.3),
+                 Reaction([(2, 1)], [(0, 1)], "k3", arrhenius_A=0.4)]
+    reactions[1].reaction_order[0] = 1.5
+    return ReactionSystem(species, reactions)
+
+@pytest.fixture(autouse=True)
+def fresh_modules(monkeypatch):
+    monkeypatch.setattr(codegen, "_LOADED", {})
+
+def assert_matches_generic(backend):
+    y = np.array([0.8, 0.3, 0.05])
+    generic = ODESolver(mechanism(), 298.15, codegen=None, reduce_conservation=False)
+    compiled = ODESolver(mechanism(), 298.15, codegen=backend, reduce_conservation=False)
+    np.testing.assert_allclose(compiled.model_standard(0.0, y), generic.model_standard(0.0, y), rtol=1e-12)
+    np.testing.assert_allclose(compiled.jacobian(y), generic.jacobian(y), rtol=1e-12)
+
+def test_generated_module_matches_generic_rates(codegen_cache):
+    assert_matches_generic("python")
+    assert [p.name for p in codegen_cache.iterdir()] == [f"ak_mech_{codegen.mechanism_hash(mechanism())}.py"]
+
+def test_parameters_do_not_change_the_hash():
+    system = mechanism()
+    digest = codegen.mechanism_hash(system)
+    system.reactions[0].arrhenius_A = 42.0
+    assert codegen.mechanism_hash(system) == digest
+    system.reactions[1].reaction_order[0] = 2.0
+    assert codegen.mechanism_hash(system) != digest
+
+def test_cython_build_is_moved_into_the_cache_whole(codegen_cache, monkeypatch):
+    pytest.importorskip("Cython")
+    assert_matches_generic("cython")
+    name = f"ak_mech_{codegen.mechanism_hash(mechanism())}_cy"
+    extensions = list(codegen_cache.glob(f"{name}.*"))
+    if not extensions:
+        pytest.skip("Kein C-Compiler: Rückfall auf Python.")
+    # Keine Zwischenstände (.pyx, .c, Build-Verzeichnis) im gemeinsamen Cache
+    assert sorted(p.suffix for p in codegen_cache.iterdir()) == [".py", extensions[0].suffix]
+
+    # Ein neuer Prozess übernimmt die fertige Erweiterung, ohne erneut zu bauen
+    monkeypatch.setattr(codegen, "_LOADED", {})
+    monkeypatch.setattr(codegen, "_build_cython", lambda *args: pytest.fail("Erweiterung wurde neu gebaut"))
+    assert codegen.load_compiled(mechanism(), "cython").__file__ == str(extensions[0])
@@ -0,0 +1,38 @@
+# tests/test_continuation.py
+import numpy as np
+import pytest
+from data_model import Species, Reaction, ReactionSystem
+from continuation import ContinuationEngine, ContinuationParameter
+
+def schloegl_system(k0):
+    """dX/dt = k0 - 11 X + 6 X^2 - X^3: bistabil für k0 zwischen den Folds bei X = 2 -+ 1/sqrt(3)."""
+    species = [Species("X", start_concentration=0.5)]
+    reactions = [Reaction([], [(0, 1)], "k0", arrhenius_A=k0), Reaction([(0, 1)], [], "k1", arrhenius_A=11.0),
+                 Reaction([(0, 2)], [(0, 3)], "k2", arrhenius_A=6.0), Reaction([(0, 3)], [(0, 2)], "k3", arrhenius_A=1.0)]
+    return ReactionSystem(species, reactions)
+
+def fold_parameters():
+    x = 2.0 + np.array([-1.0, 1.0]) / np.sqrt(3.0)
+    return x ** 3 - 6.0 * x ** 2 + 11.0 * x
+
+def test_bistable_branch_has_both_folds():
+    result = ContinuationEngine(schloegl_system(5.0), ContinuationParameter('arrhenius_A', 'k0')).run(5.0, 7.0)
+    folds = [b['parameter'] for b in result['bifurcations'] if b['type'] == 'fold']
+    np.testing.assert_allclose(folds, fold_parameters(), rtol=1e-3)
+    end = result['points'][-1]
+    assert end['parameter'] == 7.0 and end['stable']
+    # Zwischen den Folds liegt der instabile mittlere Ast
+    assert any(not point['stable'] for point in result['points'])
+
+def test_singular_tangent_shrinks_the_step(monkeypatch):
+    engine = ContinuationEngine(schloegl_system(5.0), ContinuationParameter('arrhenius_A', 'k0'))
+    tangent, calls = engine._tangent, []
+    def flaky(y, p_scale, previous):
+        calls.append(1)
+        if len(calls) in (2, 3):
+            raise np.linalg.LinAlgError("Singular matrix")
+        return tangent(y, p_scale, previous)
+    monkeypatch.setattr(engine, "_tangent", flaky)
+    result = engine.run(5.0, 7.0)
+    assert result['points'][-1]['parameter'] == 7.0
+    assert len([b for b in result['bifurcations'] if b['type'] == 'fold']) == 2
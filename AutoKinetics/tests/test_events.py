@@ -0,0 +1,44 @@
+# tests/test_events.py
+import numpy as np
+import pytest
+from data_model import Species, Reaction, ReactionSystem
+from simulator import ODESolver
+from events import SpeciesThreshold, TargetConversion, RateNormThreshold
+
+def decay_system():
+    """A -> B mit k = 1: [A] = exp(-t)."""
+    species = [Species("A", start_concentration=1.0), Species("B", start_concentration=0.0)]
+    return ReactionSystem(species, [Reaction([(0, 1)], [(1, 1)], "k", arrhenius_A=1.0)])
+
+@pytest.mark.parametrize("condition, t_stop", [
+    (TargetConversion("A", 0.9), np.log(10.0)),
+    (SpeciesThreshold("B", 0.5, below=False), np.log(2.0)),
+    (SpeciesThreshold("A", 0.01), np.log(100.0)),
+    (RateNormThreshold(1e-3), np.log(1000.0)),
+])
+@pytest.mark.parametrize("stream", [False, True])
+def test_stop_condition_fires_at_analytic_time(condition, t_stop, stream):
+    solver = ODESolver(decay_system(), 298.15, rtol=1e-10, atol=1e-12)
+    t_eval = np.linspace(0.0, 20.0, 201)
+    if stream:
+        solution = solver.solve_stream((0.0, 20.0), t_eval, lambda t, y, temperature: None, stop_conditions=[condition])
+    else:
+        solution = solver.solve((0.0, 20.0), t_eval, stop_conditions=[condition])
+    assert solution.stop_condition["label"] == condition.label
+    assert solution.stop_condition["time"] == pytest.approx(t_stop, rel=1e-6)
+    # Ausgabe nur bis zum Abbruch
+    assert solution.t[-1] <= t_stop < solution.t[-1] + 0.1 + 1e-12
+
+def test_first_of_several_conditions_wins():
+    conditions = [TargetConversion("A", 0.99), SpeciesThreshold("B", 0.5, below=False)]
+    solution = ODESolver(decay_system(), 298.15, rtol=1e-10, atol=1e-12).solve((0.0, 20.0), None, stop_conditions=conditions)
+    assert solution.stop_condition["label"] == conditions[1].label
+    np.testing.assert_allclose(solution.stop_condition["concentrations"], [0.5, 0.5], rtol=1e-6)
+
+def test_no_condition_fired_runs_to_the_end():
+    solution = ODESolver(decay_system(), 298.15).solve((0.0, 1.0), np.linspace(0.0, 1.0, 11), stop_conditions=[TargetConversion("A", 0.99)])
+    assert solution.stop_condition is None and solution.t[-1] == 1.0
+
+def test_unknown_species_is_rejected():
+    with pytest.raises(ValueError, match="Unbekannte Spezies"):
+        ODESolver(decay_system(), 298.15).solve((0.0, 1.0), None, stop_conditions=[SpeciesThreshold("Z", 0.1)])
@@ -0,0 +1,62 @@
+# tests/test_fluxes.py
+import numpy as np
+import pytest
+from data_model import Species, Reaction, ReactionSystem
+from simulator import ODESolver
+from fluxes import analyze_fluxes, integrated_fluxes
+
+def system(reactions, n_species):
+    species = [Species(name, start_concentration=1.0 if i == 0 else 0.0) for i, name in enumerate("ABCD"[:n_species])]
+    return ReactionSystem(species, reactions)
+
+def simulate(reaction_system, t_end, n_points=2001):
+    t_eval = np.linspace(0.0, t_end, n_points)
+    solution = ODESolver(reaction_system, 298.15, rtol=1e-10, atol=1e-13).solve((0.0, t_end), t_eval)
+    return {"time_points": solution.t.tolist(), "species_names": [s.name for s in reaction_system.species],
+            "concentrations": solution.y.tolist(), "simulation_parameters": {"temperature_K": 298.15}}
+
+def consecutive():
+    """A -> B -> C mit k1 = 1, k2 = 0,5."""
+    return system([Reaction([(0, 1)], [(1, 1)], "k1", arrhenius_A=1.0), Reaction([(1, 1)], [(2, 1)], "k2", arrhenius_A=0.5)], 3)
+
+def test_consecutive_reactions_carry_the_whole_conversion():
+    fluxes = analyze_fluxes(simulate(consecutive(), 60.0), consecutive())
+    by_label = {r["reaction"]: r for r in fluxes["reactions"]}
+    # Bis zum vollständigen Umsatz läuft 1 mol/L A über beide Schritte
+    assert by_label["k1"]["integrated_flux"] == pytest.approx(1.0, rel=1e-4)
+    assert by_label["k2"]["integrated_flux"] == pytest.approx(1.0, rel=1e-4)
+    assert by_label["k1"]["share"] == pytest.approx(0.5, rel=1e-4)
+    # Maximum von r2 = k2 [B] dort, wo [B] maximal ist: t = ln(k1/k2) / (k1 - k2)
+    assert by_label["k1"]["t_peak"] == 0.0 and by_label["k1"]["peak_rate"] == pytest.approx(1.0)
+    assert by_label["k2"]["t_peak"] == pytest.approx(2.0 * np.log(2.0), abs=0.03)
+    assert by_label["k2"]["peak_rate"] == pytest.approx(0.25, rel=1e-3)  # [B]max = 0,5
+
+    b = fluxes["species"]["B"]
+    assert [p["reaction"] for p in b["production"]] == ["k1"] and [c["reaction"] for c in b["consumption"]] == ["k2"]
+    assert b["produced"] == pytest.approx(b["consumed"], rel=1e-3)  # Trapezregel
+    assert fluxes["pathways"][0]["species"] == ["A", "B", "C"]
+    assert fluxes["pathways"][0]["flux"] == pytest.approx(1.0, rel=1e-4)
+
+def test_branching_splits_by_rate_constant():
+    branched = system([Reaction([(0, 1)], [(1, 1)], "kB", arrhenius_A=2.0), Reaction([(0, 1)], [(2, 1)], "kC", arrhenius_A=1.0)], 3)
+    fluxes = analyze_fluxes(simulate(branched, 30.0), branched)
+    assert [r["reaction"] for r in fluxes["reactions"]] == ["kB", "kC"]
+    assert fluxes["reactions"][0]["share"] == pytest.approx(2.0 / 3.0, rel=1e-4)
+    assert [e["relative"] for e in fluxes["edges"]] == pytest.approx([1.0, 0.5], rel=1e-4)
+    assert [(p["species"], round(p["flux"], 3)) for p in fluxes["pathways"]] == [(["A", "B"], 0.667), (["A", "C"], 0.333)]
+    consumption = fluxes["species"]["A"]["consumption"]
+    assert [c["share"] for c in consumption] == pytest.approx([2.0 / 3.0, 1.0 / 3.0], rel=1e-4)
+
+def test_block_size_does_not_change_the_integrals():
+    reaction_system = consecutive()
+    sim_results = simulate(reaction_system, 20.0, n_points=501)
+    solver = ODESolver(reaction_system, 298.15, codegen=None)
+    t, c = np.asarray(sim_results["time_points"]), np.asarray(sim_results["concentrations"])
+    reference = integrated_fluxes(solver, t, c)
+    for block_size in (1, 7, 500):
+        for value, expected in zip(integrated_fluxes(solver, t, c, block_size=block_size), reference):
+            np.testing.assert_allclose(value, expected, rtol=1e-12)
+
+def test_system_without_reactions():
+    empty = ReactionSystem([Species("A")], [])
+    assert analyze_fluxes(simulate(system([], 1), 1.0, n_points=5), empty) == {"reactions": [], "species": {}, "edges": [], "pathways": []}
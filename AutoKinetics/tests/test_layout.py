@@ -0,0 +1,36 @@
+# tests/test_layout.py
+import numpy as np
+from layout import force_directed_layout
+
+def ring(n):
+    return [(i, (i + 1) % n) for i in range(n)]
+
+def test_edges_end_up_near_the_spacing():
+    pos = force_directed_layout(12, ring(12), spacing=100.0, seed=1)
+    assert pos.shape == (12, 2) and np.allclose(pos.min(axis=0), 0.0)
+    lengths = np.array([np.linalg.norm(pos[i] - pos[j]) for i, j in ring(12)])
+    assert 50.0 < lengths.mean() < 200.0
+    # Verbundene Knoten liegen näher beieinander als gegenüberliegende des Rings
+    opposite = np.array([np.linalg.norm(pos[i] - pos[(i + 6) % 12]) for i in range(12)])
+    assert lengths.mean() < 0.5 * opposite.mean()
+
+def test_no_two_nodes_overlap():
+    pos = force_directed_layout(30, [(0, i) for i in range(1, 30)], positions=np.zeros((30, 2)), spacing=80.0, seed=0)
+    distances = np.linalg.norm(pos[:, None] - pos[None, :], axis=2) + np.eye(30) * 1e9
+    assert distances.min() > 10.0
+
+def test_block_size_does_not_change_the_result():
+    edges = ring(25) + [(0, 12), (5, 20), (3, 3)]
+    reference = force_directed_layout(25, edges, seed=3, iterations=50)
+    np.testing.assert_allclose(force_directed_layout(25, edges, seed=3, iterations=50, block_size=4), reference, rtol=1e-9, atol=1e-6)
+
+def test_progress_callback_can_stop_early():
+    calls = []
+    def progress(iteration):
+        calls.append(iteration)
+        return iteration < 4
+    force_directed_layout(10, ring(10), seed=0, iterations=300, progress_callback=progress)
+    assert calls == [0, 1, 2, 3, 4]
+
+def test_empty_graph():
+    assert force_directed_layout(0, []).shape == (0, 2)
@@ -0,0 +1,106 @@
+# tests/test_model_sync.py
+import os
+import signal
+import numpy as np
+import pytest
+from parser import parse_kin_data
+from model_sync import ModelTracker, KineticModel
+
+def entries(k1=1.0, a0=1.0):
+    """A -> B -> C als Einträge, wie sie die GUI (model_entry) verschickt."""
+    return {
+        "s1": {"kind": "species", "name": "A", "start_concentration": a0},
+        "s2": {"kind": "species", "name": "B", "start_concentration": 0.0},
+        "s3": {"kind": "species", "name": "C", "start_concentration": 0.0},
+        "a1": {"kind": "arrow", "start": "s1", "end": "s2", "rate_constant": "k1", "arrhenius_A": k1,
+               "stoichiometry": {"reactants": {"s1": 1}, "products": {"s2": 1}}},
+        "a2": {"kind": "arrow", "start": "s2", "end": "s3", "rate_constant": "k2", "arrhenius_A": 0.5,
+               "stoichiometry": {"reactants": {"s2": 1}, "products": {"s3": 1}}},
+    }
+
+def kin_data(k1=1.0, a0=1.0):
+    return {"species": [{"name": "A", "start_concentration": a0}, {"name": "B", "start_concentration": 0.0},
+                        {"name": "C", "start_concentration": 0.0}],
+            "groups": [],
+            "arrows": [{"start_id": 0, "end_id": 1, "rate_constant": "k1", "arrhenius_A": k1, "stoichiometry": {"reactants": {"0": 1}, "products": {"1": 1}}},
+                       {"start_id": 1, "end_id": 2, "rate_constant": "k2", "arrhenius_A": 0.5, "stoichiometry": {"reactants": {"1": 1}, "products": {"2": 1}}}]}
+
+def assert_same_system(system, reference):
+    assert [s.name for s in system.species] == [s.name for s in reference.species]
+    np.testing.assert_array_equal(system.get_initial_concentrations(), reference.get_initial_concentrations())
+    np.testing.assert_array_equal(system.get_stoichiometry_matrix(), reference.get_stoichiometry_matrix())
+    assert [(r.rate_label, r.arrhenius_A) for r in system.reactions] == [(r.rate_label, r.arrhenius_A) for r in reference.reactions]
+
+def test_tracker_sends_only_changes_after_commit():
+    tracker = ModelTracker()
+    assert tracker.needs_full
+    delta = tracker.diff(entries(), full=True)
+    assert set(delta["upsert"]) == set(entries()) and delta["remove"] == []
+    tracker.commit(delta)
+    assert not tracker.needs_full
+
+    changed = entries(k1=2.0)
+    delta = tracker.diff({"a1": changed["a1"], "s1": changed["s1"]}, removed=["a2"])
+    assert delta == {"upsert": {"a1": changed["a1"]}, "remove": ["a2"]}
+
+def test_tracker_without_commit_resends_the_change():
+    tracker = ModelTracker()
+    tracker.commit(tracker.diff(entries(), full=True))
+    delta = tracker.diff({"a1": entries(k1=2.0)["a1"]})
+    # Lauf abgebrochen: kein commit, dieselbe Änderung geht beim nächsten Mal wieder raus
+    assert tracker.diff({"a1": entries(k1=2.0)["a1"]}) == delta
+    tracker.reset()
+    assert tracker.needs_full and tracker.sent == {}
+
+def test_full_diff_removes_unknown_keys():
+    tracker = ModelTracker()
+    tracker.commit(tracker.diff(entries(), full=True))
+    current = {k: v for k, v in entries().items() if k != "a2"}
+    assert tracker.diff(current, full=True) == {"upsert": {}, "remove": ["a2"]}
+
+def test_parameter_change_patches_instead_of_rebuilding():
+    model = KineticModel()
+    assert model.apply_delta({"upsert": entries()}) is True
+    first = model.get_system()
+    assert_same_system(first, parse_kin_data(kin_data()))
+
+    changed = entries(k1=3.0, a0=2.0)
+    assert model.apply_delta({"upsert": {"a1": changed["a1"], "s1": changed["s1"]}}) is False
+    patched = model.get_system()
+    assert patched is first
+    assert model.stats == {"rebuilds": 1, "patched": 2}
+    assert_same_system(patched, parse_kin_data(kin_data(k1=3.0, a0=2.0)))
+
+@pytest.mark.parametrize("delta", [
+    {"remove": ["a2"]},
+    {"upsert": {"s2": {"kind": "species", "name": "X", "start_concentration": 0.0}}},
+    {"upsert": {"a2": entries()["a2"] | {"stoichiometry": {"reactants": {"s2": 2}, "products": {"s3": 1}}}}},
+])
+def test_structural_change_rebuilds(delta):
+    model = KineticModel()
+    model.apply_delta({"upsert": entries()})
+    first = model.get_system()
+    assert model.apply_delta(delta) is True
+    assert model.get_system() is not first
+    assert model.stats["rebuilds"] == 2
+
+def test_cancel_does_not_interrupt_model_update(monkeypatch):
+    backend_main = pytest.importorskip("backend_main")
+    model = KineticModel()
+    model.apply_delta({"upsert": entries()})
+    model.get_system()
+    apply_delta = KineticModel.apply_delta
+
+    def cancelled_midway(self, delta):
+        os.kill(os.getpid(), signal.SIGTERM)  # Abbruch kommt an, während das Delta übernommen wird
+        return apply_delta(self, delta)
+
+    monkeypatch.setattr(KineticModel, "apply_delta", cancelled_midway)
+    previous = signal.signal(signal.SIGTERM, backend_main._raise_cancelled)
+    try:
+        with pytest.raises(backend_main.Cancelled):
+            backend_main._update_model(model, {"delta": {"upsert": {"a1": entries(k1=4.0)["a1"]}}})
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+    # Der Abbruch wirkt erst nach dem vollständigen Abgleich
+    assert model.system.reactions[0].arrhenius_A == 4.0
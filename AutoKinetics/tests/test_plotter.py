@@ -0,0 +1,37 @@
+# tests/test_plotter.py
+from pathlib import Path
+import pytest
+from data_model import Species, Reaction, ReactionSystem
+
+backend_main = pytest.importorskip("backend_main")
+
+def decay_system(k=1.0):
+    species = [Species("A", start_concentration=1.0), Species("B", start_concentration=0.0)]
+    return ReactionSystem(species, [Reaction([(0, 1)], [(1, 1)], "k1", arrhenius_A=k)])
+
+def run(tmp_path, k=1.0, output="both"):
+    return backend_main.run_system_analysis(decay_system(k), 5.0, 298.15, tmp_path, output=output)["plot_files"]
+
+def test_unchanged_run_reuses_every_figure(tmp_path):
+    first = run(tmp_path)
+    assert first["cache"]["rendered"] == 4 and first["cache"]["reused"] == 0
+    stamps = {path: Path(path).stat().st_mtime_ns for path in [first["concentration"], *first["analysis_plots"]["k1"].values()]}
+
+    second = run(tmp_path)
+    assert second["cache"] == {"reused": 4, "rendered": 0, "evicted": 0}
+    assert {path: Path(path).stat().st_mtime_ns for path in stamps} == stamps
+
+def test_changed_data_redraws_the_figures(tmp_path):
+    run(tmp_path)
+    assert run(tmp_path, k=2.0)["cache"]["rendered"] == 4
+
+def test_gui_output_gives_pngs_and_report(tmp_path):
+    # Die GUI fordert "both" an: PNG-Tabs aus dem Cache plus HTML-Bericht
+    plot_files = run(tmp_path)
+    assert Path(plot_files["concentration"]).exists() and Path(plot_files["report"]).exists()
+    assert run(tmp_path)["cache"]["reused"] == 4
+
+def test_report_only_output_draws_no_pngs(tmp_path):
+    plot_files = run(tmp_path, output="report")
+    assert "concentration" not in plot_files and Path(plot_files["report"]).exists()
+    assert not list(tmp_path.glob("*.png"))
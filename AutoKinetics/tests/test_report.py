@@ -0,0 +1,76 @@
+# tests/test_report.py
+import re
+import json
+import zlib
+import base64
+import numpy as np
+from report import build_report_data, write_report
+from trajectory_store import TrajectoryWriter
+
+def sim_results(n_points=500):
+    t = np.linspace(0.0, 10.0, n_points)
+    return {"species_names": ["A", "B"], "time_points": t.tolist(),
+            "concentrations": [np.exp(-t).tolist(), (1.0 - np.exp(-t)).tolist()],
+            "simulation_parameters": {"duration_s": 10.0, "temperature_K": 298.15},
+            "rate_law_equations": "d[A]/dt = - k1 * [A]", "stop_condition": None}
+
+def analysis():
+    fits = {"zero_order": {"r_squared": 0.8, "k": 0.05, "unit": "mol·L⁻¹·s⁻¹"},
+            "first_order": {"r_squared": 1.0, "k": 1.0, "unit": "s⁻¹"},
+            "second_order": {"r_squared": float("nan"), "k": 3.0, "unit": "L·mol⁻¹·s⁻¹"}}
+    return {"k1": {"analyzed_reactant": "A", "best_fit_order": "first_order", "calculated_k": 1.0, "k_unit": "s⁻¹",
+                   "r_squared": 1.0, "all_fits": fits, "regimes": []}}
+
+def unpack(meta, blob):
+    data = np.frombuffer(zlib.decompress(blob), dtype=np.float32)
+    view = lambda ref: data[ref[0]:ref[0] + ref[1]]
+    return [(view(s["time"]), view(s["values"])) for s in meta["species"]]
+
+def test_short_series_are_embedded_unchanged():
+    results = sim_results()
+    meta, blob = build_report_data(results, analysis())
+    series = unpack(meta, blob)
+    # Gleiches Zeitgitter: ein gemeinsames Zeit-Array
+    assert meta["species"][0]["time"] == meta["species"][1]["time"]
+    for (t, c), values in zip(series, results["concentrations"]):
+        np.testing.assert_allclose(t, results["time_points"], rtol=1e-6)
+        np.testing.assert_allclose(c, values, rtol=1e-6, atol=1e-7)
+    assert meta["reactions"][0]["species_index"] == 0 and meta["reactions"][0]["best_fit_order"] == "first_order"
+
+def test_long_series_are_decimated_keeping_the_extremes():
+    t = np.linspace(0.0, 1.0, 100001)
+    spike = np.where(np.arange(t.size) == 54321, 5.0, np.sin(20 * t))
+    results = {"species_names": ["X"], "time_points": t.tolist(), "concentrations": [spike.tolist()]}
+    meta, blob = build_report_data(results, {}, n_bins=100)
+    (times, values), = unpack(meta, blob)
+    assert len(values) <= 200 and len(times) == len(values)
+    assert values.max() == 5.0 and values.min() == np.float32(spike.min())
+    assert np.all(np.diff(times) >= 0)
+
+def test_strided_species_get_their_own_time_array(tmp_path):
+    t = np.linspace(0.0, 1.0, 101)
+    writer = TrajectoryWriter(tmp_path / "traj.bin", ["A", "B"], len(t), {"B": 5})
+    writer.append(t, np.vstack([1.0 - t, t]))
+    writer.close()
+    meta, blob = build_report_data({"species_names": ["A", "B"], "trajectory_file": str(tmp_path / "traj.bin")}, {})
+    (t_a, a), (t_b, b) = unpack(meta, blob)
+    assert meta["species"][0]["time"] != meta["species"][1]["time"]
+    np.testing.assert_allclose(t_b, t[::5], rtol=1e-6)
+    np.testing.assert_allclose(b, t[::5], rtol=1e-6)
+    assert len(a) == 101
+
+def test_report_is_a_single_self_contained_file(tmp_path):
+    results = sim_results()
+    results["rate_law_equations"] = "</script><script>alert(1)</script>"
+    path = write_report(results, analysis(), tmp_path / "sub" / "report.html")
+    html = open(path, encoding="utf-8").read()
+    assert "http://" not in html and "https://" not in html and "<img" not in html
+    assert "</script><script>alert" not in html  # kann den Daten-Block nicht vorzeitig schließen
+
+    meta = json.loads(re.search(r'<script type="application/json" id="meta">(.*?)</script>', html, re.S).group(1))
+    assert meta["rate_law_equations"] == results["rate_law_equations"]
+    # NaN ist kein gültiges JSON und wird zu null
+    assert meta["reactions"][0]["all_fits"]["second_order"]["r_squared"] is None
+    blob = base64.b64decode(re.search(r'id="data">(.*?)</script>', html, re.S).group(1))
+    (t, c), _ = unpack(meta, blob)
+    np.testing.assert_allclose(c, results["concentrations"][0], rtol=1e-6, atol=1e-7)
@@ -0,0 +1,86 @@
+# tests/test_service_main.py
+import os
+import sys
+import json
+import asyncio
+import pytest
+import service_main
+from service_main import SimulationService
+
+MECHANISM = {"species": [{"name": "A", "start_concentration": 1.0}, {"name": "B", "start_concentration": 0.0}],
+             "arrows": [{"rate_constant": "k", "start_id": 0, "end_id": 1, "arrhenius_A": 0.5}]}
+
+@pytest.fixture
+def service():
+    service = SimulationService(workers=1, queue_size=2)
+    yield service
+    service.executor.shutdown(wait=True, cancel_futures=True)
+    service.manager.shutdown()
+
+def post(service, params):
+    status, payload, headers = service.route("POST", "/jobs", json.dumps({"mechanism": MECHANISM, "params": params}).encode('utf-8'))
+    return status, payload, headers
+
+async def finish(service, job_id, timeout=60.0):
+    worker = asyncio.create_task(service.worker())
+    try:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while service.jobs[job_id].finished is None and loop.time() < deadline:
+            await asyncio.sleep(0.05)
+    finally:
+        worker.cancel()
+    return service.route("GET", f"/jobs/{job_id}", b"")[1]
+
+def test_identical_requests_share_one_job(service):
+    status, first, _ = post(service, {"time": 1.0})
+    _, second, _ = post(service, {"time": 1.0})
+    _, other, _ = post(service, {"time": 2.0})
+    assert status == 202 and not first["deduplicated"]
+    assert second == {**first, "deduplicated": True}
+    assert other["job_id"] != first["job_id"]
+
+def test_full_queue_answers_503_and_cancelled_jobs_free_capacity(service):
+    first = post(service, {"time": 1.0})[1]
+    post(service, {"time": 2.0})
+    status, _, headers = post(service, {"time": 3.0})
+    assert status == 503 and headers["Retry-After"]
+    assert service.route("DELETE", f"/jobs/{first['job_id']}", b"")[1]["cancelled"]
+    # Der abgebrochene Job steht noch in der asyncio.Queue, zählt aber nicht mehr
+    assert service.queue.qsize() == 2
+    assert post(service, {"time": 3.0})[0] == 202
+    assert service.route("GET", "/health", b"")[1]["queued"] == 2
+
+def test_cancelled_job_is_skipped_and_its_request_runs_anew(service):
+    job_id = post(service, {"time": 1.0})[1]["job_id"]
+    service.route("DELETE", f"/jobs/{job_id}", b"")
+    state = service.route("GET", f"/jobs/{job_id}", b"")[1]
+    assert state["state"] == "error" and state["error"] == "abgebrochen"
+    again = post(service, {"time": 1.0})[1]
+    assert again["job_id"] != job_id and not again["deduplicated"]
+
+def test_job_runs_to_a_result(service):
+    job_id = post(service, {"time": 2.0, "num_points": 20})[1]["job_id"]
+    result = asyncio.run(finish(service, job_id))
+    assert result["state"] == "done"
+    assert result["result"]["simulation"]["concentrations"][0][-1] == pytest.approx(0.36787944, rel=1e-3)
+    assert service.route("DELETE", f"/jobs/{job_id}", b"")[1]["cancelled"] is False
+
+def crash_on_negative_time(job_id, mechanism, params):
+    if params["time"] < 0:
+        os._exit(1)  # Worker stirbt wie bei einem OOM-Kill
+    return {"time": params["time"]}
+
+@pytest.mark.skipif(sys.platform != "linux", reason="braucht fork als Startmethode")
+def test_pool_is_rebuilt_after_a_worker_crash(service, monkeypatch):
+    monkeypatch.setattr(service_main, "execute_job", crash_on_negative_time)
+    crashed = post(service, {"time": -1.0})[1]["job_id"]
+    assert asyncio.run(finish(service, crashed))["state"] == "error"
+    healthy = post(service, {"time": 1.0})[1]["job_id"]
+    result = asyncio.run(finish(service, healthy))
+    assert result["state"] == "done" and result["result"] == {"time": 1.0}
+
+def test_unknown_paths_and_bad_requests(service):
+    assert service.route("GET", "/jobs/unknown", b"")[0] == 404
+    assert service.route("POST", "/jobs", b"not json")[0] == 400
+    assert service.route("PUT", "/jobs/x", b"")[0] == 404
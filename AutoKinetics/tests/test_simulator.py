@@ -0,0 +1,199 @@
+# tests/test_simulator.py
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+from data_model import Species, Reaction, ReactionSystem
+from simulator import ODESolver
+from thermal import TemperatureProgram, EnergyBalance
+from checkpoint import Checkpoint
+
+K1, K2 = 1.0, 0.5
+
+def consecutive_system():
+    """A -> B -> C mit k1 = 1, k2 = 0.5 (isotherm, Ea = 0)."""
+    species = [Species("A", start_concentration=1.0), Species("B", start_concentration=0.0), Species("C", start_concentration=0.0)]
+    reactions = [Reaction([(0, 1)], [(1, 1)], "k1", arrhenius_A=K1), Reaction([(1, 1)], [(2, 1)], "k2", arrhenius_A=K2)]
+    return ReactionSystem(species, reactions)
+
+def consecutive_exact(t):
+    A = np.exp(-K1 * t)
+    B = K1 / (K2 - K1) * (np.exp(-K1 * t) - np.exp(-K2 * t))
+    return np.array([A, B, 1.0 - A - B])
+
+@pytest.mark.parametrize("t_end", [1e3, 1e5])
+@pytest.mark.parametrize("reduce_conservation", [False, True])
+@pytest.mark.parametrize("codegen", [None, "python"])
+def test_consecutive_long_run_matches_analytic_solution(t_end, reduce_conservation, codegen):
+    t_eval = np.concatenate([np.linspace(0.0, 20.0, 101), np.linspace(40.0, t_end, 20)])
+    solver = ODESolver(consecutive_system(), 298.15, codegen=codegen, reduce_conservation=reduce_conservation, rtol=1e-6, atol=1e-10)
+    solution = solver.solve((0.0, t_end), t_eval)
+    assert solution.success
+    np.testing.assert_allclose(solution.y, consecutive_exact(t_eval), atol=1e-5)
+    # Jacobi-Matrix passend zur Klemmung c <= 0 -> 0: keine Schrittweitenkatastrophe nach dem Abklingen
+    assert solution.nfev < 5000
+
+def catalytic_system():
+    """A + E <-> AE -> P + E: Katalysator E und Masse A + AE + P bleiben erhalten."""
+    species = [Species("A", start_concentration=1.0), Species("E", start_concentration=0.01),
+               Species("AE", start_concentration=0.0), Species("P", start_concentration=0.0)]
+    reactions = [Reaction([(0, 1), (1, 1)], [(2, 1)], "kon", arrhenius_A=100.0), Reaction([(2, 1)], [(0, 1), (1, 1)], "koff", arrhenius_A=1.0),
+                 Reaction([(2, 1)], [(3, 1), (1, 1)], "kcat", arrhenius_A=10.0)]
+    return ReactionSystem(species, reactions)
+
+@pytest.mark.parametrize("build", [consecutive_system, catalytic_system])
+@pytest.mark.parametrize("codegen", [None, "python"])
+def test_reduction_keeps_conserved_totals_and_nonnegativity(build, codegen):
+    system = build()
+    solver = ODESolver(system, 298.15, codegen=codegen)
+    assert solver.reduction is not None
+    t_eval = np.linspace(0.0, 1e5, 200)
+    solution = solver.solve((0.0, 1e5), t_eval)
+    assert solution.success
+    L = system.get_conservation_laws()
+    totals = L @ system.get_initial_concentrations()
+    np.testing.assert_allclose(L @ solution.y, np.repeat(totals[:, None], len(t_eval), axis=1), atol=1e-12)
+    assert solution.y.min() >= -solver.atol
+
+@pytest.mark.parametrize("t_end", [1e2, 1e3, 1e5])
+def test_log_space_survives_underflow_and_conserves_mass(t_end):
+    t_eval = np.linspace(0.0, t_end, 200)
+    solution = ODESolver(consecutive_system(), 298.15, log_space=True).solve((0.0, t_end), t_eval)
+    assert solution.success
+    assert np.all(np.isfinite(solution.y)) and solution.y.min() >= 0.0
+    np.testing.assert_allclose(solution.y.sum(axis=0), 1.0, atol=1e-12)
+    np.testing.assert_allclose(solution.y, consecutive_exact(t_eval), atol=1e-3)
+
+def rober_system():
+    """Robertson-Problem: A -> B, 2 B -> B + C, B + C -> A + C (Standardtest für steife Löser)."""
+    species = [Species("A", start_concentration=1.0), Species("B", start_concentration=0.0), Species("C", start_concentration=0.0)]
+    reactions = [Reaction([(0, 1)], [(1, 1)], "k1", arrhenius_A=0.04), Reaction([(1, 2)], [(1, 1), (2, 1)], "k2", arrhenius_A=3e7),
+                 Reaction([(1, 1), (2, 1)], [(0, 1), (2, 1)], "k3", arrhenius_A=1e4)]
+    return ReactionSystem(species, reactions)
+
+def rober_reference(t_eval):
+    def rhs(t, y):
+        r1, r2, r3 = 0.04 * y[0], 3e7 * y[1] ** 2, 1e4 * y[1] * y[2]
+        return [-r1 + r3, r1 - r2 - r3, r2]
+    return solve_ivp(rhs, (0.0, t_eval[-1]), [1.0, 0.0, 0.0], method='LSODA', t_eval=t_eval, rtol=1e-12, atol=[1e-16, 1e-20, 1e-16]).y
+
+@pytest.mark.parametrize("integrator", ["scipy", "native"])
+def test_rober_matches_lsoda(integrator, request):
+    if integrator == "native":
+        request.getfixturevalue("native_binding")
+    t_eval = np.concatenate([[0.0], np.logspace(-5, 5, 41)])
+    reference = rober_reference(t_eval)
+    solver = ODESolver(rober_system(), 298.15, codegen=None, integrator=integrator, rtol=1e-8, atol=[1e-14, 1e-18, 1e-14])
+    solution = solver.solve((0.0, 1e5), t_eval)
+    # Fehler relativ zum Maximum der jeweiligen Spezies, damit B (~4e-5) genauso zählt wie A und C
+    peaks = np.max(reference, axis=1)
+    assert np.max(np.abs(solution.y - reference) / peaks[:, None]) < 1e-6
+
+def independent_system():
+    """A -> B und C -> D: zwei entkoppelte Teilnetze für integrator="blocks"."""
+    species = [Species(name, start_concentration=1.0 if name in "AC" else 0.0) for name in "ABCD"]
+    reactions = [Reaction([(0, 1)], [(1, 1)], "k1", arrhenius_A=1.0), Reaction([(2, 1)], [(3, 1)], "k2", arrhenius_A=0.1)]
+    return ReactionSystem(species, reactions)
+
+def cascade_system():
+    """A -> B, A -> C, C <-> D und E -> F: vier Blöcke auf zwei Stufen; ganzzahlige Startwerte wie aus einer .kin-Datei."""
+    species = [Species(name, start_concentration=start) for name, start in zip("ABCDEF", [2, 0, 0, 1, 3, 0])]
+    reactions = [Reaction([(0, 1)], [(1, 1)], "k1", arrhenius_A=1.0), Reaction([(0, 1)], [(2, 1)], "k2", arrhenius_A=0.3),
+                 Reaction([(2, 1)], [(3, 1)], "k3", arrhenius_A=2.0), Reaction([(3, 1)], [(2, 1)], "k4", arrhenius_A=0.5),
+                 Reaction([(4, 1)], [(5, 1)], "k5", arrhenius_A=0.2)]
+    return ReactionSystem(species, reactions)
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_blocks_match_coupled_radau_with_integer_start_values(workers):
+    system = cascade_system()
+    assert system.get_initial_concentrations().dtype.kind == "i"
+    t_eval = np.linspace(0.0, 20.0, 81)
+    expected = ODESolver(system, 298.15, rtol=1e-10, atol=1e-12).solve((0.0, 20.0), t_eval)
+    solution = ODESolver(system, 298.15, integrator="blocks", rtol=1e-10, atol=1e-12, workers=workers).solve((0.0, 20.0), t_eval)
+    assert solution.stats["blocks"] == 4 and solution.stats["levels"] == 2 and solution.stats["parallel"] == (workers is not None)
+    assert solution.y.dtype == float
+    np.testing.assert_allclose(solution.y, expected.y, rtol=1e-6, atol=1e-8)
+    # Erhaltung je Teilnetz
+    np.testing.assert_allclose(solution.y[:4].sum(axis=0), 3.0, rtol=1e-8)
+    np.testing.assert_allclose(solution.y[4:].sum(axis=0), 3.0, rtol=1e-8)
+
+@pytest.mark.parametrize("keep", [True, False])
+def test_solve_stream_uses_selected_integrator(keep, capsys):
+    t_eval = np.linspace(0.0, 50.0, 200)
+    solver = ODESolver(independent_system(), 298.15, integrator="blocks", rtol=1e-8, atol=1e-12)
+    expected = solver.solve((0.0, 50.0), t_eval)
+    chunks = []
+    solution = solver.solve_stream((0.0, 50.0), t_eval, lambda t, y, temperature: chunks.append((t, y)), keep=keep)
+    assert len(chunks) > 1
+    np.testing.assert_array_equal(np.concatenate([t for t, _ in chunks]), expected.t)
+    np.testing.assert_array_equal(np.hstack([y for _, y in chunks]), expected.y)
+    assert len(solution.t) == (len(t_eval) if keep else 0)
+    assert "nicht verwendbar" not in capsys.readouterr().err
+
+def equilibrium_chain_system(n):
+    """Schnelles Gleichgewicht S0 <-> S1 vor einer langsamen Kette S1 -> S2 -> ... -> S(n-1)."""
+    species = [Species(f"S{i}", start_concentration=1.0 if i == 0 else 0.0) for i in range(n)]
+    reactions = [Reaction([(0, 1)], [(1, 1)], "kf", arrhenius_A=1e3), Reaction([(1, 1)], [(0, 1)], "kb", arrhenius_A=1e3)]
+    reactions += [Reaction([(i, 1)], [(i + 1, 1)], f"k{i}", arrhenius_A=0.1) for i in range(1, n - 1)]
+    return ReactionSystem(species, reactions)
+
+@pytest.mark.parametrize("min_slow", [None, 1])
+def test_multirate_matches_coupled_radau_or_falls_back(min_slow, monkeypatch, capsys):
+    if min_slow is not None:
+        monkeypatch.setattr(ODESolver, "MULTIRATE_MIN_SLOW", min_slow)
+    t_eval = np.linspace(0.0, 100.0, 50)
+    expected = ODESolver(equilibrium_chain_system(7), 298.15, rtol=1e-8, atol=1e-12).solve((0.0, 100.0), t_eval)
+    solution = ODESolver(equilibrium_chain_system(7), 298.15, integrator="multirate", rtol=1e-8, atol=1e-12).solve((0.0, 100.0), t_eval)
+    # Kleines System: gekoppeltes Radau (mit Hinweis), sonst die Mehrraten-Integration mit ihrer Statistik
+    assert (getattr(solution, "stats", None) is None) == (min_slow is None)
+    assert ("nicht verwendbar" in capsys.readouterr().err) == (min_slow is None)
+    np.testing.assert_allclose(solution.y, expected.y, atol=1e-6)
+
+@pytest.mark.parametrize("thermal", ["program", "energy_balance"])
+def test_checkpoint_rejects_other_thermal_settings(thermal, tmp_path):
+    def solver(variant):
+        if thermal == "program":
+            return ODESolver(consecutive_system(), 300.0, temperature_program=TemperatureProgram.linear_ramp(300.0, variant, 10.0))
+        return ODESolver(consecutive_system(), 300.0, energy_balance=EnergyBalance(heat_transfer_coeff=variant))
+    path = tmp_path / "run.npz"
+    solver(1.0).solve_stream((0.0, 5.0), np.linspace(0.0, 5.0, 11), lambda t, y, temperature: None, checkpoint=Checkpoint(path))
+    # Gleiche Einstellungen: Verlängerung der Sicherung; andere: Fehler statt stiller Fortsetzung
+    extended = solver(1.0).solve_stream((0.0, 10.0), np.linspace(0.0, 10.0, 21), lambda t, y, temperature: None,
+                                        checkpoint=Checkpoint(path, resume=True))
+    assert extended.t[-1] == 10.0
+    with pytest.raises(ValueError, match="anderen Problem"):
+        solver(2.0).solve_stream((0.0, 10.0), np.linspace(0.0, 10.0, 21), lambda t, y, temperature: None,
+                                 checkpoint=Checkpoint(path, resume=True))
+
+def test_constant_ramp_reproduces_isothermal_run():
+    # Gültigkeitsbereich wie die Voreinstellung der GUI (500-2000 K): wird gemeldet, verändert k aber nicht
+    species = [Species("A", start_concentration=1.0), Species("B", start_concentration=0.0)]
+    reactions = [Reaction([(0, 1)], [(1, 1)], "k1", arrhenius_A=1e6, activation_energy_Ea=5e4, temperature_min=500.0, temperature_max=2000.0)]
+    t_eval = np.linspace(0.0, 1000.0, 51)
+    isothermal = ODESolver(ReactionSystem(species, reactions), 300.0, rtol=1e-8, atol=1e-12).solve((0.0, 1000.0), t_eval)
+    solver = ODESolver(ReactionSystem(species, reactions), 300.0, temperature_program=TemperatureProgram.linear_ramp(300.0, 0.0, 1000.0),
+                       rtol=1e-8, atol=1e-12)
+    ramp = solver.solve((0.0, 1000.0), t_eval)
+    np.testing.assert_allclose(ramp.y, isothermal.y, rtol=1e-6, atol=1e-10)
+    assert solver.range_warnings(ramp.temperature) == ["k1"]
+
+def schloegl_system(x0, scale=1.0, k0=6.0):
+    """Schlögl-Modell mit dX/dt = -(X - s)(X - 2s)(X - 3s)/s^2 für k0 = 6: stabil bei s und 3s, instabil bei 2s."""
+    species = [Species("X", start_concentration=x0 * scale)]
+    reactions = [Reaction([], [(0, 1)], "k0", arrhenius_A=k0 * scale), Reaction([(0, 1)], [], "k1", arrhenius_A=11.0),
+                 Reaction([(0, 2)], [(0, 3)], "k2", arrhenius_A=6.0 / scale), Reaction([(0, 3)], [(0, 2)], "k3", arrhenius_A=1.0 / scale ** 2)]
+    return ReactionSystem(species, reactions)
+
+@pytest.mark.parametrize("scale", [1e-3, 1.0, 1e3])
+@pytest.mark.parametrize("x0, root", [(0.5, 1.0), (1.7, 2.0), (2.3, 2.0), (3.5, 3.0)])
+def test_steady_state_finds_each_root_of_a_bistable_system(x0, root, scale):
+    result = ODESolver(schloegl_system(x0, scale), 298.15).solve_steady_state()
+    assert result.converged and result.method == "newton"
+    np.testing.assert_allclose(result.y, [root * scale], rtol=1e-9)
+
+@pytest.mark.parametrize("total", [1e-6, 1.0, 1e6])
+def test_steady_state_keeps_conserved_total(total):
+    species = [Species("A", start_concentration=total), Species("B", start_concentration=0.0)]
+    reactions = [Reaction([(0, 1)], [(1, 1)], "kf", arrhenius_A=3.0), Reaction([(1, 1)], [(0, 1)], "kb", arrhenius_A=1.0)]
+    result = ODESolver(ReactionSystem(species, reactions), 298.15).solve_steady_state()
+    assert result.converged
+    np.testing.assert_allclose(result.y, [0.25 * total, 0.75 * total], rtol=1e-10)
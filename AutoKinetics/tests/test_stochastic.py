@@ -0,0 +1,69 @@
+# tests/test_stochastic.py
+import numpy as np
+import pytest
+from data_model import Species, Reaction, ReactionSystem
+from simulator import ODESolver
+from stochastic import AVOGADRO, StochasticSimulator, EnsembleSummary, run_ensemble
+
+def decay_system():
+    """A -> B mit k = 1: jedes Molekül zerfällt unabhängig, [A](t) ist binomialverteilt."""
+    species = [Species("A", start_concentration=1.0), Species("B", start_concentration=0.0)]
+    return ReactionSystem(species, [Reaction([(0, 1)], [(1, 1)], "k", arrhenius_A=1.0)])
+
+def dimerization_system():
+    """2 A -> B mit k = 1 L/(mol s)."""
+    species = [Species("A", start_concentration=1.0), Species("B", start_concentration=0.0)]
+    return ReactionSystem(species, [Reaction([(0, 2)], [(1, 1)], "k", arrhenius_A=1.0)])
+
+def volume_for(molecules):
+    return molecules / AVOGADRO
+
+@pytest.mark.parametrize("method, molecules", [("ssa", 100), ("tau_leap", 10000)])
+def test_linear_decay_matches_binomial_moments(method, molecules):
+    n_trajectories = 400
+    result = run_ensemble(decay_system(), 298.15, 2.0, n_trajectories, volume=volume_for(molecules), num_points=5,
+                          n_workers=1, seed=1, method=method)
+    t = np.array(result["time_points"])
+    p = np.exp(-t)
+    mean, std = np.array(result["mean"][0]), np.array(result["std"][0])
+    exact_std = np.sqrt(p * (1 - p) / molecules)
+    # tau-leaping ist explizit: (1 - k tau)^(t/tau) statt exp(-k t), relativer Fehler etwa t * tau / 2 mit tau ~ epsilon / k
+    bias = p * 0.03 * t if method == "tau_leap" else 0.0
+    # Mittelwert innerhalb von 5 Standardfehlern (plus Verfahrensfehler), Streuung innerhalb von 20 %
+    assert np.all(np.abs(mean - p) <= 5 * exact_std / np.sqrt(n_trajectories) + bias + 1e-12)
+    # Dieser Fehler unterschätzt [A]; eine zurückhängende Ausgabe (Zustand vor dem Sprung) überschätzt es
+    assert np.all(mean - p <= 5 * exact_std / np.sqrt(n_trajectories) + 1e-12)
+    np.testing.assert_allclose(std[1:], exact_std[1:], rtol=0.2)
+    np.testing.assert_allclose(np.add(result["mean"][0], result["mean"][1]), 1.0)
+
+def test_ssa_mean_approaches_ode_for_many_molecules():
+    t_end, molecules = 1.0, 2000
+    result = run_ensemble(dimerization_system(), 298.15, t_end, 20, volume=volume_for(molecules), num_points=6, n_workers=1, seed=2)
+    t_eval = np.array(result["time_points"])
+    ode = ODESolver(dimerization_system(), 298.15, rtol=1e-8, atol=1e-12).solve((0.0, t_end), t_eval)
+    np.testing.assert_allclose(result["mean"], ode.y, atol=0.01)
+
+def test_ensemble_is_reproducible_and_split_over_workers():
+    kwargs = dict(volume=volume_for(50), num_points=4, seed=3)
+    first = run_ensemble(decay_system(), 298.15, 1.0, 30, n_workers=2, **kwargs)
+    second = run_ensemble(decay_system(), 298.15, 1.0, 30, n_workers=2, **kwargs)
+    assert first == second
+    assert first["n_trajectories"] == 30
+
+def test_summary_merge_and_quantiles_match_numpy():
+    rng = np.random.default_rng(4)
+    samples = rng.poisson(8.0, size=(101, 3, 2))
+    left, right = EnsembleSummary(3, 2), EnsembleSummary(3, 2)
+    for i, states in enumerate(samples):
+        (left if i % 2 else right).add(states)
+    summary = left.merge(right)
+    np.testing.assert_allclose(summary.mean, samples.mean(axis=0))
+    np.testing.assert_allclose(summary.variance, samples.var(axis=0, ddof=1))
+    # Ganzzahlige Bins (< 16) sind exakt
+    np.testing.assert_array_equal(summary.quantile(0.5), np.quantile(samples, 0.5, axis=0, method='inverted_cdf'))
+
+def test_non_integer_stoichiometry_is_rejected():
+    species = [Species("A", start_concentration=1.0), Species("B", start_concentration=0.0)]
+    system = ReactionSystem(species, [Reaction([(0, 1)], [(1, 0.5)], "k", arrhenius_A=1.0)])
+    with pytest.raises(ValueError):
+        StochasticSimulator(system, 298.15)
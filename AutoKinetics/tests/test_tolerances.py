@@ -0,0 +1,60 @@
+# tests/test_tolerances.py
+import json
+import numpy as np
+from data_model import Species, Reaction, ReactionSystem
+from parser import parse_kin_file
+from simulator import ODESolver
+from tolerances import pareto_front, calibrate_tolerances, solver_settings, save_solver_settings
+
+def trace_system():
+    """A -> B -> C, B ist eine Spurenspezies (schnell verbraucht)."""
+    species = [Species("A", start_concentration=1.0), Species("B", start_concentration=0.0), Species("C", start_concentration=0.0)]
+    return ReactionSystem(species, [Reaction([(0, 1)], [(1, 1)], "k1", arrhenius_A=1.0),
+                                    Reaction([(1, 1)], [(2, 1)], "k2", arrhenius_A=1e3)])
+
+def test_pareto_front_keeps_only_undominated_candidates():
+    candidates = [{"name": "slow_exact", "time_s": 3.0, "error": 1e-8}, {"name": "fast_rough", "time_s": 1.0, "error": 1e-2},
+                  {"name": "dominated", "time_s": 2.0, "error": 1e-2}, {"name": "middle", "time_s": 2.0, "error": 1e-5},
+                  {"name": "slower_worse", "time_s": 4.0, "error": 1e-6}]
+    assert [c["name"] for c in pareto_front(candidates)] == ["fast_rough", "middle", "slow_exact"]
+
+def test_calibration_measures_errors_against_the_reference():
+    progress = []
+    calibration = calibrate_tolerances(trace_system(), 298.15, 5.0, num_points=51, rtols=(1e-2, 1e-7), atol_fractions=(1e-3,),
+                                       target_error=1e-4, repeats=1, progress_callback=lambda done, total: progress.append((done, total)))
+    assert progress[-1] == (6, 6) and len(calibration["candidates"]) == 4
+    by_key = {(c["rtol"], c["atol_mode"]): c for c in calibration["candidates"]}
+    assert set(by_key[(1e-2, "per_species")]["atol"]) == {"A", "B", "C"}
+    assert by_key[(1e-7, "per_species")]["error"] < by_key[(1e-2, "per_species")]["error"]
+    # Fehler relativ zum Maximum je Spezies: die Spur B bestimmt bei grober gemeinsamer atol den Fehler
+    assert by_key[(1e-2, "uniform")]["worst_species"] == "B"
+
+    recommended = calibration["recommended"]
+    assert recommended in calibration["pareto"] and recommended["error"] <= 1e-4
+    # Nachrechnen: die Empfehlung hält das Ziel auch in einem unabhängigen Lauf ein
+    t_eval = np.linspace(0.0, 5.0, 51)
+    exact = ODESolver(trace_system(), 298.15, rtol=1e-12, atol=1e-20).solve((0.0, 5.0), t_eval).y
+    settings = solver_settings(calibration, 298.15, 5.0)
+    system = trace_system()
+    system.solver_settings = settings
+    y = ODESolver(system, 298.15).solve((0.0, 5.0), t_eval).y
+    assert np.max(np.abs(y - exact).max(axis=1) / exact.max(axis=1)) <= 2e-4
+
+def test_settings_are_stored_in_the_kin_file_and_used_by_the_solver(tmp_path):
+    path = tmp_path / "model.kin"
+    content = {"species": [{"name": "A", "start_concentration": 1.0}, {"name": "B", "start_concentration": 0.0}],
+               "groups": [], "arrows": [{"start_id": 0, "end_id": 1, "rate_constant": "k1", "arrhenius_A": 1.0}]}
+    path.write_text(json.dumps(content), encoding="utf-8")
+    settings = {"rtol": 1e-7, "atol": {"A": 1e-9, "B": 1e-11}, "calibration": {"target_error": 1e-4}}
+    save_solver_settings(path, settings)
+
+    stored = json.loads(path.read_text(encoding="utf-8"))
+    assert stored["solver_settings"] == settings and stored["arrows"] == content["arrows"]
+    system = parse_kin_file(path)
+    solver = ODESolver(system, 298.15)
+    assert solver.rtol == 1e-7
+    np.testing.assert_array_equal(solver.atol, [1e-9, 1e-11])
+    # Ausdrücklich übergebene Toleranzen haben Vorrang
+    solver = ODESolver(system, 298.15, rtol=1e-4, atol=1e-8)
+    assert solver.rtol == 1e-4 and solver.atol == 1e-8
+    assert not list(tmp_path.glob("*.tmp"))
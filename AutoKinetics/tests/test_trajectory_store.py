@@ -0,0 +1,70 @@
+# tests/test_trajectory_store.py
+import numpy as np
+import pytest
+from trajectory_store import TrajectoryWriter, TrajectoryReader, species_series
+
+NAMES = ["A", "B", "C"]
+
+def trajectory(n):
+    t = np.linspace(0.0, 1.0, n)
+    return t, np.vstack([np.exp(-t), 1.0 - np.exp(-t), t ** 2]), 300.0 + t
+
+def write(path, t, y, temperature, chunks, strides=None, resume_at=None, end=None):
+    writer = TrajectoryWriter(path, NAMES, len(t), strides, with_temperature=True, resume_at=resume_at)
+    bounds = [resume_at or 0, *chunks, len(t) if end is None else end]
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        writer.append(t[lo:hi], y[:, lo:hi], temperature[lo:hi])
+    return writer
+
+@pytest.mark.parametrize("chunks", [[], [1, 2, 3, 10, 11], [5, 37, 38]])
+def test_strides_keep_every_nth_point_across_chunks(tmp_path, chunks):
+    t, y, temperature = trajectory(50)
+    write(tmp_path / "traj.bin", t, y, temperature, chunks, strides={"B": 3, "C": 7}).close()
+    reader = TrajectoryReader(tmp_path / "traj.bin")
+    assert reader.meta["complete"] and reader.filled == 50
+    np.testing.assert_array_equal(reader.time_points, t)
+    np.testing.assert_array_equal(reader.temperature, temperature)
+    for idx, stride in enumerate([1, 3, 7]):
+        t_i, y_i = reader.species(idx)
+        np.testing.assert_array_equal(t_i, t[::stride])
+        np.testing.assert_array_equal(y_i, y[idx, ::stride])
+
+def test_resume_continues_where_the_checkpoint_stopped(tmp_path):
+    t, y, temperature = trajectory(40)
+    strides = {"C": 4}
+    write(tmp_path / "full.bin", t, y, temperature, [13], strides=strides).close()
+
+    # Abbruch nach Punkt 22 (zuletzt gesichert), danach Fortsetzung in derselben Datei
+    write(tmp_path / "resumed.bin", t, y, temperature, [9], strides=strides, end=22).flush()
+    write(tmp_path / "resumed.bin", t, y, temperature, [30], strides=strides, resume_at=22).close()
+
+    full, resumed = TrajectoryReader(tmp_path / "full.bin"), TrajectoryReader(tmp_path / "resumed.bin")
+    np.testing.assert_array_equal(resumed.time_points, full.time_points)
+    for idx in range(3):
+        np.testing.assert_array_equal(resumed.species(idx)[1], full.species(idx)[1])
+
+def test_resume_rejects_a_different_layout(tmp_path):
+    t, y, temperature = trajectory(20)
+    write(tmp_path / "traj.bin", t, y, temperature, []).close()
+    with pytest.raises(ValueError, match="passt nicht"):
+        TrajectoryWriter(tmp_path / "traj.bin", NAMES, 20, {"A": 2}, with_temperature=True, resume_at=10)
+
+def test_writer_rejects_unknown_species_and_excess_points(tmp_path):
+    with pytest.raises(ValueError, match="Unbekannte Spezies"):
+        TrajectoryWriter(tmp_path / "traj.bin", NAMES, 10, {"Z": 2})
+    writer = TrajectoryWriter(tmp_path / "traj.bin", NAMES, 3)
+    with pytest.raises(ValueError, match="Mehr Zeitpunkte"):
+        writer.append(np.zeros(4), np.zeros((3, 4)))
+
+def test_simulation_written_to_file_matches_in_memory_result(tmp_path):
+    backend_main = pytest.importorskip("backend_main")
+    from data_model import Species, Reaction, ReactionSystem
+    system = ReactionSystem([Species("A", start_concentration=1.0), Species("B", start_concentration=0.0)],
+                            [Reaction([(0, 1)], [(1, 1)], "k", arrhenius_A=1.0)])
+    in_memory = backend_main.simulate(system, 5.0, 298.15, num_points=101)
+    on_disk = backend_main.simulate(system, 5.0, 298.15, num_points=101, trajectory_file=tmp_path / "traj.bin", strides={"B": 10})
+    for idx, stride in enumerate([1, 10]):
+        t_file, y_file = species_series(on_disk, idx)
+        t_mem, y_mem = species_series(in_memory, idx)
+        np.testing.assert_allclose(t_file, t_mem[::stride])
+        np.testing.assert_allclose(y_file, y_mem[::stride], rtol=1e-9, atol=1e-12)
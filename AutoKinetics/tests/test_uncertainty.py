@@ -0,0 +1,96 @@
+# tests/test_uncertainty.py
+import numpy as np
+import pytest
+from data_model import Species, Reaction, ReactionSystem
+from uncertainty import P2Quantiles, propagate_uncertainty, validate_spec
+
+def p2_reference(values, p):
+    """P²-Schätzer eines Quantils für eine einzelne Zelle, direkt nach Jain/Chlamtac (1985)."""
+    q, n = sorted(values[:5]), [1, 2, 3, 4, 5]
+    desired, increments = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5], [0, p / 2, p, (1 + p) / 2, 1]
+    for x in values[5:]:
+        if x < q[0]:
+            q[0] = x
+        q[4] = max(q[4], x)
+        k = min(max(sum(x >= marker for marker in q[1:4]), 0), 3)
+        for i in range(k + 1, 5):
+            n[i] += 1
+        desired = [d + inc for d, inc in zip(desired, increments)]
+        for i in (1, 2, 3):
+            d = desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                s = 1 if d > 0 else -1
+                candidate = q[i] + s / (n[i + 1] - n[i - 1]) * ((n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                                                              + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < candidate < q[i + 1]:
+                    candidate = q[i] + s * (q[i + s] - q[i]) / (n[i + s] - n[i])
+                q[i], n[i] = candidate, n[i] + s
+    return q[2]
+
+def samples(n=3000):
+    rng = np.random.default_rng(1)
+    return np.stack([rng.normal(0.0, 1.0, (n, 20)), rng.exponential(1.0, (n, 20)), rng.uniform(0.0, 1.0, (n, 20))], axis=1)
+
+def test_vectorized_p2_matches_the_scalar_algorithm():
+    data = samples(500)
+    sketch = P2Quantiles(data.shape[1:], (0.05, 0.5, 0.95))
+    for values in data:
+        sketch.add(values)
+    estimates = sketch.result()
+    for qi, p in enumerate((0.05, 0.5, 0.95)):
+        for d in range(3):
+            for cell in (0, 7, 19):
+                assert estimates[qi, d, cell] == pytest.approx(p2_reference(list(data[:, d, cell]), p), rel=1e-12, abs=1e-12)
+
+def test_p2_quantiles_are_close_to_np_quantile():
+    data = samples()
+    quantiles = (0.05, 0.25, 0.5, 0.75, 0.95)
+    sketch = P2Quantiles(data.shape[1:], quantiles)
+    for values in data:
+        sketch.add(values)
+    exact = np.quantile(data, quantiles, axis=0)
+    spread = np.quantile(data, 0.75, axis=0) - np.quantile(data, 0.25, axis=0)
+    # P² ist ein Schätzer mit fünf Markern: Abweichung klein gegen den Interquartilsabstand
+    assert np.max(np.abs(sketch.result() - exact) / spread) < 0.25
+    assert np.median(np.abs(sketch.result() - exact) / spread) < 0.03
+
+def test_few_samples_give_exact_quantiles():
+    sketch = P2Quantiles((2,), (0.1, 0.5))
+    assert np.isnan(sketch.result()).all()
+    data = np.array([[3.0, -1.0], [1.0, 0.0], [2.0, 4.0]])
+    for values in data:
+        sketch.add(values)
+    np.testing.assert_allclose(sketch.result(), np.quantile(data, (0.1, 0.5), axis=0))
+
+def decay_system():
+    species = [Species("A", start_concentration=1.0), Species("B", start_concentration=0.0)]
+    return ReactionSystem(species, [Reaction([(0, 1)], [(1, 1)], "k1", arrhenius_A=1.0)])
+
+SPEC = {"k1": {"A": {"dist": "lognormal", "sigma": 0.3}}}
+
+def test_quantiles_follow_the_parameter_distribution():
+    result = propagate_uncertainty(decay_system(), SPEC, 298.15, 3.0, n_samples=400, num_points=31, seed=5, n_workers=1)
+    assert result["n_samples"] == 400 and result["failed"] == 0
+    t = np.array(result["time_points"])
+    # [A] = exp(-k t) fällt monoton in k: Quantile von [A] sind exp(-t * Quantil von k)
+    np.testing.assert_allclose(result["quantiles"]["0.5"][0], np.exp(-t), atol=0.02)
+    np.testing.assert_allclose(result["quantiles"]["0.05"][0], np.exp(-t * np.exp(1.645 * 0.3)), atol=0.03)
+    np.testing.assert_allclose(result["quantiles"]["0.95"][0], np.exp(-t * np.exp(-1.645 * 0.3)), atol=0.03)
+    # Massenerhaltung gilt in jeder Stichprobe, also auch im Mittel
+    np.testing.assert_allclose(np.add(result["mean"][0], result["mean"][1]), 1.0, rtol=1e-6)
+    assert result["std"][0][0] == 0.0 and result["std"][0][10] > 0.0
+
+def test_result_does_not_depend_on_the_number_of_workers():
+    serial = propagate_uncertainty(decay_system(), SPEC, 298.15, 3.0, n_samples=40, num_points=11, seed=5, n_workers=1)
+    parallel = propagate_uncertainty(decay_system(), SPEC, 298.15, 3.0, n_samples=40, num_points=11, seed=5, n_workers=2, batch_size=3)
+    np.testing.assert_allclose(parallel["mean"], serial["mean"], rtol=1e-12)
+    np.testing.assert_allclose(parallel["std"], serial["std"], rtol=1e-9)
+
+@pytest.mark.parametrize("spec, message", [
+    ({"k9": {"A": {"dist": "normal", "rel_std": 0.1}}}, "Unbekannte Reaktion"),
+    ({"*": {"B": {"dist": "normal", "rel_std": 0.1}}}, "Unbekannter Parameter"),
+    ({"k1": {"Ea": {"dist": "cauchy"}}}, "Unbekannte Verteilung"),
+])
+def test_invalid_specs_are_rejected(spec, message):
+    with pytest.raises(ValueError, match=message):
+        validate_spec(decay_system(), spec)